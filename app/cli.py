@@ -1,3 +1,6 @@
+import os
+import functools
+import importlib
 from pathlib import Path
 from typing import Iterable, List, MutableMapping, Sequence, Any
 
@@ -20,8 +23,8 @@ class CLIGroup(click.Group):
 
     Methods:
         format_usage: Overrides the default usage formatting to include command and subcommand structure.
-        list_commands: Dynamically lists all commands and groups based on the directory structure.
-        get_command: Dynamically loads a command or group based on its name.
+        list_commands: Lists all commands and groups based on the cached directory index.
+        get_command: Lazily loads a command or group based on its name.
     """
 
     def __init__(
@@ -54,22 +57,6 @@ class CLIGroup(click.Group):
             ctx.command_path, "<command> [<subcommand>] [OPTIONS] [ARGS]"
         )
 
-    def _get_command_list(self, base_path: Path) -> Iterable[str]:
-        """
-        Retrieves a list of command names from a directory.
-
-        Args:
-            base_path (Path): The directory from which to list commands.
-
-        Returns:
-            Iterable[str]: An iterable of command names.
-        """
-        return [
-            filename.stem.replace("cmd_", "")
-            for filename in base_path.iterdir()
-            if filename.is_file() and filename.name.startswith("cmd_")
-        ]
-
     def list_commands(self, ctx: Context) -> List[str]:
         """
         Lists all commands and groups available in the commands directory.
@@ -80,19 +67,17 @@ class CLIGroup(click.Group):
         Returns:
             List[str]: A list of all command and group names, sorted alphabetically.
         """
-        commands = self._get_command_list(self.commands_directory)
-        groups = [
-            group.name
-            for group in self.commands_directory.iterdir()
-            if group.is_dir() and group.name != "__pycache__"
-        ]
+        index = discover_commands(self.commands_directory)
 
-        return sorted(commands) + sorted(groups)
+        return sorted(index["commands"]) + sorted(index["groups"])
 
     def get_command(self, ctx: Context, name: str) -> Command | Group | None:
         """
         Dynamically loads a command or group based on its name.
 
+        Groups are returned without importing any of their commands; each command module
+        is imported only when that command is actually resolved.
+
         Args:
             ctx (Context): The Click context object.
             name (str): The name of the command or group to load.
@@ -100,40 +85,120 @@ class CLIGroup(click.Group):
         Returns:
             Command | Group | None: The loaded command or group, or None if not found.
         """
-        base = self.commands_directory / name
-        if base.is_dir() and base.exists():
-            commands = self._get_command_list(base)
-            # Group creation and command loading logic
+        index = discover_commands(self.commands_directory)
 
-            @click.group(
+        if name in index["groups"]:
+            return LazyGroup(
                 name=name,
+                import_paths={
+                    command: f"app.commands.{name}.cmd_{command}"
+                    for command in index["groups"][name]
+                },
                 help=f"Commands Group for {name.capitalize()} resource",
             )
-            def group():
-                f"""{name.capitalize()} resource commands"""
-                pass
-
-            for command in commands:
-                try:
-                    module = __import__(
-                        f"app.commands.{name}.cmd_{command}",
-                        None,
-                        None,
-                        ["command"],
-                    )
-                    group.add_command(module.command, name=command)
-                except ImportError as e:
-                    rich.print(f"[red][ERROR] {e}[/red]")
-                    continue
-            return group
-        else:
-            # Single command loading logic
-            try:
-                module = __import__(f"app.commands.cmd_{name}", None, None, ["command"])
-                return module.command
-            except ImportError as e:
-                rich.print(f"[red][ERROR] {e}[/red]")
-                return
+
+        if name in index["commands"]:
+            return _import_command(f"app.commands.cmd_{name}")
+
+        return None
+
+
+class LazyGroup(click.Group):
+    """
+    A command group that imports the module of each of its commands on first use.
+
+    Attributes:
+        import_paths (dict[str, str]): The module path of each command, keyed by command name.
+    """
+
+    def __init__(
+        self, name: str | None = None, import_paths: dict[str, str] = {}, **attrs: Any
+    ) -> None:
+        """
+        Initializes a new instance of the LazyGroup.
+
+        Args:
+            name (str, optional): The name of the group. Defaults to None.
+            import_paths (dict[str, str]): The module path of each command, keyed by command name.
+            **attrs: Additional attributes passed to the click.Group initializer.
+        """
+        super().__init__(name, **attrs)
+        self.import_paths = import_paths
+
+    def list_commands(self, ctx: Context) -> List[str]:
+        return sorted(self.import_paths)
+
+    def get_command(self, ctx: Context, name: str) -> Command | None:
+        if name not in self.import_paths:
+            return None
+        return _import_command(self.import_paths[name])
+
+
+def _import_command(import_path: str) -> Command | None:
+    """
+    Imports a command module and returns its `command`.
+
+    Args:
+        import_path (str): The dotted path of the command module.
+
+    Returns:
+        Command | None: The command, or None if the module could not be imported.
+    """
+    try:
+        return importlib.import_module(import_path).command
+    except ImportError as e:
+        rich.print(f"[red][ERROR] {e}[/red]")
+        return None
+
+
+def _get_command_list(base_path: Path) -> Iterable[str]:
+    """
+    Retrieves a list of command names from a directory.
+
+    Args:
+        base_path (Path): The directory from which to list commands.
+
+    Returns:
+        Iterable[str]: An iterable of command names.
+    """
+    with os.scandir(base_path) as entries:
+        return [
+            entry.name[len("cmd_") : -len(".py")]
+            for entry in entries
+            if entry.is_file()
+            and entry.name.startswith("cmd_")
+            and entry.name.endswith(".py")
+        ]
+
+
+@functools.cache
+def discover_commands(commands_directory: Path) -> dict:
+    """
+    Builds the index of commands and command groups of a commands directory.
+
+    The directory is walked once per process; every later lookup of the CLI is served from
+    this index.
+
+    Args:
+        commands_directory (Path): The directory where command groups and commands are stored.
+
+    Returns:
+        dict: The top-level command names under "commands" and the command names of each
+            group under "groups".
+    """
+    with os.scandir(commands_directory) as entries:
+        group_names = [
+            entry.name
+            for entry in entries
+            if entry.is_dir() and entry.name != "__pycache__"
+        ]
+
+    return {
+        "commands": _get_command_list(commands_directory),
+        "groups": {
+            name: _get_command_list(commands_directory / name) for name in group_names
+        },
+    }
 
 
 @click.group(cls=CLIGroup)
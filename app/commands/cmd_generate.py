@@ -1,9 +1,9 @@
+from pathlib import Path
+
 import rich
 import click
 
-from app.constants import CONFIG, CONFIG_FILE
-
-from app.services.generator.main import run
+from app.constants import CONFIG, CONFIG_FILE, TMP_DIR
 
 
 @click.command()
@@ -16,7 +16,57 @@ from app.services.generator.main import run
     default=False,
     help="Use default kwargs for the document",
 )
-def command(doc_name, repository, use_default_kwargs, exporter):
+@click.option(
+    "-b",
+    "--batch",
+    "batch_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="JSONL or CSV file with one set of kwargs per document to generate",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes for batch generation. Defaults to the CPU count",
+)
+@click.option(
+    "--async",
+    "use_async",
+    is_flag=True,
+    default=False,
+    help="Generate batch rows with the asyncio engine, --workers documents at a time",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Regenerate the document even if a cached output of identical inputs exists",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(["timing", "cprofile"]),
+    is_flag=False,
+    flag_value="timing",
+    default=None,
+    help="Print the wall and CPU time of each stage. With 'cprofile', also dump a pstats file of the script",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the --profile stage times to this JSON file",
+)
+def command(
+    doc_name,
+    repository,
+    use_default_kwargs,
+    exporter,
+    batch_file,
+    workers,
+    use_async,
+    no_cache,
+    profile,
+    profile_output,
+):
     """
     Executes the document generation process with the specified parameters.
 
@@ -26,6 +76,15 @@ def command(doc_name, repository, use_default_kwargs, exporter):
     The repository defaults to 'local' if not specified.
 
     The command also supports a flag for using default kwargs for the document.
+    With --batch, one document is generated per row of the given JSONL or CSV file,
+    using a pool of --workers processes, and the command exits with a non-zero status
+    if any row fails. With --async, the rows are generated in a single process by the asyncio
+    engine instead, overlapping the scripts, rendering and exports of --workers documents.
+    Documents with an output cache reuse the output of identical inputs; --no-cache
+    regenerates them and refreshes the cached output.
+    With --profile, the wall and CPU time of each stage of the generation is printed, and
+    written as JSON to --profile-output if given; --profile=cprofile also dumps a pstats
+    file of the script execution.
     If the specified repository or exporter does not exist in the configuration,
     or if the configuration file itself does not exist, the command will abort with an appropriate error message.
     """
@@ -56,4 +115,49 @@ def command(doc_name, repository, use_default_kwargs, exporter):
         if exporter not in CONFIG.get("exporters", {}):
             raise click.Abort(f"Exporter {exporter} does not exist in config")
 
-    run(doc_name, repository, use_default_kwargs, exporter)
+    if profile and batch_file:
+        raise click.Abort("--profile cannot be used with --batch")
+    if use_async and not batch_file:
+        raise click.Abort("--async can only be used with --batch")
+
+    # The generation pipeline is imported here to keep the CLI start-up light
+    if batch_file:
+        from app.services.generator.batch import run_batch
+
+        results = run_batch(
+            doc_name,
+            batch_file,
+            repository,
+            exporter,
+            workers,
+            not no_cache,
+            use_async,
+        )
+        if not all(succeeded for _, succeeded, _ in results):
+            raise click.exceptions.Exit(1)
+        return
+
+    from app.services.generator.main import run
+
+    if not profile:
+        run(doc_name, repository, use_default_kwargs, exporter, not no_cache)
+        return
+
+    from app.utils.profiling import StageProfiler, profiling
+
+    profiler = StageProfiler(cprofile_stages=["script"] if profile == "cprofile" else [])
+    with profiling(profiler):
+        run(doc_name, repository, use_default_kwargs, exporter, not no_cache)
+
+    profiler.print_summary()
+
+    if profile_output:
+        profiler.write_json(profile_output)
+        rich.print(f"[green]Profile saved at {profile_output}[/green]")
+
+    if profile == "cprofile":
+        stats_file = TMP_DIR / "profiles" / f"{doc_name}-script.pstats"
+        if profiler.dump_stats(stats_file):
+            rich.print(f"[green]Script profile saved at {stats_file}[/green]")
+        else:
+            rich.print("[blue]The script did not run, no script profile saved[/blue]")
@@ -0,0 +1,32 @@
+import click
+
+
+@click.command()
+@click.option("-h", "--host", default="127.0.0.1", help="Address to listen on")
+@click.option("-p", "--port", default=8000, type=int, help="Port to listen on")
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix socket instead of a TCP port",
+)
+@click.option(
+    "-w",
+    "--workers",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Maximum number of documents generated at the same time",
+)
+def command(host, port, socket_path, workers):
+    """
+    Serves document generation over a local HTTP API.
+
+    This CLI command starts a long-running process that keeps document scripts, compiled
+    templates and clients warm between requests. Documents are generated by sending a JSON
+    body with `document`, `repository`, `exporter` and `kwargs` to `POST /generate`.
+    `GET /health` reports liveness and `GET /stats` the cache hit/miss counters.
+    """
+    from app.services.server import run
+
+    run(host, port, socket_path, workers)
@@ -11,18 +11,27 @@ console = Console()
 
 @click.command()
 @click.argument("repository", required=False, default=None)
-def command(repository):
+@click.option(
+    "-r",
+    "--refresh",
+    is_flag=True,
+    default=False,
+    help="Rebuild the repository's report index instead of using the stored one.",
+)
+def command(repository, refresh):
     """
     Lists the reports available in a specified repository or displays available
     repositories if none is specified.
 
     This command provides the user with a list of reports available in the specified repository.
     If no repository is specified, it lists all available repositories.
-    For the 'local' repository, a specific message indicates its always available status.
+    Reports are read from an index stored locally and refreshed when it expires; use
+    `--refresh` to rebuild it right away.
 
     Args:
         repository (str, optional): The name of the repository to list the reports from.
             If not provided, the command will list all available repositories.
+        refresh (bool): Rebuild the repository's report index before listing.
 
     """
     if not repository:
@@ -33,8 +42,4 @@ def command(repository):
 
         return
 
-    if repository == "local":
-        console.print("[green]Local repository is always available[/green]")
-        return
-
-    run(repository)
+    run(repository, refresh)
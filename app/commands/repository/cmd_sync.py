@@ -0,0 +1,29 @@
+import click
+
+from app.services.repository.main import sync as run
+
+
+@click.command()
+@click.argument("repository", required=True)
+@click.option(
+    "-w",
+    "--max-workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of concurrent transfers. Defaults to the repository's transfer settings.",
+)
+def command(repository, max_workers):
+    """
+    Mirrors every report of a repository into the local repositories directory.
+
+    Only objects whose ETag, size or modification time changed since the last sync are
+    downloaded, and local files whose object was removed from the repository are deleted.
+    Transfers run concurrently across reports, and an interrupted sync resumes where it
+    stopped.
+
+    Args:
+        repository (str): The name of the repository to sync. This argument is mandatory.
+        max_workers (int, optional): Maximum number of objects transferred at the same time.
+
+    """
+    run(repository, max_workers)
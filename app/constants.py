@@ -2,15 +2,19 @@ from enum import Enum
 from pathlib import Path
 from typing import Literal
 
-from app.utils.read_config import read_config
+from app.utils.config_store import ConfigStore
 
 DIRECTORY = Path("docscribe")
 REPOSITORIES_DIR = DIRECTORY / "repositories"
 LOCAL_EXPORTS_DIR = DIRECTORY / "outputs"
 CONFIG_FILE = Path(".docscribe_config.json")
 TMP_DIR = DIRECTORY / ".tmp"
+CACHE_DIR = TMP_DIR / "cache"
+ENVIRONMENTS_DIR = DIRECTORY / "environments"
+REPOSITORY_INDEXES_DIR = DIRECTORY / "indexes"
 
-CONFIG = read_config(CONFIG_FILE)
+# Always reflects the file on disk; update it with `CONFIG.update()`
+CONFIG = ConfigStore(CONFIG_FILE)
 
 CONFIG_SEGMENTS = Literal["repositories", "exporters"]
 
@@ -58,6 +58,8 @@ def run(
             "kwargs": {},
             "template_schema": {},
             "required_modules": [],
+            "isolated_environment": False,
+            "output_cache": False,
             "template_type": doc_type,
         }
         json.dump(data, f, indent=4)
@@ -1,14 +1,12 @@
-from app.services.exporter.types import (
-    local as LocalExporter,
-    s3 as S3Exporter,
-)
+from app.utils.registry import LazyTypeRegistry
 
 """
 A registry mapping exporter type names to their respective class implementations.
 
 This dictionary is utilized to dynamically instantiate exporter objects based on
 the specified type. It supports adding new exporter types without modifying existing
-codebase, adhering to the open/closed principle. Current supported types are:
+codebase, adhering to the open/closed principle. Types are imported on first access,
+so the S3 exporter's boto3 dependency is only loaded when it is used. Current supported types are:
 
 - "local": For exporting files to a local filesystem.
 - "s3": For exporting files to an AWS S3 bucket.
@@ -18,7 +16,9 @@ Examples:
 - To instantiate an S3 exporter: `EXPORTER_TYPES["s3"](name, config)`
 """
 
-EXPORTER_TYPES = {
-    "local": LocalExporter.Local,
-    "s3": S3Exporter.S3,
-}
+EXPORTER_TYPES = LazyTypeRegistry(
+    {
+        "local": "app.services.exporter.types.local:Local",
+        "s3": "app.services.exporter.types.s3:S3",
+    }
+)
@@ -1,3 +1,5 @@
+from typing import IO
+
 import rich
 
 from app.services.exporter.manager import ExporterManager
@@ -24,14 +26,14 @@ def delete_exporter(exporter_name: str) -> None:
     rich.print("[bold green]Exporter deleted.[/bold green]")
 
 
-def export(exporter_name: str | None, file_name, file_type) -> None:
+def export_stream(exporter_name: str | None, stream: IO[bytes], file_name: str) -> None:
     """
-    Exports a file using the specified exporter segment.
+    Exports the content of a binary stream using the specified exporter segment.
 
     Args:
-        exporter_name (str | None): The name of the exporter to use for exporting. If None, prompts the user to select an exporter.
-        file_name (str): The name of the file to export.
-        file_type (str): The mode/type of the file to be used for exporting.
+        exporter_name (str | None): The name of the exporter to use for exporting.
+        stream (IO[bytes]): The content to export, positioned at its start.
+        file_name (str): The name of the exported file.
     """
     manager = ExporterManager(exporter_name)
-    manager.export(file_name, mode=file_type)
+    manager.export_stream(stream, file_name)
@@ -1,3 +1,5 @@
+from typing import IO
+
 from app.utils.managers import SegmentManager
 
 
@@ -13,7 +15,7 @@ class ExporterManager(SegmentManager):
         name (str | None): The name of the exporter segment to manage. If None, the manager operates without a specific exporter segment.
 
     Methods:
-        export(file_name: str, *args, **kwargs) -> None: Exports a file using the configured exporter segment.
+        export_stream(stream: IO[bytes], file_name: str) -> None: Exports a binary stream using the configured exporter segment.
         make_output_uri(file_name: str) -> str: Generates the output URI for a file using the configured exporter segment.
     """
 
@@ -26,20 +28,16 @@ class ExporterManager(SegmentManager):
         """
         super().__init__(name, "exporters")
 
-    def export(self, file_name: str, *args, **kwargs) -> None:
+    def export_stream(self, stream: IO[bytes], file_name: str) -> None:
         """
-        Exports a file using the configured exporter segment.
-
-        This method validates the current segment and delegates the export process
-        to the exporter's export method.
+        Exports the content of a binary stream using the configured exporter segment.
 
         Args:
-            file_name (str): The name of the file to export.
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments, potentially including a 'mode' to specify how the file should be opened.
+            stream (IO[bytes]): The content to export, positioned at its start.
+            file_name (str): The name of the exported file.
         """
         self._validate_segment()
-        self.segment.export(file_name, mode=kwargs.get("mode", "rb"))
+        self.segment.export_stream(stream, file_name)
 
     def make_output_uri(self, file_name: str) -> str:
         """
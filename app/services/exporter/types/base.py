@@ -1,3 +1,4 @@
+from typing import IO
 from abc import ABC, abstractmethod
 
 from app.utils.segment import Segment
@@ -17,7 +18,7 @@ class Exporter(Segment, ABC):
         config (dict, optional): Configuration options specific to the exporter type.
 
     Methods:
-        export(file_name: str, content) -> None: Abstract method to export content to a file.
+        export_stream(stream: IO[bytes], file_name: str) -> None: Abstract method to export the content of a binary stream.
         make_output_uri(file_name: str) -> str: Abstract method to generate the output URI for the exported file.
     """
 
@@ -33,16 +34,16 @@ class Exporter(Segment, ABC):
         super().__init__(name, _type, "exporters", config)
 
     @abstractmethod
-    def export(self, file_name: str, content) -> None:
+    def export_stream(self, stream: IO[bytes], file_name: str) -> None:
         """
-        Exports content to a specified file.
+        Exports the content of a binary stream as a file with the given name.
 
-        This method should be implemented by subclasses to handle the export logic
-        for the specific exporter type.
+        This method should be implemented by subclasses to consume the stream directly,
+        without writing it to a local file first.
 
         Args:
-            file_name (str): The name of the file to export the content to.
-            content: The content to export.
+            stream (IO[bytes]): The content to export, positioned at its start.
+            file_name (str): The name of the exported file.
 
         Raises:
             NotImplementedError: If the subclass does not implement this method.
@@ -1,9 +1,12 @@
+import shutil
 from pathlib import Path
+from typing import IO
 
 import rich
 
 from app.constants import LOCAL_EXPORTS_DIR
 from app.services.exporter.types.base import Exporter
+from app.utils.files import atomic_write
 
 
 class Local(Exporter):
@@ -46,35 +49,22 @@ class Local(Exporter):
         path.mkdir(exist_ok=True, parents=True)
         return str(path.joinpath(file_name))
 
-    def export(self, file_name: str, *args, **kwargs) -> None:
+    def export_stream(self, stream: IO[bytes], file_name: str) -> None:
         """
-        Exports the content to a file in the local filesystem.
+        Writes the content of a binary stream to a file in the local filesystem.
 
-        The file is read from the given file name and then written to the local
-        export directory. The original file is removed after export.
+        The content is written once, to a temporary file in the export directory that is
+        then atomically renamed, so readers never see a partially written report.
 
         Args:
-            file_name (str): The name of the file containing the content to export.
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments. Supports "mode" to specify file reading mode.
-
-        Note:
-            The file is deleted after being exported to the local directory.
+            stream (IO[bytes]): The content to export, positioned at its start.
+            file_name (str): The name of the exported file.
         """
-        mode = kwargs.get("mode", "rb")
-
-        file = Path(file_name)
-
-        with file.open(mode) as f:
-            content = f.read()
+        output_uri = Path(self.make_output_uri(file_name))
 
-        output_uri = self.make_output_uri(file_name.name)
-        output_uri = Path(output_uri)
-        output_uri.parent.mkdir(exist_ok=True, parents=True)
-        with output_uri.open("w" if mode == "r" else "wb") as f:
-            f.write(content)
+        with atomic_write(output_uri) as file:
+            shutil.copyfileobj(stream, file)
 
-        file.unlink()
         rich.print(f"[green]Report saved at {output_uri}[/green]")
 
     def _auth(self):
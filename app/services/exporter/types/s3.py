@@ -1,10 +1,11 @@
-from pathlib import Path
+from typing import IO
 
 import rich
+import click
 
 from botocore.exceptions import NoCredentialsError, ClientError
 from app.services.exporter.types.base import Exporter
-from app.utils.s3 import create_s3_segment_config, s3_auth
+from app.utils.s3 import create_s3_segment_config, make_transfer_config, s3_auth
 
 
 class S3(Exporter):
@@ -21,7 +22,7 @@ class S3(Exporter):
     Methods:
         _auth(): Authenticates with AWS S3 using the provided configuration.
         make_output_uri(file_name: str, full_uri: bool = False) -> str: Generates the S3 path or full URI for the exported file.
-        export(file_path: str, *args, **kwargs) -> None: Uploads the given file to AWS S3.
+        export_stream(stream: IO[bytes], file_name: str) -> None: Uploads the content of a binary stream to AWS S3.
         _create_config(*args, **kwargs) -> dict: Prompts the user for S3 configuration details and returns them.
     """
 
@@ -56,33 +57,32 @@ class S3(Exporter):
             return f"s3://{self.config['bucket']}/{self.config['prefix'].rstrip('/')}/{file_name}"
         return f"{self.config['prefix'].rstrip('/')}/{file_name}"
 
-    def export(self, file_path: str, *args, **kwargs) -> None:
+    def export_stream(self, stream: IO[bytes], file_name: str) -> None:
         """
-        Uploads the given file to AWS S3.
+        Uploads the content of a binary stream to AWS S3.
 
         Args:
-            file_path (str): The path of the file to upload.
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
+            stream (IO[bytes]): The content to upload, positioned at its start.
+            file_name (str): The name of the exported file.
+
+        Raises:
+            click.Abort: If the upload fails.
         """
         self._auth()
         try:
-            # Upload the file
-            self.s3.upload_file(
-                Filename=file_path,
+            self.s3.upload_fileobj(
+                Fileobj=stream,
                 Bucket=self.config["bucket"],
-                Key=f"{self.config['prefix'].rstrip('/')}/{Path(file_path).name}",
+                Key=self.make_output_uri(file_name),
+                Config=make_transfer_config(self.config),
             )
 
-            # Delete the local file
-            file_path = Path(file_path)
-            file_path.unlink()
-
             rich.print(
-                f"[green]Report saved at {self.make_output_uri(file_path.name, full_uri=True)}[/green]"
+                f"[green]Report saved at {self.make_output_uri(file_name, full_uri=True)}[/green]"
             )
         except (NoCredentialsError, ClientError) as e:
             rich.print(f"[red][ERROR] {e}[/red]")
+            raise click.Abort()
 
     def _create_config(self, *args, **kwargs) -> dict:
         """
@@ -0,0 +1,208 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+
+import rich
+import click
+from rich.table import Table
+
+from app.services.generator.main import generate_document, read_document_config
+from app.services.generator.template_requirements import install_requirements
+
+
+def read_batch_rows(batch_file: Path) -> Iterator[dict]:
+    """
+    Streams the keyword argument rows of a batch file.
+
+    JSON Lines files (`.jsonl`) must contain one JSON object per line; blank lines are skipped.
+    CSV files (`.csv`) use their header row as the keyword argument names. Rows are yielded one
+    at a time so arbitrarily large batch files are never loaded fully into memory.
+
+    Parameters:
+    - batch_file (Path): The path of the batch file.
+
+    Yields:
+    - dict: The keyword arguments of each row.
+
+    Raises:
+    - click.Abort: If the file type is not supported or a JSON line is not an object.
+    """
+    suffix = batch_file.suffix.lower()
+
+    if suffix == ".csv":
+        with batch_file.open("r", newline="") as file:
+            yield from csv.DictReader(file)
+        return
+
+    if suffix not in (".jsonl", ".ndjson"):
+        rich.print(
+            f"[red]Unsupported batch file {batch_file}. Use a .jsonl or .csv file[/red]"
+        )
+        raise click.Abort()
+
+    with batch_file.open("r") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                rich.print(
+                    f"[red]Line {line_number} of {batch_file} is not a JSON object[/red]"
+                )
+                raise click.Abort()
+
+            yield row
+
+
+def generate_batch_row(
+    row_number: int,
+    document_name: str,
+    repository_name: str,
+    exporter_name: str,
+    document_config: dict,
+    document_kwargs: dict,
+    use_cache: bool = True,
+) -> tuple[int, bool, str | None]:
+    """
+    Generates and exports the document of a single batch row.
+
+    This is the unit of work submitted to the process pool, so it never raises: failures are
+    reported back to the parent process as part of the returned tuple.
+
+    Parameters:
+    - row_number (int): The 1-based position of the row in the batch file.
+    - document_name (str): Name of the document to generate.
+    - repository_name (str): Name of the repository where the document is located.
+    - exporter_name (str): The name of the exporter to use.
+    - document_config (dict): The document's configuration.
+    - document_kwargs (dict): Keyword arguments of the row, merged over the document defaults.
+    - use_cache (bool): Whether to reuse cached outputs. Defaults to True.
+
+    Returns:
+    - tuple[int, bool, str | None]: The row number, whether it succeeded and the error message, if any.
+    """
+    try:
+        generate_document(
+            document_name,
+            repository_name,
+            document_kwargs,
+            exporter_name,
+            document_config=document_config,
+            output_name=f"{document_name}-{row_number}",
+            use_cache=use_cache,
+        )
+    except click.Abort as e:
+        return row_number, False, str(e) or "Aborted"
+    except Exception as e:
+        return row_number, False, f"{e.__class__.__name__}: {e}"
+
+    return row_number, True, None
+
+
+def run_batch(
+    document_name: str,
+    batch_file: Path,
+    repository_name: str = "local",
+    exporter_name: str = "local",
+    workers: int | None = None,
+    use_cache: bool = True,
+    use_async: bool = False,
+) -> list[tuple[int, bool, str | None]]:
+    """
+    Generates one document per row of a batch file using a pool of worker processes.
+
+    Requirements are checked once, up front, then every row is pushed through the generation
+    pipeline with its keyword arguments merged over the document's default kwargs. At most
+    twice as many rows as workers are in flight at any time, so the batch file is streamed
+    rather than read all at once. Each output is named `<document_name>-<row_number>`.
+
+    Parameters:
+    - document_name (str): Name of the document to generate.
+    - batch_file (Path): A .jsonl or .csv file with one set of keyword arguments per row.
+    - repository_name (str): Name of the repository where the document is located. Defaults to 'local'.
+    - exporter_name (str): The name of the exporter to use. Defaults to 'local'.
+    - workers (int | None): Number of worker processes. Defaults to the number of CPUs.
+    - use_cache (bool): Whether to reuse cached outputs. Defaults to True.
+    - use_async (bool): Generate the rows with the asyncio engine in this process instead of a
+      process pool, `workers` documents at a time (see `engine`). Defaults to False.
+
+    Returns:
+    - list[tuple[int, bool, str | None]]: The outcome of each row, ordered by row number.
+    """
+    document_config = read_document_config(document_name, repository_name)
+    install_requirements(document_config)
+
+    default_kwargs = document_config.get("kwargs", {})
+    rows = (
+        (
+            row_number,
+            document_name,
+            repository_name,
+            exporter_name,
+            document_config,
+            {**default_kwargs, **row},
+            use_cache,
+        )
+        for row_number, row in enumerate(read_batch_rows(batch_file), start=1)
+    )
+
+    workers = workers or os.cpu_count() or 1
+
+    if use_async:
+        from app.services.generator.engine import run_rows_async
+
+        results = run_rows_async(rows, workers)
+    elif workers == 1:
+        results = [generate_batch_row(*row) for row in rows]
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: set[Future] = set()
+            for row in rows:
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    results.extend(future.result() for future in done)
+                pending.add(executor.submit(generate_batch_row, *row))
+
+            results.extend(future.result() for future in wait(pending).done)
+
+    results.sort(key=lambda result: result[0])
+    print_batch_summary(results)
+
+    return results
+
+
+def print_batch_summary(results: list[tuple[int, bool, str | None]]) -> None:
+    """
+    Prints the per-row outcome of a batch generation followed by the totals.
+
+    Parameters:
+    - results (list[tuple[int, bool, str | None]]): The outcome of each row.
+    """
+    table = Table(title="Batch generation summary")
+    table.add_column("Row", justify="right")
+    table.add_column("Status")
+    table.add_column("Error")
+
+    for row_number, succeeded, error in results:
+        table.add_row(
+            str(row_number),
+            "[green]OK[/green]" if succeeded else "[red]FAILED[/red]",
+            error or "",
+        )
+
+    rich.print(table)
+
+    failed = sum(1 for _, succeeded, _ in results if not succeeded)
+    rich.print(
+        f"[bold]{len(results) - failed} succeeded, {failed} failed, {len(results)} total[/bold]"
+    )
@@ -0,0 +1,401 @@
+import io
+import re
+import hashlib
+import itertools
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Iterable
+
+import rich
+import click
+from lxml import etree
+from docxtpl import DocxTemplate
+from jinja2 import Environment, Template
+
+from app.utils.cache import CacheStats
+
+DOCX_CACHE_STATS = CacheStats("docx_templates")
+
+MAX_PREPARED_TEMPLATES = 32
+
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT_URI = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+BODY_TAG = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}body"
+BODY_MARKER = b"<!--docscribe-body-->"
+
+# Rows of large tables rendered per Jinja call, which bounds the memory of a table render
+LARGE_TABLE_CHUNK_SIZE = 1000
+LARGE_TABLE_ROWS = "__docscribe_rows"
+LARGE_TABLE_MARKER = "docscribe-rows-{}"
+
+_PREPARED: OrderedDict[str, "PreparedDocxTemplate | None"] = OrderedDict()
+_PREPARED_LOCK = threading.Lock()
+
+
+class PreparedDocxTemplate:
+    """
+    A DOCX template whose package has been read, patched and compiled once.
+
+    docxtpl reopens the package, reparses every XML part and re-runs its XML patching on
+    each render. This class does that work up front: the body, headers and footers are
+    patched with docxtpl's own `patch_xml` and compiled into Jinja templates, and every
+    other part of the package is kept as raw bytes. Rendering is then only the Jinja pass,
+    docxtpl's post-render fixes of the body, and the zip assembly.
+
+    Tables whose row loop (`{%tr for row in <variable> %}`) iterates one of the `large_tables`
+    variables are rendered in high-volume mode: the loop is cut out of the body and replaced by
+    a placeholder row, and at render time the rows are rendered `LARGE_TABLE_CHUNK_SIZE` at a
+    time and streamed into the zip entry of the document. The rest of the body still goes
+    through the regular pipeline, but the rows never exist as one string or XML tree. Inside
+    such rows, `loop` variables restart with each chunk and docxtpl's table and image id fixes
+    are not applied.
+
+    Attributes:
+        document_part (str): The name of the main document part inside the package.
+        parts (dict[str, bytes]): The raw content of every part of the package.
+        body_template (Template): The compiled template of the document body.
+        part_templates (dict[str, Template]): The compiled templates of headers and footers.
+        large_tables (list[tuple[str, Template]]): The variable and compiled row template of each
+            table rendered in high-volume mode, in document order.
+    """
+
+    def __init__(self, package: bytes, large_tables: Iterable[str] = ()) -> None:
+        """
+        Reads and compiles a DOCX template package.
+
+        Args:
+            package (bytes): The content of the template file.
+            large_tables (Iterable[str]): Variables whose table row loops are rendered in
+                high-volume mode. Defaults to none.
+
+        Raises:
+            ValueError: If the template cannot be rendered without docxtpl's document object.
+        """
+        self._helper = DocxTemplate(None)
+        self._env = Environment()
+
+        with zipfile.ZipFile(io.BytesIO(package)) as zin:
+            self.infos = zin.infolist()
+            self.parts = {info.filename: zin.read(info) for info in self.infos}
+
+        core_properties = self.parts.get("docProps/core.xml", b"")
+        if b"{{" in core_properties or b"{%" in core_properties:
+            # docxtpl renders core properties through python-docx's object model
+            raise ValueError("Templated core properties are not supported")
+
+        self.document_part = self._find_document_part()
+
+        root = etree.fromstring(self.parts[self.document_part])
+        body = root.find(BODY_TAG)
+        body_xml = self._helper.patch_xml(
+            etree.tostring(body, encoding="unicode", pretty_print=False)
+        )
+        body_xml, self.large_tables = self._extract_large_tables(body_xml, large_tables)
+        self.body_template = self._compile_patched(body_xml)
+
+        body.getparent().replace(body, etree.Comment("docscribe-body"))
+        document = etree.tostring(root, encoding="UTF-8", standalone=True)
+        self._document_prefix, self._document_suffix = document.split(BODY_MARKER)
+
+        self.part_templates = {
+            part_name: self._compile(
+                etree.tostring(etree.fromstring(self.parts[part_name]), encoding="unicode")
+            )
+            for part_name in self._find_header_footer_parts()
+        }
+
+    def _find_document_part(self) -> str:
+        """
+        Finds the name of the main document part from the package relationships.
+
+        Returns:
+            str: The name of the main document part, usually `word/document.xml`.
+        """
+        rels = etree.fromstring(self.parts["_rels/.rels"])
+        for rel in rels.iter(f"{{{RELATIONSHIPS_NS}}}Relationship"):
+            if rel.get("Type") == OFFICE_DOCUMENT_URI:
+                return rel.get("Target").lstrip("/")
+        return "word/document.xml"
+
+    def _find_header_footer_parts(self) -> list[str]:
+        """
+        Lists the non-empty header and footer parts of the main document.
+
+        Returns:
+            list[str]: The names of the header and footer parts inside the package.
+        """
+        base, name = posixpath.split(self.document_part)
+        rels_part = posixpath.join(base, "_rels", f"{name}.rels")
+        if rels_part not in self.parts:
+            return []
+
+        part_names = []
+        rels = etree.fromstring(self.parts[rels_part])
+        for rel in rels.iter(f"{{{RELATIONSHIPS_NS}}}Relationship"):
+            if rel.get("TargetMode") == "External" or rel.get("Type") not in (
+                DocxTemplate.HEADER_URI,
+                DocxTemplate.FOOTER_URI,
+            ):
+                continue
+
+            part_name = posixpath.normpath(posixpath.join(base, rel.get("Target")))
+            if self.parts.get(part_name):
+                part_names.append(part_name)
+
+        return part_names
+
+    def _compile(self, xml: str) -> Template:
+        """
+        Patches a part's XML the way docxtpl does and compiles it.
+
+        Args:
+            xml (str): The serialized XML of the part.
+
+        Returns:
+            Template: The compiled Jinja template of the part.
+        """
+        return self._compile_patched(self._helper.patch_xml(xml))
+
+    def _compile_patched(self, xml: str) -> Template:
+        """
+        Compiles a part's XML already patched by docxtpl.
+
+        Args:
+            xml (str): The patched XML of the part.
+
+        Returns:
+            Template: The compiled Jinja template of the part.
+        """
+        xml = re.sub(r"<w:p([ >])", r"\n<w:p\1", xml)
+        return self._env.from_string(xml)
+
+    def _extract_large_tables(
+        self, xml: str, variables: Iterable[str]
+    ) -> tuple[str, list[tuple[str, Template]]]:
+        """
+        Cuts the row loops of high-volume tables out of the patched body.
+
+        Each loop is replaced by a placeholder row with the same number of cells, so docxtpl's
+        table fixes still see the table's width, and its rows become a template rendering a
+        chunk of items at a time.
+
+        Args:
+            xml (str): The patched XML of the body.
+            variables (Iterable[str]): Variables whose row loops are extracted.
+
+        Returns:
+            tuple[str, list[tuple[str, Template]]]: The body without the extracted loops, and
+                the variable and row template of each extracted loop, in document order.
+        """
+        names = "|".join(re.escape(variable) for variable in variables)
+        if not names:
+            return xml, []
+
+        pattern = re.compile(
+            r"\{%\s*for\s+(\w+)\s+in\s+(" + names + r")\s*%\}(.*?)\{%\s*endfor\s*%\}",
+            re.DOTALL,
+        )
+        tables = []
+
+        def extract(match: re.Match) -> str:
+            loop_variable, variable, row_xml = match.groups()
+            # Nested loops cannot be matched reliably by the pattern
+            if not row_xml.lstrip().startswith("<w:tr") or re.search(r"\{%\s*for\s", row_xml):
+                return match.group(0)
+
+            template = self._compile_patched(
+                f"{{% for {loop_variable} in {LARGE_TABLE_ROWS} %}}{row_xml}{{% endfor %}}"
+            )
+            marker = LARGE_TABLE_MARKER.format(len(tables))
+            tables.append((variable, template))
+
+            cells = len(re.findall(r"<w:tc[ >]", row_xml))
+            return f"<w:tr><!--{marker}-->{'<w:tc/>' * cells}</w:tr>"
+
+        return pattern.sub(extract, xml), tables
+
+    def _render_part(self, template: Template, context: dict) -> str:
+        """
+        Renders a compiled part and applies docxtpl's post-render text fixes.
+
+        Args:
+            template (Template): The compiled template of the part.
+            context (dict): The values to fill the template with.
+
+        Returns:
+            str: The rendered XML of the part.
+        """
+        xml = template.render(context)
+        xml = re.sub(r"\n<w:p([ >])", r"<w:p\1", xml)
+        xml = (
+            xml.replace("{_{", "{{")
+            .replace("}_}", "}}")
+            .replace("{_%", "{%")
+            .replace("%_}", "%}")
+        )
+        return self._helper.resolve_listing(xml)
+
+    def render(self, context: dict, output: str | Path | IO[bytes]) -> None:
+        """
+        Renders the template and writes the resulting DOCX package.
+
+        Args:
+            context (dict): The values to fill the template with.
+            output (str | Path | IO[bytes]): Where to write the rendered document.
+
+        Raises:
+            click.Abort: If a high-volume table is rendered more than once, e.g. inside an
+                outer loop, since its rows can only be streamed once.
+        """
+        helper = DocxTemplate(None)
+        helper.docx_ids_index = 1000
+
+        tree = helper.fix_tables(self._render_part(self.body_template, context))
+        helper.fix_docpr_ids(tree)
+
+        document = (
+            self._document_prefix
+            + etree.tostring(tree, encoding="UTF-8", xml_declaration=False)
+            + self._document_suffix
+        )
+
+        for index, (variable, _) in enumerate(self.large_tables):
+            marker = f"<!--{LARGE_TABLE_MARKER.format(index)}-->".encode()
+            if document.count(marker) > 1:
+                rich.print(
+                    f"[red]The large table over {variable} is rendered more than once. "
+                    f"Move it out of the enclosing loop or remove {variable} from large_tables[/red]"
+                )
+                raise click.Abort()
+
+        rendered = {}
+        for part_name, template in self.part_templates.items():
+            rendered[part_name] = self._render_part(template, context).encode("utf-8")
+
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in self.infos:
+                if info.filename == self.document_part:
+                    with zout.open(info.filename, "w") as stream:
+                        self._write_document(stream, document, context)
+                    continue
+
+                zout.writestr(
+                    info.filename,
+                    rendered.get(info.filename, self.parts[info.filename]),
+                )
+
+    def _write_document(self, stream: IO[bytes], document: bytes, context: dict) -> None:
+        """
+        Writes the main document part, streaming the rows of high-volume tables in chunks.
+
+        Args:
+            stream (IO[bytes]): The zip entry of the main document part.
+            document (bytes): The rendered document, with a placeholder row per high-volume table.
+            context (dict): The values to fill the template with.
+        """
+        position = 0
+        for index, (variable, template) in enumerate(self.large_tables):
+            marker = f"<!--{LARGE_TABLE_MARKER.format(index)}-->".encode()
+            marker_start = document.find(marker, position)
+            if marker_start == -1:
+                # The table was inside a block the body did not render
+                continue
+            row_start = document.rfind(b"<w:tr", position, marker_start)
+            row_end = document.index(b"</w:tr>", marker_start) + len(b"</w:tr>")
+
+            stream.write(document[position:row_start])
+            rows = iter(context.get(variable) or ())
+            while chunk := list(itertools.islice(rows, LARGE_TABLE_CHUNK_SIZE)):
+                xml = self._render_part(template, {**context, LARGE_TABLE_ROWS: chunk})
+                stream.write(xml.encode("utf-8"))
+            position = row_end
+
+        stream.write(document[position:])
+
+
+def get_prepared_docx_template(
+    template_file: Path, large_tables: Iterable[str] = ()
+) -> PreparedDocxTemplate | None:
+    """
+    Returns the prepared version of a DOCX template, preparing it on first use.
+
+    Prepared templates are kept in a bounded LRU keyed by the SHA-256 of the template file
+    and the high-volume table variables, so an edited template is prepared again while
+    unchanged copies share one entry.
+
+    Args:
+        template_file (Path): The path of the DOCX template.
+        large_tables (Iterable[str]): Variables whose table row loops are rendered in
+            high-volume mode, see `PreparedDocxTemplate`. Defaults to none.
+
+    Returns:
+        PreparedDocxTemplate | None: The prepared template, or None if the template uses
+            features that need docxtpl's document object and must be rendered by docxtpl.
+    """
+    package = template_file.read_bytes()
+    large_tables = tuple(sorted(large_tables))
+    key = hashlib.sha256(package).hexdigest() + "".join(
+        f"/{variable}" for variable in large_tables
+    )
+
+    with _PREPARED_LOCK:
+        if key in _PREPARED:
+            _PREPARED.move_to_end(key)
+            DOCX_CACHE_STATS.hit()
+            return _PREPARED[key]
+
+    DOCX_CACHE_STATS.miss()
+
+    try:
+        prepared = PreparedDocxTemplate(package, large_tables)
+    except ValueError:
+        prepared = None
+
+    with _PREPARED_LOCK:
+        _PREPARED[key] = prepared
+        while len(_PREPARED) > MAX_PREPARED_TEMPLATES:
+            _PREPARED.popitem(last=False)
+
+    return prepared
+
+
+def render_docx_template(
+    template_file: Path,
+    context: dict,
+    output: str | Path | IO[bytes],
+    large_tables: Iterable[str] = (),
+) -> None:
+    """
+    Renders a DOCX template, using the prepared template cache when possible.
+
+    Args:
+        template_file (Path): The path of the DOCX template.
+        context (dict): The values to fill the template with.
+        output (str | Path | IO[bytes]): Where to write the rendered document.
+        large_tables (Iterable[str]): Variables whose table row loops are rendered in
+            high-volume mode, see `PreparedDocxTemplate`. Defaults to none.
+    """
+    prepared = get_prepared_docx_template(template_file, large_tables)
+
+    if prepared is None:
+        if large_tables:
+            rich.print(
+                f"[yellow]{template_file} cannot be prepared, its large tables are rendered in memory[/yellow]"
+            )
+        doc = DocxTemplate(template_file)
+        doc.render(context)
+        doc.save(output)
+        return
+
+    prepared.render(context, output)
+
+
+def clear_docx_cache() -> None:
+    """
+    Drops every prepared DOCX template.
+    """
+    with _PREPARED_LOCK:
+        _PREPARED.clear()
@@ -0,0 +1,221 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import click
+
+from app.services.generator.main import (
+    accept_document_result,
+    document_python_executable,
+    export_cached_variants,
+    lookup_document_result,
+    read_document_config,
+    render_and_export_document,
+    variant_render_jobs,
+)
+from app.services.generator.template_generation import exec_document_script_async
+
+
+async def get_document_result_async(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    document_config: dict,
+    use_cache: bool = True,
+):
+    """
+    Runs the document script on the running loop, see `get_document_result`.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - document_config (dict): The document's configuration.
+    - use_cache (bool): Whether to reuse a memoized result. Defaults to True.
+
+    Returns:
+    - The validated result of the document script.
+
+    Raises:
+    - click.Abort: If the script fails or its result does not match the template schema.
+    """
+    cache_key, cached = await asyncio.to_thread(
+        lookup_document_result,
+        document_name,
+        repository_name,
+        document_kwargs,
+        document_config,
+        use_cache,
+    )
+    if cached is not None:
+        return cached[0]
+
+    python_executable = await asyncio.to_thread(
+        document_python_executable, document_config
+    )
+    result = await exec_document_script_async(
+        document_name, repository_name, document_kwargs, python_executable
+    )
+    await asyncio.to_thread(accept_document_result, result, document_config, cache_key)
+
+    return result
+
+
+async def generate_document_async(
+    document_name: str,
+    repository_name: str = "local",
+    document_kwargs: dict = {},
+    exporter_name: str = "local",
+    document_config: dict | None = None,
+    output_name: str | None = None,
+    use_cache: bool = True,
+) -> None:
+    """
+    Runs the generation pipeline of `generate_document` for a single document on the running loop.
+
+    Coroutine `run` functions of document scripts are awaited on the loop, while blocking stages
+    (blocking scripts, cache lookups, rendering and export) run in the loop's default executor.
+    When several documents are generated concurrently, the export of one therefore overlaps with
+    the script and render of the others. The variants of a document render concurrently too.
+
+    Parameters:
+    - document_name (str): Name of the document to generate.
+    - repository_name (str): Name of the repository where the document is located. Defaults to 'local'.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - exporter_name (str): The name of the exporter to use. Defaults to 'local'.
+    - document_config (dict | None): The document's configuration. Read from disk when not provided.
+    - output_name (str | None): Name of the rendered file, without extension. Defaults to the document name.
+    - use_cache (bool): Whether to reuse a cached output or script result. Defaults to True.
+
+    Raises:
+    - click.Abort: If any stage of the pipeline fails.
+    """
+    if document_config is None:
+        document_config = await asyncio.to_thread(
+            read_document_config, document_name, repository_name
+        )
+
+    pending = await asyncio.to_thread(
+        export_cached_variants,
+        document_name,
+        repository_name,
+        document_kwargs,
+        exporter_name,
+        document_config,
+        output_name,
+        use_cache,
+    )
+    if not pending:
+        return
+
+    result = await get_document_result_async(
+        document_name, repository_name, document_kwargs, document_config, use_cache
+    )
+    jobs = await asyncio.to_thread(
+        variant_render_jobs,
+        document_name,
+        repository_name,
+        result,
+        exporter_name,
+        pending,
+    )
+
+    await asyncio.gather(
+        *(asyncio.to_thread(render_and_export_document, *job) for job in jobs)
+    )
+
+
+async def _generate_row(
+    row_number: int,
+    document_name: str,
+    repository_name: str,
+    exporter_name: str,
+    document_config: dict,
+    document_kwargs: dict,
+    use_cache: bool = True,
+) -> tuple[int, bool, str | None]:
+    """
+    Generates the document of a single batch row, reporting failures instead of raising them.
+
+    Parameters:
+    - row_number (int): The 1-based position of the row in the batch file.
+    - document_name (str): Name of the document to generate.
+    - repository_name (str): Name of the repository where the document is located.
+    - exporter_name (str): The name of the exporter to use.
+    - document_config (dict): The document's configuration.
+    - document_kwargs (dict): Keyword arguments of the row, merged over the document defaults.
+    - use_cache (bool): Whether to reuse cached outputs. Defaults to True.
+
+    Returns:
+    - tuple[int, bool, str | None]: The row number, whether it succeeded and the error message, if any.
+    """
+    try:
+        await generate_document_async(
+            document_name,
+            repository_name,
+            document_kwargs,
+            exporter_name,
+            document_config=document_config,
+            output_name=f"{document_name}-{row_number}",
+            use_cache=use_cache,
+        )
+    except click.Abort as e:
+        return row_number, False, str(e) or "Aborted"
+    except Exception as e:
+        return row_number, False, f"{e.__class__.__name__}: {e}"
+
+    return row_number, True, None
+
+
+async def generate_rows_async(
+    rows: Iterable[tuple], concurrency: int
+) -> list[tuple[int, bool, str | None]]:
+    """
+    Generates batch rows concurrently on the running loop.
+
+    At most `concurrency` documents are in flight at any time, and the rows are consumed lazily,
+    so the batch file is streamed rather than read all at once. The loop's default executor is
+    sized to match, so every in-flight document can run a blocking stage at the same time.
+
+    Parameters:
+    - rows (Iterable[tuple]): The arguments of `generate_batch_row` for each row.
+    - concurrency (int): Maximum number of documents generated at the same time.
+
+    Returns:
+    - list[tuple[int, bool, str | None]]: The outcome of each row, in completion order.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    loop.set_default_executor(executor)
+
+    results = []
+    pending: set[asyncio.Task] = set()
+    for row in rows:
+        if len(pending) >= concurrency:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            results.extend(task.result() for task in done)
+        pending.add(asyncio.create_task(_generate_row(*row)))
+
+    if pending:
+        done, _ = await asyncio.wait(pending)
+        results.extend(task.result() for task in done)
+
+    return results
+
+
+def run_rows_async(
+    rows: Iterable[tuple], concurrency: int
+) -> list[tuple[int, bool, str | None]]:
+    """
+    Generates batch rows with the asyncio engine, see `generate_rows_async`.
+
+    Parameters:
+    - rows (Iterable[tuple]): The arguments of `generate_batch_row` for each row.
+    - concurrency (int): Maximum number of documents generated at the same time.
+
+    Returns:
+    - list[tuple[int, bool, str | None]]: The outcome of each row, in completion order.
+    """
+    return asyncio.run(generate_rows_async(rows, concurrency))
@@ -0,0 +1,166 @@
+import sys
+import json
+import shutil
+import hashlib
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from venv import EnvBuilder
+
+import rich
+import click
+
+from app.constants import ENVIRONMENTS_DIR
+from app.utils.locks import file_lock
+
+RUNNER_SCRIPT = Path(__file__).parent / "isolated_runner.py"
+
+# Marks an environment whose requirements were installed successfully
+READY_MARKER = ".docscribe_ready"
+
+
+def get_document_requirements(config: dict) -> list[str]:
+    """
+    Returns the requirements declared in a document's configuration.
+
+    `doc create` writes them under "required_modules"; older documents may use the
+    legacy "require_modules" key, which is still honoured.
+
+    Parameters:
+    - config (dict): The document's configuration.
+
+    Returns:
+    - list[str]: The document's requirements.
+    """
+    return config.get("required_modules") or config.get("require_modules") or []
+
+
+def environment_key(requirements: list[str]) -> str:
+    """
+    Returns the key of the isolated environment for a requirement set.
+
+    Documents with the same requirements on the same Python version share an environment.
+
+    Parameters:
+    - requirements (list[str]): The document's requirements.
+
+    Returns:
+    - str: The environment key.
+    """
+    payload = json.dumps(
+        [
+            sorted(set(requirements)),
+            platform.python_implementation(),
+            f"{sys.version_info.major}.{sys.version_info.minor}",
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def environment_python(environment_dir: Path) -> Path:
+    """
+    Returns the interpreter of a virtual environment.
+
+    Parameters:
+    - environment_dir (Path): The directory of the environment.
+
+    Returns:
+    - Path: The path of the environment's Python executable.
+    """
+    if sys.platform == "win32":
+        return environment_dir / "Scripts" / "python.exe"
+    return environment_dir / "bin" / "python"
+
+
+def ensure_environment(requirements: list[str]) -> Path:
+    """
+    Returns the interpreter of the isolated environment for a requirement set, creating it if needed.
+
+    Environments live in `ENVIRONMENTS_DIR` under their `environment_key` and are reused by every
+    document with the same requirements. Environments are built in place, since the scripts and
+    shebangs pip installs refer to the environment's absolute path. Builds hold a lock per
+    environment, so concurrent builds wait for each other, and the environment is only marked
+    ready once its requirements are installed, so an interrupted build is rebuilt from scratch.
+
+    Parameters:
+    - requirements (list[str]): The document's requirements.
+
+    Returns:
+    - Path: The path of the environment's Python executable.
+
+    Raises:
+    - click.Abort: If the requirements cannot be installed.
+    """
+    environment_dir = ENVIRONMENTS_DIR / environment_key(requirements)
+    if (environment_dir / READY_MARKER).exists():
+        return environment_python(environment_dir)
+
+    ENVIRONMENTS_DIR.mkdir(exist_ok=True, parents=True)
+    with file_lock(ENVIRONMENTS_DIR / f"{environment_dir.name}.lock"):
+        # Another process may have finished building it while this one waited for the lock
+        if (environment_dir / READY_MARKER).exists():
+            return environment_python(environment_dir)
+
+        rich.print(
+            f"[blue]Creating isolated environment {environment_dir.name} for {', '.join(requirements) or 'no requirements'}[/blue]"
+        )
+
+        try:
+            EnvBuilder(with_pip=bool(requirements), clear=True).create(environment_dir)
+
+            if requirements:
+                result = subprocess.run(
+                    [
+                        str(environment_python(environment_dir)),
+                        "-m",
+                        "pip",
+                        "install",
+                        *requirements,
+                    ]
+                )
+                if result.returncode != 0:
+                    rich.print("[red]Failed to install the required modules![/red]")
+                    raise click.Abort()
+
+            (environment_dir / READY_MARKER).touch()
+        except BaseException:
+            shutil.rmtree(environment_dir, ignore_errors=True)
+            raise
+
+    return environment_python(environment_dir)
+
+
+def run_isolated_script(python: Path, script_file: Path, document_kwargs: dict):
+    """
+    Runs a document script with the interpreter of an isolated environment.
+
+    The keyword arguments are passed as JSON on stdin and the result is read back as JSON, so
+    both must be JSON-serializable. Lazy iterables in the result are converted to lists and other
+    non-serializable values to strings.
+
+    Parameters:
+    - python (Path): The interpreter of the environment.
+    - script_file (Path): The path of the document script.
+    - document_kwargs (dict): A dictionary of arguments that will be passed to the document's script.
+
+    Returns:
+    - The result of the script's `run` function.
+
+    Raises:
+    - click.Abort: If the script fails.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result_file = Path(tmp_dir) / "result.json"
+        process = subprocess.run(
+            [str(python), str(RUNNER_SCRIPT), str(script_file), str(result_file)],
+            input=json.dumps(document_kwargs, default=str),
+            text=True,
+        )
+
+        if process.returncode != 0:
+            rich.print(f"[red]Document script {script_file} failed![/red]")
+            raise click.Abort()
+
+        with result_file.open("r") as file:
+            return json.load(file)
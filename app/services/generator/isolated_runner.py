@@ -0,0 +1,51 @@
+"""
+Runs a document script inside an isolated environment.
+
+This file is executed directly by the environment's interpreter, which does not have
+DocScribe installed, so it must only use the standard library.
+
+Usage: python isolated_runner.py <script_file> <result_file>
+
+The script's `run` function is called with the keyword arguments read as JSON from
+stdin, and its result is written as JSON to `result_file`. `run` may be a coroutine
+function, in which case it is run to completion in a new event loop.
+"""
+import sys
+import json
+import asyncio
+import inspect
+import importlib.util
+from collections.abc import Collection, Iterable
+
+
+def to_json(value):
+    # Lazy iterables, such as generators of rows, are sent back as lists
+    if isinstance(value, Iterable) and not isinstance(value, Collection):
+        return list(value)
+    return str(value)
+
+
+def main(script_file: str, result_file: str) -> int:
+    document_kwargs = json.load(sys.stdin)
+
+    spec = importlib.util.spec_from_file_location("docscribe_script", script_file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    if not hasattr(module, "run"):
+        print("run function not found in the document script!", file=sys.stderr)
+        return 1
+
+    result = module.run(**document_kwargs)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+
+    with open(result_file, "w") as file:
+        json.dump(result, file, default=to_json)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1], sys.argv[2]))
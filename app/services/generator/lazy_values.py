@@ -0,0 +1,85 @@
+from collections.abc import Collection, Iterable
+from typing import Callable
+
+
+def is_lazy_value(value) -> bool:
+    """
+    Checks whether a value is a lazy iterable, such as a generator, rather than a container.
+
+    Scripts may return lazy iterables for large row collections so rows are produced while the
+    template is rendered instead of being held in memory as a list.
+
+    Parameters:
+    - value: The value to check.
+
+    Returns:
+    - bool: True if the value can be iterated but is not a sized container.
+    """
+    return isinstance(value, Iterable) and not isinstance(value, Collection)
+
+
+def lazy_values_as_empty(value):
+    """
+    Returns the view of a script result that is validated, with lazy iterables replaced by
+    empty lists.
+
+    Lazy iterables can only be consumed once, by the render, so their items are not validated;
+    only the rest of the result is. Containers holding no lazy value are returned as is, so
+    results without lazy values are never copied.
+
+    Parameters:
+    - value: The script result or one of its values.
+
+    Returns:
+    - The value to validate.
+    """
+    return _replace_lazy_values(value, lambda lazy: [])
+
+
+def materialize_lazy_values(value):
+    """
+    Returns a script result with its lazy iterables consumed into lists, so it can be
+    rendered more than once.
+
+    Parameters:
+    - value: The script result or one of its values.
+
+    Returns:
+    - The result without lazy iterables.
+    """
+    return _replace_lazy_values(value, list)
+
+
+def _replace_lazy_values(value, replace: Callable):
+    """
+    Replaces the lazy iterables of a value, returning containers without lazy values as is.
+    """
+    if is_lazy_value(value):
+        return replace(value)
+
+    if isinstance(value, dict):
+        view = {key: _replace_lazy_values(item, replace) for key, item in value.items()}
+        if all(view[key] is item for key, item in value.items()):
+            return value
+        return view
+
+    if isinstance(value, (list, tuple)):
+        view = [_replace_lazy_values(item, replace) for item in value]
+        if all(new is old for new, old in zip(view, value)):
+            return value
+        return view
+
+    return value
+
+
+def contains_lazy_values(value) -> bool:
+    """
+    Checks whether a script result holds lazy iterables, see `lazy_values_as_empty`.
+
+    Parameters:
+    - value: The script result.
+
+    Returns:
+    - bool: True if any value of the result is a lazy iterable.
+    """
+    return lazy_values_as_empty(value) is not value
@@ -1,19 +1,49 @@
 import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO
 
 import rich
 import click
-from jsonschema import validate, ValidationError
 
-from app.services.exporter.main import export
+from app.services.exporter.main import export_stream
 from app.constants import REPOSITORIES_DIR
+from app.utils.files import write_json_atomic
+from app.utils.locks import file_lock
+from app.utils.read_config import read_config
+from app.utils.profiling import profile_stage
 
+from app.services.generator.output_cache import (
+    open_cached_output,
+    output_cache_key,
+    store_output,
+)
+from app.services.generator.result_cache import (
+    load_result,
+    result_cache_key,
+    store_result,
+)
+from app.services.generator.schema_validators import (
+    JSONSCHEMA_BACKEND,
+    get_schema_validator,
+    schema_hash,
+)
+from app.services.generator.lazy_values import (
+    contains_lazy_values,
+    lazy_values_as_empty,
+    materialize_lazy_values,
+)
+from app.services.generator.environments import (
+    ensure_environment,
+    get_document_requirements,
+)
 from app.services.generator.template_requirements import (
     install_requirements,
     request_document_kwargs,
 )
 from app.services.generator.template_generation import (
     exec_document_script,
-    render_document_template,
+    render_document_stream,
 )
 
 
@@ -32,7 +62,8 @@ def read_document_config(
     - dict: The document's configuration.
 
     Raises:
-    - click.Abort: If the configuration file does not exist.
+    - click.Abort: If the configuration file does not exist or a `large_tables` entry is not a
+      top-level name.
     """
     config_file = REPOSITORIES_DIR.joinpath(
         repository_name, document_name, "config.json"
@@ -45,24 +76,38 @@ def read_document_config(
     with open(config_file, "r") as file:
         document_config = json.load(file)
 
+    for variable in document_config.get("large_tables", ()):
+        # Large tables are looked up in the script result, so only top-level names are supported
+        if not isinstance(variable, str) or not variable.isidentifier():
+            rich.print(
+                f"[red]Invalid large table {variable!r}: use the name of a top-level result value[/red]"
+            )
+            raise click.Abort()
+
     return document_config
 
 
-def validate_document_result(body: dict, schema: dict):
+def validate_document_result(
+    body: dict, schema: dict, backend: str = JSONSCHEMA_BACKEND
+):
     """
     Validates the generated document information against a JSON schema.
 
+    The schema is compiled once and its validator reused for every result validated against
+    it (see `schema_validators`). Lazy iterables in the result, such as generators of rows,
+    are validated as empty arrays so they are left for the render to consume.
+
     Parameters:
     - body (dict): The document's information to be validated.
     - schema (dict): The JSON schema to validate against.
+    - backend (str): The validator backend, "jsonschema" or "fastjsonschema". Defaults to "jsonschema".
 
     Raises:
-    - click.Abort: If validation fails.
+    - click.Abort: If validation fails or the schema is invalid.
     """
-    try:
-        validate(instance=body, schema=schema)
-    except ValidationError as e:
-        rich.print(f"[red]Error: {e}[/red]")
+    error = get_schema_validator(schema, backend)(lazy_values_as_empty(body))
+    if error is not None:
+        rich.print(f"[red]Error: {error}[/red]")
         raise click.Abort()
 
 
@@ -71,6 +116,7 @@ def run(
     repository_name: str = "local",
     use_default_kwargs: bool = False,
     exporter_name: str = "local",
+    use_cache: bool = True,
 ):
     """
     Main function to generate a document and optionally export it.
@@ -84,11 +130,14 @@ def run(
     - repository_name (str): Name of the repository where the document is located. Defaults to 'local'.
     - use_default_kwargs (bool): Whether to use the default keyword arguments for the document. Defaults to False.
     - exporter_name (str): The name of the exporter to use. Defaults to 'local'.
+    - use_cache (bool): Whether to reuse a cached output of identical inputs. Defaults to True.
 
     """
 
-    document_config = read_document_config(document_name, repository_name)
-    install_requirements(document_config)
+    with profile_stage("read_document_config"):
+        document_config = read_document_config(document_name, repository_name)
+    with profile_stage("install_requirements"):
+        install_requirements(document_config)
 
     document_kwargs, have_update = (
         (document_config.get("kwargs", {}), False)
@@ -105,27 +154,473 @@ def run(
 
         document_config["kwargs"] = document_kwargs
 
-        # Save the keyword arguments
-        with open(
-            REPOSITORIES_DIR.joinpath(repository_name, document_name, "config.json"),
-            "w",
-        ) as file:
-            json.dump(document_config, file, indent=4)
+        # Save the keyword arguments, keeping changes made to the file by other processes
+        config_file = REPOSITORIES_DIR.joinpath(repository_name, document_name, "config.json")
+        with file_lock(config_file.with_name(f"{config_file.name}.lock")):
+            saved_config = read_config(config_file)
+            saved_config["kwargs"] = document_kwargs
+            write_json_atomic(config_file, saved_config, indent=4)
+
+    generate_document(
+        document_name,
+        repository_name,
+        document_kwargs,
+        exporter_name,
+        document_config=document_config,
+        use_cache=use_cache,
+    )
+
+
+def document_python_executable(document_config: dict):
+    """
+    Returns the interpreter a document script runs with.
+
+    Parameters:
+    - document_config (dict): The document's configuration.
+
+    Returns:
+    - Path | None: The interpreter of the document's isolated environment, created if needed,
+      or None to run the script in the current process.
+    """
+    if not document_config.get("isolated_environment"):
+        return None
+    with profile_stage("environment"):
+        return ensure_environment(get_document_requirements(document_config))
+
+
+def lookup_document_result(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    document_config: dict,
+    use_cache: bool = True,
+) -> tuple[str | None, tuple | None]:
+    """
+    Looks up the memoized result of a document script.
+
+    Documents with a "cache" block in their configuration keep their script results on disk
+    (see `result_cache`) for "ttl" seconds, keyed by the kwargs listed under "key", or all of
+    them. A memoized result is only validated again if the template schema changed since it
+    was stored, and is then stored again against the new schema.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - document_config (dict): The document's configuration.
+    - use_cache (bool): Whether to reuse a memoized result. Defaults to True.
+
+    Returns:
+    - tuple[str | None, tuple | None]: The key to store a new result under, or None if the document
+      is not cached, and a one-item tuple with the validated memoized result, or None on a miss.
+
+    Raises:
+    - click.Abort: If a memoized result does not match a changed template schema.
+    """
+    schema = document_config.get("template_schema", {})
+    cache_config = document_config.get("cache")
+
+    cache_key = (
+        result_cache_key(document_name, repository_name, document_kwargs, cache_config)
+        if cache_config
+        else None
+    )
+    cached = (
+        load_result(cache_key, cache_config.get("ttl"))
+        if cache_key is not None and use_cache
+        else None
+    )
+    if cached is None:
+        return cache_key, None
+
+    result, validated_schema_hash = cached
+    if validated_schema_hash != schema_hash(schema):
+        validate_document_result(
+            result,
+            schema,
+            document_config.get("schema_validator", JSONSCHEMA_BACKEND),
+        )
+        # Record the new schema so later hits skip the validation
+        store_result(cache_key, result, schema_hash(schema))
+    return cache_key, (result,)
+
+
+def accept_document_result(result, document_config: dict, cache_key: str | None) -> None:
+    """
+    Validates a new script result and memoizes it when the document is cached.
+
+    Results holding lazy iterables are not memoized, since their rows only exist while they are
+    rendered.
+
+    Parameters:
+    - result: The result returned by the document script.
+    - document_config (dict): The document's configuration.
+    - cache_key (str | None): The key returned by `lookup_document_result`.
+
+    Raises:
+    - click.Abort: If the result does not match the template schema.
+    """
+    schema = document_config.get("template_schema", {})
+    with profile_stage("validate"):
+        validate_document_result(
+            result, schema, document_config.get("schema_validator", JSONSCHEMA_BACKEND)
+        )
+
+    if cache_key is not None and not contains_lazy_values(result):
+        store_result(cache_key, result, schema_hash(schema))
+
+
+def get_document_result(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    document_config: dict,
+    use_cache: bool = True,
+):
+    """
+    Runs the document script and validates its result, reusing a memoized result when allowed.
+
+    See `lookup_document_result` for how results are memoized.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - document_config (dict): The document's configuration.
+    - use_cache (bool): Whether to reuse a memoized result. Defaults to True.
+
+    Returns:
+    - The validated result of the document script.
+
+    Raises:
+    - click.Abort: If the script fails or its result does not match the template schema.
+    """
+    cache_key, cached = lookup_document_result(
+        document_name, repository_name, document_kwargs, document_config, use_cache
+    )
+    if cached is not None:
+        return cached[0]
+
+    python_executable = document_python_executable(document_config)
+    with profile_stage("script"):
+        result = exec_document_script(
+            document_name, repository_name, document_kwargs, python_executable
+        )
+    accept_document_result(result, document_config, cache_key)
+
+    return result
+
+
+def open_cached_document(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    document_config: dict,
+    use_cache: bool = True,
+) -> tuple[str | None, IO[bytes] | None]:
+    """
+    Looks up the cached output of a document.
+
+    Documents with `"output_cache": true` in their configuration keep their outputs in a content-addressed
+    cache (see `output_cache`): when the script, template, configuration, kwargs and the script's
+    `DATA_VERSION` are unchanged, the cached output can be exported without running the script or rendering.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - document_config (dict): The document's configuration.
+    - use_cache (bool): Whether to reuse a cached output. Defaults to True.
+
+    Returns:
+    - tuple[str | None, IO[bytes] | None]: The key to store a new output under, or None if the document
+      is not cached, and the cached output, or None on a miss. The caller must close the output.
+    """
+    # Isolated scripts cannot be imported here to read their data version
+    cache_key = (
+        output_cache_key(document_name, repository_name, document_kwargs, document_config)
+        if document_config.get("output_cache")
+        and not document_config.get("isolated_environment")
+        else None
+    )
+    if cache_key is None or not use_cache:
+        return cache_key, None
+
+    return cache_key, open_cached_output(cache_key, document_config["template_type"])
+
+
+def export_document(
+    exporter_name: str,
+    output: IO[bytes],
+    file_name: str,
+    document_type: str,
+    cache_key: str | None = None,
+) -> None:
+    """
+    Exports a rendered document, storing it in the output cache first when the document is cached.
+
+    Parameters:
+    - exporter_name (str): The name of the exporter to use.
+    - output (IO[bytes]): The rendered document. It is closed once exported.
+    - file_name (str): The name of the exported file.
+    - document_type (str): The type of the document.
+    - cache_key (str | None): The key returned by `open_cached_document`.
+    """
+    with output:
+        if cache_key is not None:
+            store_output(cache_key, document_type, output)
+        export_stream(exporter_name, output, file_name)
+
+
+def document_variants(document_config: dict) -> list[dict]:
+    """
+    Returns the configuration of each output of a document.
+
+    A document renders a single `template.<template_type>` by default. With a "variants" list in
+    its configuration, it renders one output per variant from a single script run instead, e.g.
+    the same data as DOCX and HTML, or in several locales. Each variant has a "name" and may set
+    its "template_type", its "template" file and a "context" merged over the script result.
+
+    Parameters:
+    - document_config (dict): The document's configuration.
+
+    Returns:
+    - list[dict]: The document's configuration, specialised for each variant.
+    """
+    variants = document_config.get("variants")
+    if not variants:
+        return [document_config]
+
+    return [
+        {
+            **document_config,
+            "template_type": variant.get(
+                "template_type", document_config["template_type"]
+            ),
+            "template": variant.get("template"),
+            "context": variant.get("context", {}),
+            "variant": variant["name"],
+        }
+        for variant in variants
+    ]
+
+
+def document_file_name(
+    document_name: str, output_name: str | None, document_config: dict
+) -> str:
+    """
+    Returns the name of the exported file of a document, or of one of its variants.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - output_name (str | None): Name of the rendered file, without extension. Defaults to the document name.
+    - document_config (dict): The configuration of the document or variant, see `document_variants`.
+
+    Returns:
+    - str: The file name, suffixed with the variant name for variants.
+    """
+    base_name = output_name or document_name
+    if "variant" in document_config:
+        base_name = f"{base_name}-{document_config['variant']}"
+
+    return f"{base_name}.{document_config['template_type']}"
 
-    result = exec_document_script(document_name, repository_name, document_kwargs)
 
-    validate_document_result(result, document_config.get("template_schema", {}))
+def render_and_export_document(
+    document_name: str,
+    repository_name: str,
+    result: dict,
+    exporter_name: str,
+    file_name: str,
+    document_config: dict,
+    cache_key: str | None = None,
+) -> None:
+    """
+    Renders a script result with the template of a document, or of one of its variants, and exports it.
 
-    output_path = render_document_template(
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - result (dict): The validated script result.
+    - exporter_name (str): The name of the exporter to use.
+    - file_name (str): The name of the exported file.
+    - document_config (dict): The configuration of the document or variant, see `document_variants`.
+    - cache_key (str | None): The key returned by `open_cached_document`.
+    """
+    document_type = document_config["template_type"]
+    suffix = f":{document_config['variant']}" if "variant" in document_config else ""
+
+    if document_config.get("context"):
+        result = {**result, **document_config["context"]}
+
+    with profile_stage(f"render{suffix}"):
+        output = render_document_stream(
+            document_name,
+            repository_name,
+            result,
+            document_type,
+            document_config.get("large_tables", ()),
+            document_config.get("template"),
+        )
+
+    # Export the document straight from the rendered buffer
+    with profile_stage(f"export{suffix}"):
+        export_document(exporter_name, output, file_name, document_type, cache_key)
+
+
+def export_cached_variants(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    exporter_name: str,
+    document_config: dict,
+    output_name: str | None = None,
+    use_cache: bool = True,
+) -> list[tuple[str, dict, str | None]]:
+    """
+    Exports the cached output of each variant of a document, see `open_cached_document`.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - exporter_name (str): The name of the exporter to use.
+    - document_config (dict): The document's configuration.
+    - output_name (str | None): Name of the rendered file, without extension. Defaults to the document name.
+    - use_cache (bool): Whether to reuse a cached output. Defaults to True.
+
+    Returns:
+    - list[tuple[str, dict, str | None]]: The file name, configuration and output cache key of
+      each variant that still has to be rendered.
+    """
+    pending = []
+    for variant_config in document_variants(document_config):
+        file_name = document_file_name(document_name, output_name, variant_config)
+        cache_key, cached = open_cached_document(
+            document_name, repository_name, document_kwargs, variant_config, use_cache
+        )
+        if cached is None:
+            pending.append((file_name, variant_config, cache_key))
+            continue
+
+        with profile_stage("export"):
+            export_document(
+                exporter_name, cached, file_name, variant_config["template_type"]
+            )
+
+    return pending
+
+
+def variant_render_jobs(
+    document_name: str,
+    repository_name: str,
+    result,
+    exporter_name: str,
+    pending: list[tuple[str, dict, str | None]],
+) -> list[tuple]:
+    """
+    Returns the arguments of `render_and_export_document` for each variant left to render.
+
+    Lazy iterables in the result are consumed into lists first when more than one variant
+    renders them.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - result: The validated script result.
+    - exporter_name (str): The name of the exporter to use.
+    - pending (list[tuple[str, dict, str | None]]): The variants returned by `export_cached_variants`.
+
+    Returns:
+    - list[tuple]: The arguments of each render.
+    """
+    if len(pending) > 1:
+        result = materialize_lazy_values(result)
+
+    return [
+        (
+            document_name,
+            repository_name,
+            result,
+            exporter_name,
+            file_name,
+            variant_config,
+            cache_key,
+        )
+        for file_name, variant_config, cache_key in pending
+    ]
+
+
+def generate_document(
+    document_name: str,
+    repository_name: str = "local",
+    document_kwargs: dict = {},
+    exporter_name: str = "local",
+    document_config: dict | None = None,
+    output_name: str | None = None,
+    use_cache: bool = True,
+):
+    """
+    Runs the non-interactive part of the generation pipeline for a single document.
+
+    The document script is executed with the given keyword arguments, its result is validated
+    against the document's template schema, the template is rendered into an in-memory buffer and
+    the exporter consumes that buffer directly. This is shared by the interactive `run` and by
+    batch generation, which is why it never prompts.
+
+    Documents with variants (see `document_variants`) run their script and validate its result
+    once, then render and export every variant concurrently. Lazy iterables in the result are
+    consumed into lists first when more than one variant renders them.
+
+    Cached outputs and memoized script results are reused when the document enables them, see
+    `open_cached_document` and `lookup_document_result`.
+
+    Parameters:
+    - document_name (str): Name of the document to generate.
+    - repository_name (str): Name of the repository where the document is located. Defaults to 'local'.
+    - document_kwargs (dict): Keyword arguments passed to the document's script.
+    - exporter_name (str): The name of the exporter to use. Defaults to 'local'.
+    - document_config (dict | None): The document's configuration. Read from disk when not provided.
+    - output_name (str | None): Name of the rendered file, without extension. Defaults to the document name.
+    - use_cache (bool): Whether to reuse a cached output or script result. When False the document is
+      regenerated and the cached entries replaced. Defaults to True.
+
+    Raises:
+    - click.Abort: If any stage of the pipeline fails.
+    """
+    if document_config is None:
+        document_config = read_document_config(document_name, repository_name)
+
+    pending = export_cached_variants(
         document_name,
         repository_name,
-        result,
-        document_config["template_type"],
+        document_kwargs,
+        exporter_name,
+        document_config,
+        output_name,
+        use_cache,
     )
+    if not pending:
+        return
 
-    # Export the document
-    export(
-        exporter_name,
-        output_path,
-        "rb" if document_config["template_type"] == "docx" else "r",
+    result = get_document_result(
+        document_name, repository_name, document_kwargs, document_config, use_cache
+    )
+    jobs = variant_render_jobs(
+        document_name, repository_name, result, exporter_name, pending
     )
+
+    if len(jobs) == 1:
+        render_and_export_document(*jobs[0])
+        return
+
+    # Each variant runs in a copy of the current context so its stages reach the active profiler
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run, render_and_export_document, *job
+            )
+            for job in jobs
+        ]
+        for future in futures:
+            future.result()
@@ -0,0 +1,196 @@
+import json
+import os
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import IO
+
+import rich
+import click
+
+from app.constants import CACHE_DIR, CONFIG, REPOSITORIES_DIR
+from app.utils.cache import CacheStats
+from app.utils.files import atomic_write
+from app.services.generator.script_loader import load_document_script
+
+OUTPUT_CACHE_STATS = CacheStats("outputs")
+
+OUTPUT_CACHE_DIR = CACHE_DIR / "outputs"
+
+# Default size limit of the output cache, overridden by the "output_cache_max_size" setting
+DEFAULT_OUTPUT_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+_EVICTION_LOCK = threading.Lock()
+
+
+def get_data_version(script_file: Path, document_kwargs: dict) -> str | None:
+    """
+    Returns the data version declared by a document script.
+
+    Scripts declare the version of the data they read with a module-level `DATA_VERSION`,
+    either a value or a function called with the document's keyword arguments, e.g. one
+    returning the date of the last data load. Outputs are only reused while it is unchanged.
+
+    Parameters:
+    - script_file (Path): The path of the document script.
+    - document_kwargs (dict): The keyword arguments of the generation.
+
+    Returns:
+    - str | None: The data version, or None if the script does not declare one.
+
+    Raises:
+    - click.Abort: If the script cannot be loaded or its data version cannot be computed.
+    """
+    try:
+        data_version = getattr(load_document_script(script_file), "DATA_VERSION", None)
+        if callable(data_version):
+            data_version = data_version(**document_kwargs)
+    except Exception as e:
+        rich.print(f"[red]Error reading the data version of {script_file}: {e}[/red]")
+        raise click.Abort()
+
+    return None if data_version is None else str(data_version)
+
+
+def output_cache_key(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    document_config: dict,
+) -> str | None:
+    """
+    Builds the content address of a document's output.
+
+    The key is the SHA-256 of the document's script, template and configuration, of the
+    generation's keyword arguments and of the script's data version, so any change to the
+    inputs produces a new key and stale outputs are never served.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): The keyword arguments of the generation.
+    - document_config (dict): The document's configuration.
+
+    Returns:
+    - str | None: The hexadecimal key of the output, or None if the script or template is
+      missing, in which case the generation reports the error itself.
+    """
+    document_dir = REPOSITORIES_DIR.joinpath(repository_name, document_name)
+    script_file = document_dir / "script.py"
+    template_file = document_dir / (
+        document_config.get("template") or f"template.{document_config['template_type']}"
+    )
+
+    digest = hashlib.sha256()
+    for file in (script_file, template_file):
+        try:
+            content = file.read_bytes()
+        except FileNotFoundError:
+            return None
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+
+    digest.update(
+        json.dumps(
+            {
+                "config": document_config,
+                "kwargs": document_kwargs,
+                "data_version": get_data_version(script_file, document_kwargs),
+            },
+            sort_keys=True,
+            default=str,
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def _output_path(key: str, document_type: str) -> Path:
+    return OUTPUT_CACHE_DIR / f"{key}.{document_type}"
+
+
+def open_cached_output(key: str, document_type: str) -> IO[bytes] | None:
+    """
+    Opens a cached output, marking it as recently used.
+
+    Parameters:
+    - key (str): The key of the output, see `output_cache_key`.
+    - document_type (str): The type of the document.
+
+    Returns:
+    - IO[bytes] | None: The cached output, or None if it is not cached. The caller must close it.
+    """
+    path = _output_path(key, document_type)
+    try:
+        file = path.open("rb")
+    except FileNotFoundError:
+        OUTPUT_CACHE_STATS.miss()
+        return None
+
+    # The modification time orders entries for eviction
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+    OUTPUT_CACHE_STATS.hit()
+    return file
+
+
+def store_output(key: str, document_type: str, output: IO[bytes]) -> None:
+    """
+    Stores a rendered output in the cache, then evicts the least recently used entries
+    until the cache fits in its size limit.
+
+    Parameters:
+    - key (str): The key of the output, see `output_cache_key`.
+    - document_type (str): The type of the document.
+    - output (IO[bytes]): The rendered document, read from its current position and
+      rewound to it afterwards.
+    """
+    OUTPUT_CACHE_DIR.mkdir(exist_ok=True, parents=True)
+
+    position = output.tell()
+    with atomic_write(_output_path(key, document_type), "wb") as file:
+        shutil.copyfileobj(output, file)
+    output.seek(position)
+
+    evict_outputs(CONFIG.get("output_cache_max_size", DEFAULT_OUTPUT_CACHE_MAX_SIZE))
+
+
+def evict_outputs(max_size: int) -> None:
+    """
+    Removes the least recently used outputs until the cache is at most `max_size` bytes.
+
+    Parameters:
+    - max_size (int): The size limit of the cache, in bytes.
+    """
+    with _EVICTION_LOCK:
+        entries = []
+        try:
+            with os.scandir(OUTPUT_CACHE_DIR) as it:
+                for entry in it:
+                    # Skip the temporary files of writes in progress
+                    if entry.name.startswith(".") or not entry.is_file():
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except FileNotFoundError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_size:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+
+
+def clear_output_cache() -> None:
+    """
+    Removes every cached output.
+    """
+    shutil.rmtree(OUTPUT_CACHE_DIR, ignore_errors=True)
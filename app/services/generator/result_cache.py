@@ -0,0 +1,128 @@
+import json
+import time
+import zlib
+import pickle
+import hashlib
+from pathlib import Path
+
+from app.constants import CACHE_DIR, REPOSITORIES_DIR
+from app.utils.cache import CacheStats
+from app.utils.files import atomic_write
+
+RESULT_CACHE_STATS = CacheStats("script_results")
+
+RESULT_CACHE_DIR = CACHE_DIR / "results"
+
+
+def result_cache_key(
+    document_name: str,
+    repository_name: str,
+    document_kwargs: dict,
+    cache_config: dict,
+) -> str | None:
+    """
+    Builds the key of a script result.
+
+    The key covers the document, the content of its script and the keyword arguments listed
+    under "key" in the cache configuration, or every keyword argument when no list is given.
+    Editing the script therefore never serves results of its previous version.
+
+    Parameters:
+    - document_name (str): Name of the document.
+    - repository_name (str): Name of the repository where the document is located.
+    - document_kwargs (dict): The keyword arguments passed to the script.
+    - cache_config (dict): The "cache" block of the document's configuration.
+
+    Returns:
+    - str | None: The hexadecimal key, or None if the script is missing.
+    """
+    script_file = REPOSITORIES_DIR.joinpath(repository_name, document_name, "script.py")
+    try:
+        script = script_file.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    key_fields = cache_config.get("key")
+    if key_fields is None:
+        key_kwargs = document_kwargs
+    else:
+        key_kwargs = {field: document_kwargs.get(field) for field in key_fields}
+
+    digest = hashlib.sha256(f"{repository_name}/{document_name}\0".encode())
+    digest.update(hashlib.sha256(script).digest())
+    digest.update(json.dumps(key_kwargs, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _result_path(key: str) -> Path:
+    return RESULT_CACHE_DIR / f"{key}.bin"
+
+
+def load_result(key: str, ttl: float | None) -> tuple[object, str | None] | None:
+    """
+    Loads a cached script result if it has not expired.
+
+    Entries are pickled and zlib-compressed. Expired or unreadable entries are removed.
+
+    Parameters:
+    - key (str): The key of the result, see `result_cache_key`.
+    - ttl (float | None): Seconds a result stays valid, or None for no expiry.
+
+    Returns:
+    - tuple[object, str | None] | None: The result and the hash of the schema it was validated
+      against, or None if no valid entry exists.
+    """
+    path = _result_path(key)
+    try:
+        entry = pickle.loads(zlib.decompress(path.read_bytes()))
+    except FileNotFoundError:
+        RESULT_CACHE_STATS.miss()
+        return None
+    except Exception:
+        path.unlink(missing_ok=True)
+        RESULT_CACHE_STATS.miss()
+        return None
+
+    if ttl is not None and time.time() - entry["created_at"] >= ttl:
+        path.unlink(missing_ok=True)
+        RESULT_CACHE_STATS.miss()
+        return None
+
+    RESULT_CACHE_STATS.hit()
+    return entry["result"], entry["schema_hash"]
+
+
+def store_result(key: str, result: object, validated_schema_hash: str | None) -> None:
+    """
+    Stores a script result.
+
+    Results that cannot be pickled are not cached.
+
+    Parameters:
+    - key (str): The key of the result, see `result_cache_key`.
+    - result (object): The result returned by the document script.
+    - validated_schema_hash (str | None): The hash of the schema the result was validated against.
+    """
+    try:
+        data = pickle.dumps(
+            {
+                "created_at": time.time(),
+                "schema_hash": validated_schema_hash,
+                "result": result,
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+
+    RESULT_CACHE_DIR.mkdir(exist_ok=True, parents=True)
+    with atomic_write(_result_path(key), "wb") as file:
+        file.write(zlib.compress(data))
+
+
+def clear_result_cache() -> None:
+    """
+    Removes every cached script result.
+    """
+    for path in RESULT_CACHE_DIR.glob("*.bin"):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,146 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import rich
+import click
+
+from app.utils.cache import CacheStats
+
+VALIDATOR_CACHE_STATS = CacheStats("schema_validators")
+
+MAX_VALIDATORS = 64
+
+# Backends of the "schema_validator" document setting
+JSONSCHEMA_BACKEND = "jsonschema"
+FASTJSONSCHEMA_BACKEND = "fastjsonschema"
+
+# A validator returns the message of the first error found, or None if the instance is valid
+Validator = Callable[[object], str | None]
+
+_VALIDATORS: OrderedDict[tuple[str, str], Validator] = OrderedDict()
+_VALIDATORS_LOCK = threading.Lock()
+
+
+def schema_hash(schema: dict) -> str:
+    """
+    Returns a stable hash of a template schema.
+
+    Parameters:
+    - schema (dict): The JSON schema of the document's template.
+
+    Returns:
+    - str: The hexadecimal SHA-256 of the schema.
+    """
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def _compile_jsonschema(schema: dict) -> Validator:
+    """
+    Checks a schema against its meta-schema and builds a reusable jsonschema validator.
+
+    Errors are reported like `jsonschema.validate` does, with the most relevant one first.
+    """
+    # jsonschema is slow to import, so it is only loaded when a schema is compiled
+    from jsonschema.exceptions import best_match
+    from jsonschema.validators import validator_for
+
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+
+    def validate(instance) -> str | None:
+        error = best_match(validator.iter_errors(instance))
+        return None if error is None else str(error)
+
+    return validate
+
+
+def _compile_fastjsonschema(schema: dict) -> Validator:
+    """
+    Generates the code of a validator specialised for a schema with fastjsonschema.
+    """
+    import fastjsonschema
+
+    compiled = fastjsonschema.compile(schema)
+
+    def validate(instance) -> str | None:
+        try:
+            compiled(instance)
+        except fastjsonschema.JsonSchemaValueException as e:
+            return e.message
+        return None
+
+    return validate
+
+
+def get_schema_validator(schema: dict, backend: str = JSONSCHEMA_BACKEND) -> Validator:
+    """
+    Returns the compiled validator of a schema, compiling it on first use.
+
+    Validators are kept in a bounded LRU keyed by the schema's hash and the backend, so the
+    meta-schema check and the validator construction run once per schema instead of once per
+    validated result. The "fastjsonschema" backend generates Python code specialised for the
+    schema, which is much faster on large results; it requires the optional `fastjsonschema`
+    package and falls back to jsonschema when it is not installed.
+
+    Parameters:
+    - schema (dict): The JSON schema to validate against.
+    - backend (str): "jsonschema" or "fastjsonschema". Defaults to "jsonschema".
+
+    Returns:
+    - Validator: A function returning the first validation error of an instance, or None.
+
+    Raises:
+    - click.Abort: If the schema itself is invalid or the backend is unknown.
+    """
+    if backend == FASTJSONSCHEMA_BACKEND:
+        try:
+            import fastjsonschema  # noqa: F401
+        except ImportError:
+            rich.print(
+                "[yellow]fastjsonschema is not installed, using jsonschema instead[/yellow]"
+            )
+            backend = JSONSCHEMA_BACKEND
+    elif backend != JSONSCHEMA_BACKEND:
+        rich.print(f"[red]Unknown schema validator {backend}[/red]")
+        raise click.Abort()
+
+    key = (schema_hash(schema), backend)
+
+    with _VALIDATORS_LOCK:
+        validator = _VALIDATORS.get(key)
+        if validator is not None:
+            _VALIDATORS.move_to_end(key)
+            VALIDATOR_CACHE_STATS.hit()
+            return validator
+
+    VALIDATOR_CACHE_STATS.miss()
+
+    compile_schema = (
+        _compile_fastjsonschema
+        if backend == FASTJSONSCHEMA_BACKEND
+        else _compile_jsonschema
+    )
+    try:
+        validator = compile_schema(schema)
+    except Exception as e:
+        rich.print(f"[red]Invalid template schema: {e}[/red]")
+        raise click.Abort()
+
+    with _VALIDATORS_LOCK:
+        _VALIDATORS[key] = validator
+        while len(_VALIDATORS) > MAX_VALIDATORS:
+            _VALIDATORS.popitem(last=False)
+
+    return validator
+
+
+def clear_validator_cache() -> None:
+    """
+    Drops every compiled validator.
+    """
+    with _VALIDATORS_LOCK:
+        _VALIDATORS.clear()
@@ -0,0 +1,103 @@
+import re
+import sys
+import hashlib
+import threading
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+from app.utils.cache import CacheStats
+
+SCRIPT_CACHE_STATS = CacheStats("document_scripts")
+
+_MODULES: dict[Path, tuple[tuple[int, int], ModuleType]] = {}
+_MODULES_LOCK = threading.Lock()
+# Serialize the imports of each script, guarded by _MODULES_LOCK
+_SCRIPT_LOCKS: dict[Path, threading.Lock] = {}
+
+
+def script_module_name(script_file: Path) -> str:
+    """
+    Builds the unique `sys.modules` name of a document script.
+
+    The name combines the repository and document directory names, which keeps tracebacks
+    readable, with a short hash of the resolved path so two scripts never share a module.
+
+    Parameters:
+    - script_file (Path): The resolved path of the document script.
+
+    Returns:
+    - str: The module name of the script.
+    """
+    readable = re.sub(
+        r"\W", "_", f"{script_file.parent.parent.name}__{script_file.parent.name}"
+    )
+    digest = hashlib.sha1(str(script_file).encode()).hexdigest()[:8]
+    return f"docscribe_script_{readable}_{digest}"
+
+
+def load_document_script(script_file: Path) -> ModuleType:
+    """
+    Returns the loaded module of a document script, importing it only when needed.
+
+    Modules are kept for the life of the process and keyed by the script's resolved path,
+    so the script's top-level imports run once. The script is imported again when its mtime
+    or size changes. Concurrent loads of the same script wait for a single import, while
+    different scripts are imported in parallel.
+
+    Parameters:
+    - script_file (Path): The path of the document script.
+
+    Returns:
+    - ModuleType: The loaded script module.
+
+    Raises:
+    - Exception: Any error raised while executing the script's top-level code.
+    """
+    script_file = script_file.resolve()
+    stat = script_file.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _MODULES_LOCK:
+        cached = _MODULES.get(script_file)
+        if cached is not None and cached[0] == version:
+            SCRIPT_CACHE_STATS.hit()
+            return cached[1]
+        script_lock = _SCRIPT_LOCKS.setdefault(script_file, threading.Lock())
+
+    with script_lock:
+        # Another thread may have imported the script while this one waited
+        with _MODULES_LOCK:
+            cached = _MODULES.get(script_file)
+            if cached is not None and cached[0] == version:
+                SCRIPT_CACHE_STATS.hit()
+                return cached[1]
+
+        SCRIPT_CACHE_STATS.miss()
+
+        module_name = script_module_name(script_file)
+        spec = importlib.util.spec_from_file_location(module_name, script_file)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            with _MODULES_LOCK:
+                _MODULES.pop(script_file, None)
+            raise
+
+        with _MODULES_LOCK:
+            _MODULES[script_file] = (version, module)
+
+    return module
+
+
+def clear_script_cache() -> None:
+    """
+    Forgets every loaded document script.
+    """
+    with _MODULES_LOCK:
+        for _, module in _MODULES.values():
+            sys.modules.pop(module.__name__, None)
+        _MODULES.clear()
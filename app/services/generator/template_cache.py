@@ -0,0 +1,98 @@
+import threading
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from jinja2.bccache import Bucket
+
+from app.constants import CACHE_DIR
+from app.utils.cache import CacheStats
+
+ENVIRONMENT_CACHE_STATS = CacheStats("jinja_environments")
+BYTECODE_CACHE_STATS = CacheStats("jinja_bytecode")
+
+_ENVIRONMENTS: dict[Path, Environment] = {}
+_ENVIRONMENTS_LOCK = threading.Lock()
+
+
+class CountingBytecodeCache(FileSystemBytecodeCache):
+    """
+    A Jinja bytecode cache stored on disk that records its hits and misses.
+
+    Buckets are keyed by template name and path, and Jinja discards a stored bucket
+    when the checksum of the template source changes, so edited templates are recompiled.
+    """
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """
+        Loads the compiled template of a bucket from disk, if present.
+
+        Args:
+            bucket (Bucket): The bucket of the template being loaded.
+        """
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            BYTECODE_CACHE_STATS.miss()
+        else:
+            BYTECODE_CACHE_STATS.hit()
+
+
+def get_template_environment(template_dir: Path) -> Environment:
+    """
+    Returns the Jinja environment of a document directory, creating it on first use.
+
+    Environments are kept for the life of the process, so their in-memory template cache
+    survives between renders. `auto_reload` makes Jinja check the template's mtime on each
+    lookup, and compiled templates are also persisted to `CACHE_DIR` to be shared between
+    processes.
+
+    Args:
+        template_dir (Path): The directory containing the document's templates.
+
+    Returns:
+        Environment: The cached Jinja environment for the directory.
+    """
+    key = template_dir.resolve()
+
+    with _ENVIRONMENTS_LOCK:
+        env = _ENVIRONMENTS.get(key)
+        if env is not None:
+            ENVIRONMENT_CACHE_STATS.hit()
+            return env
+
+        ENVIRONMENT_CACHE_STATS.miss()
+
+        bytecode_dir = CACHE_DIR / "jinja"
+        bytecode_dir.mkdir(exist_ok=True, parents=True)
+
+        env = Environment(
+            loader=FileSystemLoader(key),
+            bytecode_cache=CountingBytecodeCache(str(bytecode_dir)),
+            auto_reload=True,
+        )
+        _ENVIRONMENTS[key] = env
+
+    return env
+
+
+def get_document_template(template_file: Path) -> Template:
+    """
+    Returns the compiled Jinja template for a document template file.
+
+    Args:
+        template_file (Path): The path of the template file.
+
+    Returns:
+        Template: The compiled template, served from cache when up to date.
+    """
+    env = get_template_environment(template_file.parent)
+    return env.get_template(template_file.name)
+
+
+def clear_template_cache() -> None:
+    """
+    Drops every cached environment and the compiled templates stored on disk.
+    """
+    with _ENVIRONMENTS_LOCK:
+        for env in _ENVIRONMENTS.values():
+            env.bytecode_cache.clear()
+        _ENVIRONMENTS.clear()
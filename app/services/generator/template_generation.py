@@ -1,16 +1,30 @@
-import sys
-import importlib.util
+import io
+import asyncio
+import inspect
+import tempfile
+from pathlib import Path
+from typing import IO, Iterable
 
 import rich
 import click
-from docxtpl import DocxTemplate
-from jinja2 import Environment, FileSystemLoader
 
 from app.constants import REPOSITORIES_DIR, TEMPLATES_TYPES, TMP_DIR
+from app.services.generator.environments import run_isolated_script
+from app.services.generator.script_loader import load_document_script
+from app.services.generator.template_cache import get_document_template
+
+# Rendered documents larger than this are buffered on disk instead of in memory
+RENDER_BUFFER_MAX_SIZE = 64 * 1024 * 1024
+
+# Number of template chunks joined before each write of a streamed text render
+RENDER_STREAM_BUFFER = 64
 
 
 def exec_document_script(
-    document_name: str, repository_name: str = "local", document_kwargs: dict = {}
+    document_name: str,
+    repository_name: str = "local",
+    document_kwargs: dict = {},
+    python_executable: Path | None = None,
 ):
     """
     Executes the document generation script for a given document.
@@ -19,86 +33,250 @@ def exec_document_script(
     - document_name (str): The name of the document.
     - repository_name (str): The name of the repository where the document is stored. Defaults to 'local'.
     - document_kwargs (dict): A dictionary of arguments that will be passed to the document's script.
+    - python_executable (Path | None): Run the script in a separate process with this interpreter, e.g. the one
+      of an isolated environment. The arguments and result must then be JSON-serializable.
+
+    This function loads and executes the `run` function from the document's script file. The script module is
+    cached per process and only re-imported when the file changes (see `script_loader`). It aborts the process
+    if the script file does not exist, fails to import or if the `run` function is not found. Scripts may define
+    `run` as a coroutine function; it is then run to completion in a new event loop, see
+    `exec_document_script_async` to await it from a running one instead.
+
+    Raises:
+    - click.Abort: If the script file is not found or an error occurs during the script execution.
+    """
+    script_file = find_document_script(document_name, repository_name)
 
-    This function loads and executes the `run` function from the document's script file. It aborts the process
-    if the script file does not exist or if the `run` function is not found.
+    if python_executable is not None:
+        return run_isolated_script(python_executable, script_file, document_kwargs)
+
+    run_script = load_run_function(script_file)
+
+    # Execute the document script
+    try:
+        result = run_script(**document_kwargs)
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+        return result
+    except Exception as e:
+        rich.print(f"[red]Error: {e}[/red]")
+        raise click.Abort()
+
+
+async def exec_document_script_async(
+    document_name: str,
+    repository_name: str = "local",
+    document_kwargs: dict = {},
+    python_executable: Path | None = None,
+):
+    """
+    Executes the document generation script for a given document from a running event loop.
+
+    Coroutine `run` functions are awaited on the running loop, so their I/O overlaps with the other
+    tasks of the loop. Loading the script, blocking `run` functions and isolated environments are
+    run in the loop's default executor instead.
+
+    Parameters:
+    - document_name (str): The name of the document.
+    - repository_name (str): The name of the repository where the document is stored. Defaults to 'local'.
+    - document_kwargs (dict): A dictionary of arguments that will be passed to the document's script.
+    - python_executable (Path | None): Run the script in a separate process with this interpreter.
 
     Raises:
     - click.Abort: If the script file is not found or an error occurs during the script execution.
     """
+    script_file = find_document_script(document_name, repository_name)
+
+    if python_executable is not None:
+        return await asyncio.to_thread(
+            run_isolated_script, python_executable, script_file, document_kwargs
+        )
+
+    # The first load imports the script and its dependencies, which must not block the loop
+    run_script = await asyncio.to_thread(load_run_function, script_file)
+
+    try:
+        if inspect.iscoroutinefunction(run_script):
+            return await run_script(**document_kwargs)
+        result = await asyncio.to_thread(run_script, **document_kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    except Exception as e:
+        rich.print(f"[red]Error: {e}[/red]")
+        raise click.Abort()
+
+
+def find_document_script(document_name: str, repository_name: str = "local") -> Path:
+    """
+    Returns the path of a document's script file.
+
+    Parameters:
+    - document_name (str): The name of the document.
+    - repository_name (str): The repository where the document is located. Defaults to 'local'.
+
+    Returns:
+    - pathlib.Path: The path of the script file.
+
+    Raises:
+    - click.Abort: If the script file is not found.
+    """
     script_file = REPOSITORIES_DIR.joinpath(repository_name, document_name, "script.py")
 
     if not script_file.exists():
         rich.print(f"[red]Document script {script_file} not found![/red]")
         raise click.Abort()
 
-    spec = importlib.util.spec_from_file_location("module.name", script_file)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = module
-    spec.loader.exec_module(module)
+    return script_file
 
-    # Execute the document script
-    if hasattr(module, "run"):
-        try:
-            result = module.run(**document_kwargs)
-            return result
-        except Exception as e:
-            rich.print(f"[red]Error: {e}[/red]")
-            raise click.Abort()
 
-    rich.print("[red]run function not found in the document script![/red]")
-    raise click.Abort()
+def load_run_function(script_file: Path):
+    """
+    Returns the `run` function of a document script.
 
+    Parameters:
+    - script_file (Path): The path of the document script.
+
+    Returns:
+    - The script's `run` function, which may be a coroutine function.
 
-def render_document_template(
+    Raises:
+    - click.Abort: If the script fails to import or has no `run` function.
+    """
+    try:
+        module = load_document_script(script_file)
+    except Exception as e:
+        rich.print(f"[red]Error loading document script {script_file}: {e}[/red]")
+        raise click.Abort()
+
+    if not hasattr(module, "run"):
+        rich.print("[red]run function not found in the document script![/red]")
+        raise click.Abort()
+
+    return module.run
+
+
+def find_document_template(
     document_name: str,
     repository_name: str = "local",
-    document_info: dict = {},
     document_type: str = TEMPLATES_TYPES.default(),
-):
+    template_name: str | None = None,
+) -> Path:
     """
-    Renders the template of the specified document.
+    Returns the path of a document's template file.
 
     Parameters:
     - document_name (str): The name of the document.
     - repository_name (str): The repository where the document is located. Defaults to 'local'.
-    - document_info (dict): A dictionary containing the information to be filled in the document template.
     - document_type (str): The type of the document template. Defaults to the default template type.
-
-    This function finds and processes the document's template file using Jinja2 for HTML templates or docxtpl for
-    DOCX templates, filling it with the provided `document_info`. It saves the rendered document in a temporary directory.
+    - template_name (str | None): The file name of the template inside the document package.
+      Defaults to `template.<document_type>`.
 
     Returns:
-    - pathlib.Path: The path to the rendered document.
+    - pathlib.Path: The path of the template file.
 
     Raises:
-    - click.Abort: If the template file is not found or if there's an issue during rendering.
+    - click.Abort: If the template file is not found.
     """
-
     template_file = REPOSITORIES_DIR.joinpath(
-        repository_name, document_name, f"template.{document_type}"
+        repository_name, document_name, template_name or f"template.{document_type}"
     )
 
     if not template_file.exists():
         rich.print(f"[red]Document template {template_file} not found![/red]")
         raise click.Abort()
 
-    output = TMP_DIR.joinpath(f"{document_name}.{document_type}")
-    output.parent.mkdir(exist_ok=True, parents=True)
+    return template_file
+
+
+def write_rendered_template(
+    template_file: Path,
+    document_info: dict,
+    document_type: str,
+    output: IO[bytes],
+    large_tables: Iterable[str] = (),
+) -> None:
+    """
+    Renders a template file into a binary stream.
+
+    DOCX templates are rendered with docxtpl, through the prepared template cache. Text templates
+    are rendered with Jinja2 chunk by chunk, so the whole output never exists as a single string:
+    small chunks are grouped in batches of `RENDER_STREAM_BUFFER` and written through a buffered
+    text writer. Lazy iterables in `document_info`, such as generators of rows, are consumed while
+    rendering, so their items never exist as one list either. In DOCX templates, the table row loops
+    over the `large_tables` variables are rendered in chunks, see `docx_cache.PreparedDocxTemplate`.
 
+    Parameters:
+    - template_file (Path): The path of the template file.
+    - document_info (dict): A dictionary containing the information to be filled in the document template.
+    - document_type (str): The type of the document template.
+    - output (IO[bytes]): The binary stream the rendered document is written to.
+    - large_tables (Iterable[str]): Variables whose DOCX table rows are rendered in chunks. Defaults to none.
+    """
     if document_type == TEMPLATES_TYPES.DOCX.value:
-        doc = DocxTemplate(template_file)
-        doc.render(document_info)
-        doc.save(f"{output}")
-    else:
-        env = Environment(loader=FileSystemLoader(template_file.parent))
-        template = env.get_template(template_file.name)
-
-        # Render the template
-        rendered_template = template.render(document_info)
-
-        with output.open("w") as file:
-            file.write(rendered_template)
+        from app.services.generator.docx_cache import render_docx_template
+
+        render_docx_template(template_file, document_info, output, large_tables)
+        return
+
+    template = get_document_template(template_file)
+
+    stream = template.stream(document_info)
+    stream.enable_buffering(RENDER_STREAM_BUFFER)
+
+    writer = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    try:
+        writer.writelines(stream)
+        writer.flush()
+    finally:
+        # Leave the underlying stream open for the caller
+        writer.detach()
+
+
+def render_document_stream(
+    document_name: str,
+    repository_name: str = "local",
+    document_info: dict = {},
+    document_type: str = TEMPLATES_TYPES.default(),
+    large_tables: Iterable[str] = (),
+    template_name: str | None = None,
+) -> IO[bytes]:
+    """
+    Renders the template of the specified document into an in-memory buffer.
+
+    Nothing is written to a shared path, so concurrent renders of the same document never clobber
+    each other and exporters consume the output directly. The buffer spills to a file in the
+    temporary directory once it grows past `RENDER_BUFFER_MAX_SIZE`.
+
+    Parameters:
+    - document_name (str): The name of the document.
+    - repository_name (str): The repository where the document is located. Defaults to 'local'.
+    - document_info (dict): A dictionary containing the information to be filled in the document template.
+    - document_type (str): The type of the document template. Defaults to the default template type.
+    - large_tables (Iterable[str]): Variables whose DOCX table rows are rendered in chunks. Defaults to none.
+    - template_name (str | None): The file name of the template inside the document package.
+      Defaults to `template.<document_type>`.
+
+    Returns:
+    - IO[bytes]: The rendered document, positioned at its start. The caller must close it.
+
+    Raises:
+    - click.Abort: If the template file is not found.
+    """
+    template_file = find_document_template(
+        document_name, repository_name, document_type, template_name
+    )
+
+    TMP_DIR.mkdir(exist_ok=True, parents=True)
+    output = tempfile.SpooledTemporaryFile(max_size=RENDER_BUFFER_MAX_SIZE, dir=TMP_DIR)
+    try:
+        write_rendered_template(
+            template_file, document_info, document_type, output, large_tables
+        )
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
 
     rich.print(f"[green]Document {document_name} generated successfully![/green]")
 
@@ -1,52 +1,108 @@
 import os
-import importlib.util
-from packaging import version
+import sys
+import json
+import shlex
+import hashlib
+import importlib
+from importlib import metadata
 
 import rich
 import click
+from packaging.requirements import InvalidRequirement, Requirement
 
-from app.constants import CONFIG
+from app.constants import CACHE_DIR, CONFIG
+from app.utils.cache import CacheStats
+from app.utils.files import write_json_atomic
+from app.services.generator.environments import (
+    ensure_environment,
+    get_document_requirements,
+)
+
+
+REQUIREMENTS_CACHE_FILE = CACHE_DIR / "requirements.json"
+
+# Number of satisfied requirement fingerprints remembered
+MAX_SATISFIED_FINGERPRINTS = 256
+
+REQUIREMENTS_CACHE_STATS = CacheStats("requirements")
 
 
 def check_module(module: str) -> bool:
     """
-    Checks if a specified module and, if provided, its version are installed.
+    Checks if a specified distribution and, if provided, its version are installed.
 
-    This function checks for the presence of the specified module in the system
-    and compares the version if it is provided. It handles potential upgrades if
-    the installed version is higher than the required one, asking the user for
-    confirmation to proceed.
+    The check reads the installed distribution's metadata with `importlib.metadata`, so
+    nothing is imported, and the requirement is parsed as a PEP 508 requirement, so any
+    version specifier is supported (e.g. `pandas==2.2.0`, `requests>=2,<3`). The name is
+    the distribution name, which may differ from the import name (e.g. `PyYAML`).
 
     Parameters:
-    - module (str): The module to check, with an optional version specified after '=='.
+    - module (str): The requirement to check.
 
     Returns:
-    - bool: True if the module (and, if specified, the version) is installed; False otherwise.
+    - bool: True if the distribution is installed and its version satisfies the specifier; False otherwise.
 
     """
-    module_parts = module.split("==")
-    module_name = module_parts[0].lower()
-    version_required = module_parts[1] if len(module_parts) > 1 else None
+    try:
+        requirement = Requirement(module)
+    except InvalidRequirement:
+        rich.print(f"[red]Invalid requirement {module}[/red]")
+        return False
 
     try:
-        mod = importlib.import_module(module_name)
-        if version_required:
-            current_version = getattr(mod, "__version__", None)
-            if not current_version or version.parse(current_version) < version.parse(
-                version_required
-            ):
-                return False
-
-            if version.parse(current_version) > version.parse(version_required):
-                if click.confirm(
-                    f"Module {module_name} version {current_version} is installed. Do you want to install version {version_required}?"
-                ):
-                    return False
-
-    except ImportError:
+        installed_version = metadata.version(requirement.name)
+    except metadata.PackageNotFoundError:
         return False
 
-    return True
+    return requirement.specifier.contains(installed_version, prereleases=True)
+
+
+def environment_fingerprint() -> str:
+    """
+    Returns a hash identifying the current Python environment and its installed packages.
+
+    Installing or removing a distribution adds or removes its metadata directory, which
+    changes the mtime of the directory it lives in, so the mtimes of the `sys.path`
+    directories change whenever the set of installed packages does.
+
+    Returns:
+    - str: The fingerprint of the environment.
+    """
+    digest = hashlib.sha256(f"{sys.executable}\0{sys.version}".encode())
+    for entry in sys.path:
+        try:
+            digest.update(f"\0{entry}\0{os.stat(entry or '.').st_mtime_ns}".encode())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+def requirements_fingerprint(requirements: list[str]) -> str:
+    """
+    Returns a hash of a requirement list in the current environment.
+
+    Parameters:
+    - requirements (list[str]): The requirements of a document.
+
+    Returns:
+    - str: The fingerprint of the requirements and the environment.
+    """
+    payload = json.dumps([sorted(requirements), environment_fingerprint()])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read_satisfied_fingerprints() -> list[str]:
+    try:
+        with REQUIREMENTS_CACHE_FILE.open("r") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def _remember_satisfied(requirements: list[str]) -> None:
+    fingerprints = _read_satisfied_fingerprints()
+    fingerprints.append(requirements_fingerprint(requirements))
+    write_json_atomic(REQUIREMENTS_CACHE_FILE, fingerprints[-MAX_SATISFIED_FINGERPRINTS:])
 
 
 def install_requirements(config: dict):
@@ -54,45 +110,72 @@ def install_requirements(config: dict):
     Installs required Python modules based on a configuration dictionary.
 
     Parameters:
-    - config (dict): Configuration dictionary possibly containing a "require_modules"
-    key with a list of modules to be installed.
+    - config (dict): Configuration dictionary possibly containing a "required_modules"
+    key (or the legacy "require_modules" key) with a list of modules to be installed.
 
-    This function checks if required modules are already installed and, if not, prompts
+    When the document opts into an "isolated_environment", its requirements are installed
+    once into a cached virtual environment instead (see `environments.ensure_environment`).
+    Otherwise, this function checks if required modules are already installed and, if not, prompts
     the user to allow their installation. It uses the system's package manager, as defined
-    in the configuration, to install the unmet dependencies.
+    in the configuration, to install the unmet dependencies. Requirement lists found to be
+    satisfied are remembered by fingerprint (see `requirements_fingerprint`), so they are
+    not checked again until the environment changes.
 
     Raises:
-    - click.Abort: If module installation fails.
+    - click.Abort: If module installation fails or the modules are still missing afterwards.
     """
-    requirements = config.get("require_modules", [])
+    requirements = get_document_requirements(config)
+
+    if config.get("isolated_environment"):
+        ensure_environment(requirements)
+        return
+
     if not requirements:
         return
 
+    if requirements_fingerprint(requirements) in _read_satisfied_fingerprints():
+        REQUIREMENTS_CACHE_STATS.hit()
+        return
+
+    REQUIREMENTS_CACHE_STATS.miss()
+
     # Validate if the required modules are installed
     uninstalled_modules = [
         module for module in requirements if not check_module(module)
     ]
 
-    uninstalled_modules = " ".join(uninstalled_modules)
-
     if not uninstalled_modules:
+        _remember_satisfied(requirements)
         return
 
     # Ask the user if they want to install the required modules
     click.confirm(
-        f"Do you want to install the required modules? ({uninstalled_modules.replace(' ', ', ')})",
+        f"Do you want to install the required modules? ({', '.join(uninstalled_modules)})",
         default=True,
         abort=True,
     )
 
     result = os.system(
-        f"{CONFIG.get('package_manager', 'pip')} install {uninstalled_modules}"
+        f"{CONFIG.get('package_manager', 'pip')} install "
+        + " ".join(shlex.quote(module) for module in uninstalled_modules)
     )
 
     if result != 0:
         rich.print("[red]Failed to install the required modules![/red]")
         raise click.Abort()
 
+    # The package manager may install into another environment than the one running DocScribe
+    importlib.invalidate_caches()
+    still_missing = [module for module in uninstalled_modules if not check_module(module)]
+    if still_missing:
+        rich.print(
+            f"[red]Required modules are still missing after installing them: {', '.join(still_missing)}. "
+            f"Check that the package manager installs into {sys.executable}[/red]"
+        )
+        raise click.Abort()
+
+    _remember_satisfied(requirements)
+
 
 def request_document_kwargs(config: dict) -> dict:
     """
@@ -1,8 +1,6 @@
-import json
-
 import rich
 
-from app.constants import CONFIG_FILE, REPOSITORIES_DIR
+from app.constants import CONFIG, CONFIG_FILE, REPOSITORIES_DIR
 
 
 def run(package_manager):
@@ -51,7 +49,6 @@ def run(package_manager):
             }
         },
     }
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=4)
+    CONFIG.replace(config)
 
     rich.print(f"[green]Configuration file created at {CONFIG_FILE}[/green]")
@@ -1,5 +1,8 @@
-from app.services.repository.types.s3 import S3 as S3Repository
+from app.utils.registry import LazyTypeRegistry
 
-REPOSITORY_TYPES = {
-    "s3": S3Repository,
-}
+REPOSITORY_TYPES = LazyTypeRegistry(
+    {
+        "local": "app.services.repository.types.local:Local",
+        "s3": "app.services.repository.types.s3:S3",
+    }
+)
@@ -0,0 +1,95 @@
+import json
+import time
+
+from app.constants import REPOSITORY_INDEXES_DIR
+from app.utils.files import write_json_atomic
+
+# Seconds a repository's report index is trusted before it is refreshed
+DEFAULT_INDEX_TTL = 3600
+
+
+def read_report_index(repository_name: str) -> dict | None:
+    """
+    Reads the stored report index of a repository.
+
+    The index is a dictionary with the time it was built under "updated_at" and the list
+    of reports under "reports". Each report has a "name", and backends may add details
+    such as "last_modified", "objects" and "size".
+
+    Parameters:
+        repository_name (str): The name of the repository.
+
+    Returns:
+        dict | None: The index, or None if the repository has not been indexed yet.
+    """
+    try:
+        with (REPOSITORY_INDEXES_DIR / f"{repository_name}.json").open("r") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_report_index(repository_name: str, index: dict) -> None:
+    """
+    Stores the report index of a repository.
+
+    Parameters:
+        repository_name (str): The name of the repository.
+        index (dict): The index, see `read_report_index`.
+    """
+    write_json_atomic(REPOSITORY_INDEXES_DIR / f"{repository_name}.json", index, indent=4)
+
+
+def delete_report_index(repository_name: str) -> None:
+    """
+    Removes the stored report index of a repository, if any.
+
+    Parameters:
+        repository_name (str): The name of the repository.
+    """
+    (REPOSITORY_INDEXES_DIR / f"{repository_name}.json").unlink(missing_ok=True)
+
+
+def read_sync_manifest(repository_name: str) -> dict[str, dict]:
+    """
+    Reads the manifest of the objects mirrored by `repository sync`.
+
+    The manifest maps the path of each mirrored object, relative to the repository's local
+    directory, to the "etag", "size" and "last_modified" it had when it was downloaded.
+
+    Parameters:
+        repository_name (str): The name of the repository.
+
+    Returns:
+        dict[str, dict]: The mirrored objects, empty if the repository has never been synced.
+    """
+    try:
+        with (REPOSITORY_INDEXES_DIR / f"{repository_name}.manifest.json").open("r") as file:
+            return json.load(file)["objects"]
+    except (FileNotFoundError, ValueError, KeyError):
+        return {}
+
+
+def write_sync_manifest(repository_name: str, objects: dict[str, dict]) -> None:
+    """
+    Stores the manifest of the objects mirrored by `repository sync`.
+
+    Parameters:
+        repository_name (str): The name of the repository.
+        objects (dict[str, dict]): The mirrored objects, see `read_sync_manifest`.
+    """
+    write_json_atomic(
+        REPOSITORY_INDEXES_DIR / f"{repository_name}.manifest.json",
+        {"updated_at": time.time(), "objects": objects},
+        indent=4,
+    )
+
+
+def delete_sync_manifest(repository_name: str) -> None:
+    """
+    Removes the sync manifest of a repository, if any.
+
+    Parameters:
+        repository_name (str): The name of the repository.
+    """
+    (REPOSITORY_INDEXES_DIR / f"{repository_name}.manifest.json").unlink(missing_ok=True)
@@ -19,31 +19,56 @@ def create_repository() -> None:
     console.print("[green]Repository created.[/green]")
 
 
-def list_reports(repository_name: str | None) -> None:
+def list_reports(repository_name: str | None, refresh: bool = False) -> None:
     """
     Lists all reports available in a specified repository.
 
     Parameters:
         repository_name (str | None): The name of the repository from which to list reports.
             If None, a default or all repositories may be targeted, based on implementation.
+        refresh (bool): Rebuild the repository's report index instead of using the stored one.
+            Defaults to False.
 
     This function fetches and displays a list of reports from the specified repository.
     If no reports are available, a message is printed indicating the lack of available reports.
     """
     manager = RepositoryManager(repository_name)
-    reports = manager.list_reports()
+    reports = manager.get_report_index(refresh)["reports"]
 
     if not reports:
         console.print(f"[blue]{repository_name} has not available reports.[/blue]")
         return
 
-    report_names = "\n\n- ".join(reports)
+    report_names = "\n\n- ".join(_describe_report(report) for report in reports)
 
     result = f"**{repository_name}** reports:\n\n - {report_names}"
     md = Markdown(result)
     console.print(md)
 
 
+def _describe_report(report: dict) -> str:
+    """
+    Formats a report of the index as a list entry.
+
+    Parameters:
+        report (dict): The report, with its "name" and optional details.
+
+    Returns:
+        str: The report name followed by its known details.
+    """
+    details = []
+    if report.get("objects") is not None:
+        details.append(f"{report['objects']} files")
+    if report.get("size") is not None:
+        details.append(f"{report['size'] / 1024:.1f} KiB")
+    if report.get("last_modified"):
+        details.append(f"updated {report['last_modified']}")
+
+    if not details:
+        return report["name"]
+    return f"{report['name']} ({', '.join(details)})"
+
+
 def download(repository_name: str | None, report_name: str) -> None:
     """
     Downloads a specific report from a repository.
@@ -61,6 +86,26 @@ def download(repository_name: str | None, report_name: str) -> None:
     console.print(f"[green]{report_name} downloaded.[/green]")
 
 
+def sync(repository_name: str, max_workers: int | None = None) -> None:
+    """
+    Mirrors every report of a repository into its local directory.
+
+    Parameters:
+        repository_name (str): The name of the repository to sync.
+        max_workers (int | None): Maximum number of concurrent transfers. Defaults to the
+            repository's transfer settings.
+
+    Only objects that changed since the last sync are downloaded, and files removed from the
+    repository are deleted locally. A summary of the transfers is printed on completion.
+    """
+    manager = RepositoryManager(repository_name)
+    summary = manager.sync(max_workers)
+    console.print(
+        f"[green]{repository_name} synced: {summary['downloaded']} downloaded, "
+        f"{summary['deleted']} deleted, {summary['unchanged']} unchanged.[/green]"
+    )
+
+
 def delete_repository(repository_name: str) -> None:
     """
     Deletes a specified repository.
@@ -1,5 +1,8 @@
 from typing import Iterable
 
+import rich
+import click
+
 from app.utils.managers import SegmentManager
 
 
@@ -19,6 +22,8 @@ class RepositoryManager(SegmentManager):
     Methods:
         download(report_name: str): Downloads a report from the repository.
         list_reports(*args, **kwargs): Lists all available reports in the repository.
+        get_report_index(refresh: bool = False): Returns the repository's report index.
+        sync(max_workers: int | None = None): Mirrors every report of the repository locally.
     """
 
     def __init__(self, name: str | None = None) -> None:
@@ -34,13 +39,27 @@ class RepositoryManager(SegmentManager):
         """
         Downloads a report by its name from the managed repository.
 
-        Validates that the repository segment is properly set before attempting to
-        download the report.
+        Validates that the repository segment is properly set and that the report
+        exists in the repository's report index before attempting to download it. If the
+        index cannot be refreshed, the download is attempted anyway so the backend reports
+        its own error.
 
         Parameters:
             report_name (str): The name of the report to download.
+
+        Raises:
+            click.Abort: If the report does not exist in the repository.
         """
         self._validate_segment()
+        exists = self.segment.has_report(report_name)
+        if exists is None:
+            rich.print(
+                f"[yellow]Could not refresh the report index of {self.name}, "
+                f"downloading {report_name} anyway[/yellow]"
+            )
+        elif not exists:
+            rich.print(f"[red][ERROR] Report {report_name} does not exist in {self.name}[/red]")
+            raise click.Abort()
         self.segment.download(report_name)
 
     def list_reports(self, *args, **kwargs) -> Iterable[str]:
@@ -56,3 +75,30 @@ class RepositoryManager(SegmentManager):
         """
         self._validate_segment()
         return self.segment.list_reports(*args, **kwargs)
+
+    def get_report_index(self, refresh: bool = False) -> dict:
+        """
+        Returns the index of available reports within the managed repository.
+
+        Parameters:
+            refresh (bool): Rebuild the index from the repository. Defaults to False.
+
+        Returns:
+            dict: The index, with the details of each report under "reports".
+        """
+        self._validate_segment()
+        return self.segment.get_report_index(refresh)
+
+    def sync(self, max_workers: int | None = None) -> dict:
+        """
+        Mirrors every report of the managed repository into its local directory.
+
+        Parameters:
+            max_workers (int | None): Maximum number of concurrent transfers. Defaults to the
+                repository's transfer settings.
+
+        Returns:
+            dict: The number of "downloaded", "deleted" and "unchanged" objects.
+        """
+        self._validate_segment()
+        return self.segment.sync(max_workers)
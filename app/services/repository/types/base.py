@@ -1,7 +1,18 @@
+import time
 from typing import Iterable
 from abc import ABC, abstractmethod
 
+import rich
+import click
+
 from app.utils.segment import Segment
+from app.services.repository.index import (
+    DEFAULT_INDEX_TTL,
+    delete_report_index,
+    delete_sync_manifest,
+    read_report_index,
+    write_report_index,
+)
 
 
 class Repository(Segment, ABC):
@@ -12,6 +23,11 @@ class Repository(Segment, ABC):
     services, providing a template for implementing repository operations such as downloading
     reports and listing available reports.
 
+    Reports are listed from a local index (see `app.services.repository.index`) that is rebuilt
+    with `_scan_reports` when `_is_index_stale` says so (by default, once it is older than the
+    repository's "index_ttl" setting, in seconds) or on demand, so listing and validating
+    report names rarely reach the backend.
+
     Attributes:
         name (str): The name of the repository.
         _type (str): The type of the repository (e.g., "local", "s3").
@@ -19,7 +35,12 @@ class Repository(Segment, ABC):
 
     Methods:
         download(report_name: str): Abstract method to download a report by its name.
-        list_reports(*args, **kwargs): Abstract method to list available reports.
+        list_reports(refresh: bool = False): Lists the names of available reports.
+        get_report_index(refresh: bool = False): Returns the index of available reports.
+        has_report(report_name: str): Checks whether a report exists.
+        _rebuild_index(): Rebuilds the index of available reports from the backend.
+        sync(max_workers: int | None = None): Mirrors every report into the local repository directory.
+        _scan_reports(): Abstract method to list the available reports from the backend.
     """
 
     def __init__(self, name: str, _type: str, config: dict | None = None):
@@ -39,17 +60,137 @@ class Repository(Segment, ABC):
         ...
 
     @abstractmethod
-    def list_reports(self, *args, **kwargs) -> Iterable[str]:
+    def _scan_reports(self) -> list[dict] | None:
+        """
+        List the available reports from the backend, bypassing the index.
+
+        Returns:
+            list[dict] | None: One dictionary per report with at least its "name", or None
+                if the backend could not be reached.
+
+        Raises:
+            NotImplementedError: If the method is not implemented by a subclass.
+        """
+        ...
+
+    def _is_index_stale(self, index: dict) -> bool:
+        """
+        Checks whether a stored index must be rebuilt.
+
+        Parameters:
+            index (dict): The stored index.
+
+        Returns:
+            bool: True if the index is older than the repository's "index_ttl".
+        """
+        ttl = self.config.get("index_ttl", DEFAULT_INDEX_TTL)
+        return time.time() - index.get("updated_at", 0) > ttl
+
+    def _index_state(self) -> dict:
+        """
+        Returns the backend state stored with a new index, for `_is_index_stale` to compare.
+
+        It is read before the backend is scanned, so changes made during the scan invalidate
+        the new index.
+
+        Returns:
+            dict: Extra fields of the index. None by default.
+        """
+        return {}
+
+    def get_report_index(self, refresh: bool = False) -> dict:
+        """
+        Returns the index of available reports, rebuilding it if stale or requested.
+
+        If the backend cannot be reached, the last stored index is returned as is.
+
+        Parameters:
+            refresh (bool): Rebuild the index even if it is still fresh. Defaults to False.
+
+        Returns:
+            dict: The index, with its build time under "updated_at" and the reports under "reports".
+        """
+        index = read_report_index(self.name)
+        if index is not None and not refresh and not self._is_index_stale(index):
+            return index
+
+        return self._rebuild_index() or index or {"updated_at": 0, "reports": []}
+
+    def _rebuild_index(self) -> dict | None:
+        """
+        Rebuilds the index of available reports from the backend and stores it.
+
+        Returns:
+            dict | None: The new index, or None if the backend could not be reached.
+        """
+        state = self._index_state()
+        reports = self._scan_reports()
+        if reports is None:
+            return None
+
+        index = {
+            "updated_at": time.time(),
+            **state,
+            "reports": sorted(reports, key=lambda report: report["name"]),
+        }
+        write_report_index(self.name, index)
+        return index
+
+    def list_reports(self, refresh: bool = False) -> Iterable[str]:
         """
         List the names of available reports.
 
-        This method may accept additional arguments and keyword arguments specific to
-        the repository implementation.
+        Parameters:
+            refresh (bool): Rebuild the report index first. Defaults to False.
 
         Returns:
             Iterable[str]: An iterable of strings, each representing a report name.
+        """
+        return [report["name"] for report in self.get_report_index(refresh)["reports"]]
+
+    def has_report(self, report_name: str) -> bool | None:
+        """
+        Checks whether a report exists, refreshing the index once if it is not listed.
+
+        Parameters:
+            report_name (str): The name of the report.
+
+        Returns:
+            bool | None: True if the report exists in the repository, or None if it is not
+                listed and the index could not be refreshed.
+        """
+        if report_name in self.list_reports():
+            return True
+
+        index = self._rebuild_index()
+        if index is None:
+            return None
+        return any(report["name"] == report_name for report in index["reports"])
+
+    def sync(self, max_workers: int | None = None) -> dict:
+        """
+        Mirror every report of the repository into its local directory, transferring only
+        what changed since the last sync.
+
+        Repository types that cannot be mirrored keep this default, which aborts.
+
+        Parameters:
+            max_workers (int | None): Maximum number of concurrent transfers. Defaults to the
+                repository's transfer settings.
+
+        Returns:
+            dict: The number of "downloaded", "deleted" and "unchanged" objects.
 
         Raises:
-            NotImplementedError: If the method is not implemented by a subclass.
+            click.Abort: If the repository type does not support syncing.
         """
-        ...
+        rich.print(f"[red][ERROR] {self._type} repositories cannot be synced[/red]")
+        raise click.Abort()
+
+    def delete(self) -> None:
+        """
+        Removes the repository's configuration, its report index and its sync manifest.
+        """
+        super().delete()
+        delete_report_index(self.name)
+        delete_sync_manifest(self.name)
@@ -0,0 +1,210 @@
+import os
+import shutil
+from pathlib import Path
+from datetime import datetime, timezone
+
+import rich
+import click
+
+from app.constants import REPOSITORIES_DIR
+from app.services.repository.types.base import Repository
+
+
+class Local(Repository):
+    """
+    A repository of document packages stored on the filesystem.
+
+    By default the packages live in the repository's own directory under the repositories
+    directory, where they are generated from. A "path" in the configuration points the
+    repository at any other directory instead, such as a network share, and `download`
+    copies packages from there into the repositories directory.
+
+    The report index is rebuilt when the modification time of the directory or of one of its
+    subdirectories changes, rather than after a TTL, so listing thousands of packages only
+    costs a `stat` per subdirectory while nothing changed.
+
+    Attributes:
+        name (str): The name of the repository.
+        _type (str): Set to "local" to indicate the repository type.
+        config (dict | None): Configuration details specific to the local repository,
+            optionally with the "path" of the packages directory.
+
+    Methods:
+        download(report_name: str): Copy a document package into the repositories directory.
+        _scan_reports(): List the document packages of the directory with their details.
+        _create_config(*args, **kwargs): Generate the initial configuration for a local repository.
+    """
+
+    def __init__(self, name: str, config: dict | None = None):
+        super().__init__(name, "local", config)
+
+    @property
+    def root(self) -> Path:
+        """
+        The directory holding the repository's document packages.
+        """
+        path = self.config.get("path")
+        return Path(path).expanduser() if path else REPOSITORIES_DIR / self.name
+
+    def _auth(self):
+        """
+        Local repositories do not require authentication.
+
+        This method is implemented as a formality and does not perform any action.
+        """
+        pass
+
+    def download(self, report_name: str) -> None:
+        """
+        Copy a document package into the repositories directory, so it can be generated.
+
+        Packages of a repository without a "path" already are in the repositories directory,
+        so nothing is copied.
+
+        Parameters:
+            report_name (str): The name of the document package to download.
+        """
+        destination = REPOSITORIES_DIR / self.name / report_name
+        source = self.root / report_name
+        if source.resolve() == destination.resolve():
+            rich.print(f"[blue][INFO] {report_name} is already available locally[/blue]")
+            return
+
+        shutil.copytree(source, destination, dirs_exist_ok=True)
+
+    def _index_state(self) -> dict:
+        """
+        Returns the modification times of the packages directory and of each of its
+        subdirectories, stored with the index.
+
+        Subdirectories that are not packages yet are included, so they are listed once they
+        get a `config.json`.
+        """
+        return {"mtime": _mtime(self.root), "directories": _directory_mtimes(self.root)}
+
+    def _is_index_stale(self, index: dict) -> bool:
+        """
+        Checks whether packages were added, removed or changed since the index was built.
+
+        Adding, removing or renaming a directory changes the modification time of the packages
+        directory, and adding, removing or renaming a file of a directory, such as the
+        `config.json` that makes it a package, changes that of the directory.
+
+        Parameters:
+            index (dict): The stored index.
+
+        Returns:
+            bool: True if any of those modification times differs from the indexed one.
+        """
+        if index.get("mtime") is None or index["mtime"] != _mtime(self.root):
+            return True
+        if "directories" not in index:
+            return True
+
+        return any(
+            _mtime(self.root / name) != mtime
+            for name, mtime in index["directories"].items()
+        )
+
+    def _scan_reports(self) -> list[dict] | None:
+        """
+        List the document packages of the directory, with their details.
+
+        Each subdirectory holding a `config.json` is a package. The directory and each
+        package are read with a single `os.scandir` pass.
+
+        Returns:
+            list[dict] | None: The packages in the directory, or None if it cannot be read.
+        """
+        try:
+            with os.scandir(self.root) as entries:
+                directories = [
+                    entry
+                    for entry in entries
+                    if entry.is_dir() and not entry.name.startswith(".")
+                ]
+            return [
+                report
+                for report in (_describe_package(entry) for entry in directories)
+                if report is not None
+            ]
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            rich.print(f"[red][ERROR] {e}[/red]")
+
+    def _create_config(self, *args, **kwargs) -> dict:
+        """
+        Generate the initial configuration for a local repository.
+
+        This method prompts the user for the directory of the document packages. When left
+        empty, the packages are kept in the repository's directory under the repositories
+        directory.
+
+        Returns:
+            dict: The generated configuration dictionary.
+        """
+        path = click.prompt(
+            "Directory of the document packages (empty for the repositories directory)",
+            default="",
+            show_default=False,
+        )
+        return {"path": path} if path else {}
+
+
+def _mtime(path: Path) -> int | None:
+    """
+    Returns the modification time of a path in nanoseconds, or None if it does not exist.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _directory_mtimes(root: Path) -> dict[str, int]:
+    """
+    Returns the modification times of the visible subdirectories of a directory, in nanoseconds.
+    """
+    try:
+        with os.scandir(root) as entries:
+            return {
+                entry.name: entry.stat().st_mtime_ns
+                for entry in entries
+                if entry.is_dir() and not entry.name.startswith(".")
+            }
+    except OSError:
+        return {}
+
+
+def _describe_package(entry: os.DirEntry) -> dict | None:
+    """
+    Reads the details of a document package directory.
+
+    Parameters:
+        entry (os.DirEntry): The package directory.
+
+    Returns:
+        dict | None: The package name, number of files, total size and last modification,
+            or None if the directory is not a document package.
+    """
+    objects, size, last_modified, has_config = 0, 0, 0.0, False
+    with os.scandir(entry.path) as files:
+        for file in files:
+            if not file.is_file():
+                continue
+            stat = file.stat()
+            objects += 1
+            size += stat.st_size
+            last_modified = max(last_modified, stat.st_mtime)
+            has_config = has_config or file.name == "config.json"
+
+    if not has_config:
+        return None
+
+    return {
+        "name": entry.name,
+        "objects": objects,
+        "size": size,
+        "last_modified": datetime.fromtimestamp(last_modified, tz=timezone.utc).isoformat(),
+    }
@@ -1,10 +1,29 @@
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from botocore.exceptions import NoCredentialsError, ClientError, ProfileNotFound
 
 import rich
+import click
+from rich.progress import Progress
 
 from app.constants import REPOSITORIES_DIR
 from app.services.repository.types.base import Repository
-from app.utils.s3 import create_s3_segment_config, s3_auth
+from app.services.repository.index import (
+    read_sync_manifest,
+    write_report_index,
+    write_sync_manifest,
+)
+from app.utils.s3 import (
+    create_s3_segment_config,
+    get_transfer_settings,
+    make_transfer_config,
+    s3_auth,
+)
+
+# Seconds between saves of the sync manifest while objects are being transferred
+MANIFEST_SAVE_INTERVAL = 5
 
 
 class S3(Repository):
@@ -23,7 +42,8 @@ class S3(Repository):
     Methods:
         _auth(): Authenticate with AWS S3 using the provided configuration.
         download(report_name: str): Download a report from S3 to the local repository directory.
-        list_reports(*args, **kwargs): List the names of reports available in the S3 bucket.
+        _scan_reports(): List the reports available in the S3 bucket with their details.
+        sync(max_workers: int | None = None): Mirror every report of the bucket into the local repository directory.
         _create_config(*args, **kwargs): Generate the initial configuration for an S3 repository.
     """
 
@@ -46,9 +66,15 @@ class S3(Repository):
             report_name (str): The name of the report to download.
 
         This method downloads the specified report from the S3 bucket to the local
-        repository directory, creating necessary subdirectories as needed.
+        repository directory, creating necessary subdirectories as needed. Objects are
+        downloaded concurrently by a bounded thread pool, using the "transfer" settings
+        of the repository configuration (`max_workers` objects at a time, each with the
+        boto3 multipart threshold, chunk size and `max_concurrency`), and the overall
+        progress is reported in bytes.
         """
         self._auth()
+        settings = get_transfer_settings(self.config)
+        transfer_config = make_transfer_config(self.config)
         try:
             paginator = self.s3.get_paginator("list_objects_v2")
             response_iterator = paginator.paginate(
@@ -58,38 +84,193 @@ class S3(Repository):
             path = REPOSITORIES_DIR.joinpath(self.name, report_name)
             path.mkdir(exist_ok=True, parents=True)
 
-            for page in response_iterator:
-                for obj in page.get("Contents", []):
-                    self.s3.download_file(
+            objects = [
+                obj for page in response_iterator for obj in page.get("Contents", [])
+            ]
+
+            with Progress() as progress, ThreadPoolExecutor(
+                max_workers=settings["max_workers"]
+            ) as executor:
+                task = progress.add_task(
+                    f"Downloading {report_name}",
+                    total=sum(obj["Size"] for obj in objects),
+                )
+                futures = [
+                    executor.submit(
+                        self.s3.download_file,
                         self.config["bucket"],
                         obj["Key"],
                         f"{path}/{obj['Key'].split('/')[-1]}",
+                        Config=transfer_config,
+                        Callback=lambda size: progress.advance(task, size),
                     )
+                    for obj in objects
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
         except (NoCredentialsError, ClientError) as e:
             rich.print(f"[red][ERROR] {e}[/red]")
 
-    def list_reports(self, *args, **kwargs) -> list[str]:
+    def _reports_prefix(self) -> str:
+        """
+        Returns the key prefix under which the report directories are stored.
+        """
+        return f"{self.config['prefix'].strip('/')}/".lstrip("/")
+
+    def _list_objects(self, prefix: str) -> list[dict]:
+        """
+        List every object under a key prefix in a single paginated pass.
+
+        Parameters:
+            prefix (str): The key prefix.
+
+        Returns:
+            list[dict]: The objects, as returned by `list_objects_v2`.
+        """
+        paginator = self.s3.get_paginator("list_objects_v2")
+        response_iterator = paginator.paginate(Bucket=self.config["bucket"], Prefix=prefix)
+        return [obj for page in response_iterator for obj in page.get("Contents", [])]
+
+    def _scan_reports(self) -> list[dict] | None:
         """
-        List the names of reports available in the configured S3 bucket.
+        List the reports available in the configured S3 bucket, with their details.
+
+        All objects under the prefix are listed in a single paginated pass and grouped by
+        report directory, so each report comes with its number of objects, total size and
+        most recent modification time.
 
         Returns:
-            list[str]: A list of report names available in the S3 bucket.
+            list[dict] | None: The reports in the S3 bucket, or None if S3 could not be reached.
         """
         self._auth()
+        prefix = self._reports_prefix()
         try:
-            paginator = self.s3.get_paginator("list_objects_v2")
-            response_iterator = paginator.paginate(
-                Bucket=self.config["bucket"],
-                Prefix=self.config["prefix"],
-                Delimiter="/",
+            return _group_reports(self._list_objects(prefix), prefix)
+        except (NoCredentialsError, ClientError) as e:
+            rich.print(f"[red][ERROR] {e}[/red]")
+
+    def sync(self, max_workers: int | None = None) -> dict:
+        """
+        Mirror every report of the bucket into the local repository directory.
+
+        The bucket is listed once, and each object is compared with the ETag, size and
+        modification time recorded in the repository's sync manifest when it was last
+        downloaded: only new and changed objects are transferred, and local files whose
+        object was removed from the bucket are deleted. Transfers of all reports share one
+        thread pool, so at most `max_workers` objects are downloaded at a time. The manifest
+        is saved as transfers complete and when the sync is interrupted, so the next sync
+        resumes with the objects that were not downloaded yet. The listing also refreshes
+        the repository's report index.
+
+        Parameters:
+            max_workers (int | None): Maximum number of concurrent transfers. Defaults to the
+                "max_workers" transfer setting of the repository.
+
+        Returns:
+            dict: The number of "downloaded", "deleted" and "unchanged" objects.
+
+        Raises:
+            click.Abort: If S3 cannot be reached or a transfer fails.
+        """
+        self._auth()
+        settings = get_transfer_settings(self.config)
+        transfer_config = make_transfer_config(self.config)
+        prefix = self._reports_prefix()
+        root = REPOSITORIES_DIR / self.name
+
+        try:
+            objects = self._list_objects(prefix)
+        except (NoCredentialsError, ClientError) as e:
+            rich.print(f"[red][ERROR] {e}[/red]")
+            raise click.Abort()
+
+        write_report_index(
+            self.name,
+            {
+                "updated_at": time.time(),
+                "reports": sorted(
+                    _group_reports(objects, prefix), key=lambda report: report["name"]
+                ),
+            },
+        )
+
+        remote = {}
+        for obj in objects:
+            relative_key = obj["Key"][len(prefix) :]
+            parts = relative_key.split("/")
+            # Only files inside a report directory are mirrored, and keys with empty or
+            # relative parts are skipped so nothing is written outside the repository
+            if len(parts) > 1 and all(part not in ("", ".", "..") for part in parts):
+                remote[relative_key] = {
+                    "etag": obj.get("ETag"),
+                    "size": obj.get("Size", 0),
+                    "last_modified": (
+                        obj["LastModified"].isoformat() if "LastModified" in obj else None
+                    ),
+                }
+
+        manifest = read_sync_manifest(self.name)
+        removed = [key for key in manifest if key not in remote]
+        changed = [
+            key
+            for key, entry in remote.items()
+            if manifest.get(key) != entry or not _has_size(root / key, entry["size"])
+        ]
+
+        for key in removed:
+            (root / key).unlink(missing_ok=True)
+            _remove_empty_parents(root / key, root)
+            del manifest[key]
+
+        def transfer(key: str) -> str:
+            path = root / key
+            path.parent.mkdir(exist_ok=True, parents=True)
+            self.s3.download_file(
+                self.config["bucket"],
+                f"{prefix}{key}",
+                str(path),
+                Config=transfer_config,
+                Callback=lambda size: progress.advance(task, size),
             )
-            return [
-                obj["Prefix"].split("/")[-2]
-                for page in response_iterator
-                for obj in page.get("CommonPrefixes", [])
-            ]
+            return key
+
+        try:
+            with Progress() as progress, ThreadPoolExecutor(
+                max_workers=max_workers or settings["max_workers"]
+            ) as executor:
+                task = progress.add_task(
+                    f"Syncing {self.name}",
+                    total=sum(remote[key]["size"] for key in changed),
+                )
+                futures = [executor.submit(transfer, key) for key in changed]
+                saved_at = time.monotonic()
+                try:
+                    for future in as_completed(futures):
+                        key = future.result()
+                        manifest[key] = remote[key]
+                        if time.monotonic() - saved_at >= MANIFEST_SAVE_INTERVAL:
+                            write_sync_manifest(self.name, manifest)
+                            saved_at = time.monotonic()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
         except (NoCredentialsError, ClientError) as e:
             rich.print(f"[red][ERROR] {e}[/red]")
+            raise click.Abort()
+        finally:
+            write_sync_manifest(self.name, manifest)
+
+        return {
+            "downloaded": len(changed),
+            "deleted": len(removed),
+            "unchanged": len(remote) - len(changed),
+        }
 
     def _create_config(self, *args, **kwargs) -> dict:
         """
@@ -102,3 +283,59 @@ class S3(Repository):
             dict: The generated configuration dictionary.
         """
         return create_s3_segment_config()
+
+
+def _group_reports(objects: list[dict], prefix: str) -> list[dict]:
+    """
+    Groups the objects of a bucket listing by report directory.
+
+    Parameters:
+        objects (list[dict]): The objects under `prefix`.
+        prefix (str): The key prefix of the report directories.
+
+    Returns:
+        list[dict]: One entry per report, with its name, number of objects, total size and
+            most recent modification time.
+    """
+    reports = {}
+    for obj in objects:
+        report_name, separator, _ = obj["Key"][len(prefix) :].partition("/")
+        if not separator or not report_name:
+            continue
+
+        report = reports.setdefault(
+            report_name,
+            {"name": report_name, "objects": 0, "size": 0, "last_modified": None},
+        )
+        report["objects"] += 1
+        report["size"] += obj.get("Size", 0)
+        if "LastModified" in obj:
+            last_modified = obj["LastModified"].isoformat()
+            report["last_modified"] = max(
+                report["last_modified"] or last_modified, last_modified
+            )
+
+    return list(reports.values())
+
+
+def _has_size(path: Path, size: int) -> bool:
+    """
+    Checks whether a mirrored file is still present locally with the expected size.
+    """
+    try:
+        return path.stat().st_size == size
+    except FileNotFoundError:
+        return False
+
+
+def _remove_empty_parents(path: Path, root: Path) -> None:
+    """
+    Removes the directories left empty between a deleted file and the repository directory.
+    """
+    for parent in path.parents:
+        if parent == root or root not in parent.parents:
+            return
+        try:
+            parent.rmdir()
+        except OSError:
+            return
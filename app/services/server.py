@@ -0,0 +1,217 @@
+import json
+import os
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingUnixStreamServer
+
+import rich
+import click
+
+from app.constants import CONFIG
+from app.utils.cache import get_cache_stats
+from app.services.generator.main import generate_document, read_document_config
+
+
+def is_plain_name(name) -> bool:
+    """
+    Checks whether a request value can be used as a single path part.
+
+    Document and output names are joined to the repositories and exports directories, so
+    anything holding a path separator or pointing at a directory itself is rejected.
+
+    Parameters:
+    - name: The value from the request body.
+
+    Returns:
+    - bool: True if the value is a non-empty string without directory parts.
+    """
+    return isinstance(name, str) and name not in ("", ".", "..") and Path(name).name == name
+
+
+def handle_generate_request(payload: dict) -> tuple[int, dict]:
+    """
+    Runs the generation pipeline for one API request.
+
+    Parameters:
+    - payload (dict): The request body, with `document` and optionally `repository`,
+      `exporter`, `kwargs`, `output_name` and `use_cache`.
+
+    Returns:
+    - tuple[int, dict]: The HTTP status and the JSON body of the response.
+    """
+    document_name = payload.get("document")
+    repository_name = payload.get("repository", "local")
+    exporter_name = payload.get("exporter", "local")
+    document_kwargs = payload.get("kwargs", {})
+    output_name = payload.get("output_name") or document_name
+    use_cache = payload.get("use_cache", True)
+
+    if not document_name:
+        return 400, {"status": "error", "error": "'document' is required"}
+    if not is_plain_name(document_name):
+        return 400, {"status": "error", "error": "'document' must be a plain name"}
+    if not is_plain_name(output_name):
+        return 400, {"status": "error", "error": "'output_name' must be a plain name"}
+    if not isinstance(document_kwargs, dict):
+        return 400, {"status": "error", "error": "'kwargs' must be an object"}
+    if not isinstance(use_cache, bool):
+        return 400, {"status": "error", "error": "'use_cache' must be a boolean"}
+    if repository_name not in (CONFIG.get("repositories") or {"local": {}}):
+        return 404, {
+            "status": "error",
+            "error": f"Repository {repository_name} does not exist in config",
+        }
+    if exporter_name not in CONFIG.get("exporters", {}):
+        return 404, {
+            "status": "error",
+            "error": f"Exporter {exporter_name} does not exist in config",
+        }
+
+    try:
+        document_config = read_document_config(document_name, repository_name)
+        generate_document(
+            document_name,
+            repository_name,
+            {**document_config.get("kwargs", {}), **document_kwargs},
+            exporter_name,
+            document_config=document_config,
+            output_name=output_name,
+            use_cache=use_cache,
+        )
+    except click.Abort as e:
+        return 422, {"status": "error", "error": str(e) or "Generation aborted"}
+    except Exception as e:
+        return 500, {"status": "error", "error": f"{e.__class__.__name__}: {e}"}
+
+    return 200, {"status": "ok", "document": document_name, "output_name": output_name}
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of the generation API.
+
+    Routes:
+    - `POST /generate`: generates and exports a document, see `handle_generate_request`.
+    - `GET /health`: returns `{"status": "ok"}`.
+    - `GET /stats`: returns the hit/miss counters of the in-process caches.
+
+    Generations are run on the server's worker pool, so at most `workers` documents are
+    generated at the same time regardless of the number of open connections.
+    """
+
+    server_version = "docscribe"
+
+    def _send_json(self, status: int, body: dict) -> None:
+        """
+        Writes a JSON response.
+
+        Parameters:
+        - status (int): The HTTP status code.
+        - body (dict): The response body.
+        """
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, {"status": "ok", "caches": get_cache_stats()})
+        else:
+            self._send_json(404, {"status": "error", "error": "Not found"})
+
+    def do_POST(self) -> None:
+        if self.path != "/generate":
+            self._send_json(404, {"status": "error", "error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"status": "error", "error": "Invalid JSON body"})
+            return
+
+        if not isinstance(payload, dict):
+            self._send_json(400, {"status": "error", "error": "Body must be an object"})
+            return
+
+        future = self.server.executor.submit(handle_generate_request, payload)
+        self._send_json(*future.result())
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix"
+
+
+class GenerationHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server listening on a TCP address, with a generation worker pool.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], workers: int) -> None:
+        super().__init__(address, GenerationRequestHandler)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+
+class GenerationUnixServer(ThreadingUnixStreamServer):
+    """
+    Threaded HTTP server listening on a Unix socket, with a generation worker pool.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, workers: int) -> None:
+        super().__init__(socket_path, GenerationRequestHandler)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+
+def run(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: str | None = None,
+    workers: int = 4,
+) -> None:
+    """
+    Serves the generation API until interrupted.
+
+    The process keeps document scripts, compiled templates and clients loaded between
+    requests, so repeated generations skip the start-up and import costs of the CLI.
+    Document requirements are not installed by the server; generate the document once
+    with `docscribe generate` to install them.
+
+    Parameters:
+    - host (str): The address to listen on when serving over TCP. Defaults to '127.0.0.1'.
+    - port (int): The port to listen on when serving over TCP. Defaults to 8000.
+    - socket_path (str | None): Serve on this Unix socket instead of TCP.
+    - workers (int): Maximum number of documents generated at the same time. Defaults to 4.
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = GenerationUnixServer(socket_path, workers)
+        address = f"unix:{socket_path}"
+    else:
+        server = GenerationHTTPServer((host, port), workers)
+        address = f"http://{host}:{server.server_address[1]}"
+
+    rich.print(f"[green]Serving document generation on {address}[/green]")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        rich.print("[blue]Shutting down...[/blue]")
+    finally:
+        server.server_close()
+        server.executor.shutdown(wait=True)
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,72 @@
+import threading
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss counters for one of the application's caches.
+
+    Every instance registers itself in `CACHE_STATS` under its name so the counters of all
+    caches can be reported together, e.g. by a long-running process.
+
+    Attributes:
+        name (str): The name of the cache the counters belong to.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that had to compute the value.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initializes the counters and registers them in `CACHE_STATS`.
+
+        Args:
+            name (str): The name of the cache the counters belong to.
+        """
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        CACHE_STATS[name] = self
+
+    def hit(self) -> None:
+        """
+        Records a lookup served from the cache.
+        """
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        """
+        Records a lookup that had to compute the value.
+        """
+        with self._lock:
+            self.misses += 1
+
+    def reset(self) -> None:
+        """
+        Sets both counters back to zero.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def as_dict(self) -> dict:
+        """
+        Returns the counters as a dictionary.
+
+        Returns:
+            dict: The hits and misses of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+CACHE_STATS: dict[str, CacheStats] = {}
+
+
+def get_cache_stats() -> dict[str, dict]:
+    """
+    Returns the counters of every registered cache.
+
+    Returns:
+        dict[str, dict]: The hits and misses of each cache, keyed by cache name.
+    """
+    return {name: stats.as_dict() for name, stats in CACHE_STATS.items()}
@@ -1,6 +1,4 @@
-import json
-
-from app.constants import CONFIG, CONFIG_FILE, CONFIG_SEGMENTS
+from app.constants import CONFIG, CONFIG_SEGMENTS
 
 
 def write_item_by_segment(
@@ -10,8 +8,8 @@ def write_item_by_segment(
     Writes a new item or updates an existing item in a specific configuration segment.
 
     This function updates the application's configuration by adding or modifying an item
-    in the specified segment with the provided details. It then writes the updated
-    configuration back to the configuration file.
+    in the specified segment with the provided details. The change is applied to the latest
+    configuration on disk under a lock and written atomically (see `ConfigStore.update`).
 
     Args:
         segment_name (CONFIG_SEGMENTS): The segment of the configuration to update,
@@ -22,12 +20,10 @@ def write_item_by_segment(
         config (dict): The configuration details for the item.
 
     """
-    segment = CONFIG.get(segment_name, {})
-    segment[name] = {"type": _type, "config": config}
-    CONFIG[segment_name] = segment
-
-    with CONFIG_FILE.open("w") as f:
-        json.dump(CONFIG, f, indent=4)
+    with CONFIG.update() as data:
+        segment = data.get(segment_name, {})
+        segment[name] = {"type": _type, "config": config}
+        data[segment_name] = segment
 
 
 def delete_item_by_segment(segment_name: CONFIG_SEGMENTS, name: str) -> None:
@@ -36,7 +32,7 @@ def delete_item_by_segment(segment_name: CONFIG_SEGMENTS, name: str) -> None:
 
     This function removes an item by its name from the specified configuration segment.
     If the item exists, it is removed, and the updated configuration is written back to
-    the configuration file.
+    the configuration file atomically, under a lock.
 
     Args:
         segment_name (CONFIG_SEGMENTS): The segment of the configuration from which to
@@ -44,12 +40,8 @@ def delete_item_by_segment(segment_name: CONFIG_SEGMENTS, name: str) -> None:
         name (str): The name of the item to delete.
 
     """
-    segment = CONFIG.get(segment_name, {})
-    if name not in segment:
+    if name not in CONFIG.get(segment_name, {}):
         return
 
-    del segment[name]
-    CONFIG[segment_name] = segment
-
-    with CONFIG_FILE.open("w") as f:
-        json.dump(CONFIG, f, indent=4)
+    with CONFIG.update() as data:
+        data.get(segment_name, {}).pop(name, None)
@@ -0,0 +1,103 @@
+import copy
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, Mapping
+from contextlib import contextmanager
+
+from app.utils.files import write_json_atomic
+from app.utils.locks import file_lock
+from app.utils.read_config import read_config
+
+
+class ConfigStore(Mapping):
+    """
+    A JSON configuration file shared safely between concurrent DocScribe processes.
+
+    Reading the store behaves like reading a dictionary. The file is reloaded whenever
+    its mtime, size or inode changes, so every access sees the latest configuration
+    written by any process. Values are returned as deep copies, so mutating them never
+    changes the shared configuration. Updates are read-modify-write transactions held under an
+    exclusive file lock and written atomically, so concurrent updates are never lost and
+    the file is never left truncated.
+
+    Attributes:
+        path (Path): The configuration file.
+        lock_path (Path): The lock file guarding updates.
+
+    Methods:
+        update(): Context manager yielding a mutable copy of the configuration to be saved.
+        replace(data): Overwrites the whole configuration.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initializes the store. The file is read lazily, on first access.
+
+        Args:
+            path (Path): The configuration file.
+        """
+        self.path = path
+        self.lock_path = path.with_name(f"{path.name}.lock")
+        self._data: dict = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _file_version(self) -> tuple | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _snapshot(self) -> dict:
+        """
+        Returns the current configuration, reloading it if the file changed.
+
+        Returns:
+            dict: The configuration. It is shared between readers and must not be mutated or
+                returned to callers; use `update` instead.
+        """
+        version = self._file_version()
+        with self._lock:
+            if version != self._version:
+                self._data = read_config(self.path) if version else {}
+                self._version = version
+            return self._data
+
+    def __getitem__(self, key: str):
+        return copy.deepcopy(self._snapshot()[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot())
+
+    def __len__(self) -> int:
+        return len(self._snapshot())
+
+    @contextmanager
+    def update(self) -> Iterator[dict]:
+        """
+        Opens a read-modify-write transaction on the configuration.
+
+        The configuration is re-read under the lock, so changes made by other processes
+        since the last access are kept. The yielded dictionary is saved when the block
+        exits without an error.
+
+        Yields:
+            dict: A mutable copy of the current configuration.
+        """
+        with file_lock(self.lock_path):
+            data = copy.deepcopy(read_config(self.path))
+            yield data
+            write_json_atomic(self.path, data, indent=4)
+
+    def replace(self, data: dict) -> None:
+        """
+        Overwrites the whole configuration.
+
+        Args:
+            data (dict): The new configuration.
+        """
+        with self.update() as config:
+            config.clear()
+            config.update(data)
@@ -0,0 +1,64 @@
+import os
+import json
+import tempfile
+from pathlib import Path
+from typing import IO, Iterator
+from contextlib import contextmanager
+
+# Read once: the process umask can only be queried by changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "wb") -> Iterator[IO]:
+    """
+    Opens a temporary file that atomically replaces `path` when the block succeeds.
+
+    The temporary file is created in the same directory as `path`, so the final rename is
+    atomic: readers see either the old or the new content, never a partial one. If the
+    block raises, the temporary file is removed and `path` is left untouched. The file
+    gets the permissions of the file it replaces, or the umask defaults for new files.
+
+    Args:
+        path (Path): The file to write.
+        mode (str): The mode to open the temporary file with, "wb" or "w". Defaults to "wb".
+
+    Yields:
+        IO: The temporary file to write to.
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        try:
+            file_mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            file_mode = 0o666 & ~_UMASK
+        os.chmod(tmp_name, file_mode)
+
+        with os.fdopen(fd, mode) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_json_atomic(path: Path, data, **kwargs) -> None:
+    """
+    Writes a JSON file atomically, see `atomic_write`.
+
+    Args:
+        path (Path): The file to write.
+        data: The JSON-serializable data to write.
+        **kwargs: Extra keyword arguments for `json.dump`, e.g. `indent`.
+    """
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with atomic_write(path, "w") as file:
+        json.dump(data, file, **kwargs)
@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+from typing import Iterator
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Holds an exclusive inter-process lock on a lock file for the duration of the block.
+
+    The lock file is created if needed and is never removed, since removing it would let
+    two processes lock different files with the same name.
+
+    Args:
+        path (Path): The lock file.
+    """
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
@@ -72,7 +72,7 @@ class SegmentManager:
             rich.print(
                 f"[bold red]{self.segment_name.capitalize()} not found.[/bold red]"
             )
-            click.Abort()
+            raise click.Abort()
 
     def create_segment(self) -> None:
         """
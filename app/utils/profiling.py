@@ -0,0 +1,181 @@
+import json
+import time
+import cProfile
+from pathlib import Path
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+import rich
+from rich.table import Table
+
+from app.utils.files import atomic_write
+
+_CURRENT_PROFILER: ContextVar["StageProfiler | None"] = ContextVar(
+    "current_profiler", default=None
+)
+
+
+class StageProfiler:
+    """
+    Records the wall and CPU time of the stages of a generation.
+
+    Stages are recorded in the order they finish, and a stage that runs several times is
+    recorded each time. CPU time is the CPU time of the whole process, so it includes the
+    work of other threads running at the same time.
+
+    Attributes:
+        stages (list[dict]): The name, wall time and CPU time, in seconds, of each recorded stage.
+        wall_time (float): The wall time spent inside `profiling`, in seconds.
+        cpu_time (float): The CPU time spent inside `profiling`, in seconds.
+    """
+
+    def __init__(self, cprofile_stages: Iterable[str] = ()) -> None:
+        """
+        Initializes an empty profiler.
+
+        Args:
+            cprofile_stages (Iterable[str]): Stages to also profile function by function
+                with cProfile, see `dump_stats`.
+        """
+        self.stages = []
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.cprofile_stages = set(cprofile_stages)
+        self.cprofile = cProfile.Profile() if self.cprofile_stages else None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Records the time spent in the block as a stage.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        profile = self.cprofile if name in self.cprofile_stages else None
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self.stages.append(
+                {
+                    "stage": name,
+                    "wall_time": time.perf_counter() - wall_start,
+                    "cpu_time": time.process_time() - cpu_start,
+                }
+            )
+
+    def as_dict(self) -> dict:
+        """
+        Returns the recorded times.
+
+        Returns:
+            dict: The times of each stage and the totals, in seconds.
+        """
+        return {
+            "stages": self.stages,
+            "total": {"wall_time": self.wall_time, "cpu_time": self.cpu_time},
+        }
+
+    def print_summary(self) -> None:
+        """
+        Prints the recorded times as a table.
+        """
+        table = Table(title="Generation profile")
+        table.add_column("Stage")
+        table.add_column("Wall (ms)", justify="right")
+        table.add_column("CPU (ms)", justify="right")
+        table.add_column("Wall %", justify="right")
+
+        for stage in self.stages:
+            share = stage["wall_time"] / self.wall_time * 100 if self.wall_time else 0
+            table.add_row(
+                stage["stage"],
+                f"{stage['wall_time'] * 1000:.1f}",
+                f"{stage['cpu_time'] * 1000:.1f}",
+                f"{share:.1f}",
+            )
+        table.add_row(
+            "[bold]total[/bold]",
+            f"{self.wall_time * 1000:.1f}",
+            f"{self.cpu_time * 1000:.1f}",
+            "100.0",
+        )
+
+        rich.print(table)
+
+    def write_json(self, path: Path) -> None:
+        """
+        Writes the recorded times as JSON.
+
+        Args:
+            path (Path): The file to write.
+        """
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with atomic_write(path, "w") as file:
+            json.dump(self.as_dict(), file, indent=4)
+
+    def dump_stats(self, path: Path) -> bool:
+        """
+        Writes the cProfile statistics of the profiled stages, readable with `pstats`.
+
+        Args:
+            path (Path): The file to write.
+
+        Returns:
+            bool: False if no profiled stage ran, in which case nothing is written.
+        """
+        if self.cprofile is None or not any(
+            stage["stage"] in self.cprofile_stages for stage in self.stages
+        ):
+            return False
+
+        path.parent.mkdir(exist_ok=True, parents=True)
+        self.cprofile.dump_stats(path)
+        return True
+
+
+@contextmanager
+def profiling(profiler: StageProfiler) -> Iterator[StageProfiler]:
+    """
+    Makes `profiler` record the stages run inside the block, see `profile_stage`.
+
+    Args:
+        profiler (StageProfiler): The profiler to record into.
+
+    Yields:
+        StageProfiler: The profiler.
+    """
+    token = _CURRENT_PROFILER.set(profiler)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield profiler
+    finally:
+        profiler.wall_time += time.perf_counter() - wall_start
+        profiler.cpu_time += time.process_time() - cpu_start
+        _CURRENT_PROFILER.reset(token)
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    """
+    Records the block as a stage of the active profiler, if any.
+
+    Without an active profiler this does nothing, so pipeline code can mark its stages
+    unconditionally.
+
+    Args:
+        name (str): The name of the stage.
+    """
+    profiler = _CURRENT_PROFILER.get()
+    if profiler is None:
+        yield
+        return
+
+    with profiler.stage(name):
+        yield
@@ -0,0 +1,37 @@
+import importlib
+from typing import Iterator, Mapping
+
+
+class LazyTypeRegistry(Mapping):
+    """
+    A read-only mapping of type names to classes that imports each class on first access.
+
+    Segment types such as the S3 exporter depend on heavy libraries like boto3. Registering
+    them by import path keeps those libraries out of commands that never instantiate them,
+    while listing the available type names never imports anything.
+
+    Attributes:
+        import_paths (dict[str, str]): The "module:attribute" path of each type, keyed by type name.
+    """
+
+    def __init__(self, import_paths: dict[str, str]) -> None:
+        """
+        Initializes the registry.
+
+        Args:
+            import_paths (dict[str, str]): The "module:attribute" path of each type, keyed by type name.
+        """
+        self.import_paths = import_paths
+        self._loaded = {}
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._loaded:
+            module_path, attribute = self.import_paths[name].split(":")
+            self._loaded[name] = getattr(importlib.import_module(module_path), attribute)
+        return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.import_paths)
+
+    def __len__(self) -> int:
+        return len(self.import_paths)
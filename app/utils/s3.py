@@ -1,23 +1,54 @@
+import json
+import threading
+
 import rich
 import click
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ProfileNotFound
 
 from app.constants import S3_AUTH_TYPES
 
+MB = 1024 * 1024
+
+DEFAULT_TRANSFER_CONFIG = {
+    "max_workers": 8,
+    "multipart_threshold": 8 * MB,
+    "multipart_chunksize": 8 * MB,
+    "max_concurrency": 10,
+}
+
+DEFAULT_CLIENT_CONFIG = {
+    "max_pool_connections": 32,
+    "retry_mode": "standard",
+    "max_attempts": 5,
+    "connect_timeout": 10,
+    "read_timeout": 60,
+}
+
+_CLIENTS: dict[str, boto3.client] = {}
+_CLIENTS_LOCK = threading.Lock()
+
 
 def create_s3_segment_config() -> dict:
     """
     Interactively collects information from the user to configure an S3 segment.
 
     Returns:
-        dict: A dictionary containing the configured S3 segment information, including bucket name, prefix, and either profile name or keys.
+        dict: A dictionary containing the configured S3 segment information, including bucket name, prefix, either profile name or keys,
+            and the default transfer and client settings, which can be tuned afterwards in the configuration file.
     """
     rich.print("[bold]Please provide the following information to configure S3[/bold]")
     bucket = click.prompt("Enter your bucket name", type=str)
     prefix = click.prompt("Enter your prefix", type=str)
 
-    result = {"bucket": bucket, "prefix": prefix}
+    result = {
+        "bucket": bucket,
+        "prefix": prefix,
+        "transfer": dict(DEFAULT_TRANSFER_CONFIG),
+        "client": dict(DEFAULT_CLIENT_CONFIG),
+    }
 
     method = click.prompt("Method", type=click.Choice(["profile", "keys"]))
     if method == "profile":
@@ -34,10 +65,80 @@ def create_s3_segment_config() -> dict:
         }
 
 
+def make_client_config(config: dict) -> Config:
+    """
+    Builds the botocore client configuration of an S3 segment.
+
+    Segments created before client settings existed have no "client" block and get the
+    defaults of `DEFAULT_CLIENT_CONFIG`.
+
+    Args:
+        config (dict): The configuration of the S3 segment.
+
+    Returns:
+        Config: The connection pool size, retry policy and timeouts to use.
+    """
+    settings = {**DEFAULT_CLIENT_CONFIG, **config.get("client", {})}
+    return Config(
+        max_pool_connections=settings["max_pool_connections"],
+        retries={
+            "mode": settings["retry_mode"],
+            "max_attempts": settings["max_attempts"],
+        },
+        connect_timeout=settings["connect_timeout"],
+        read_timeout=settings["read_timeout"],
+    )
+
+
 def s3_auth(method: S3_AUTH_TYPES, **config) -> boto3.client:
     """
     Authenticates to AWS S3 using the specified method and configuration.
 
+    Clients are cached for the life of the process, keyed by the authentication details
+    and client settings, so segments sharing credentials share one client and its
+    connection pool. boto3 clients are thread-safe.
+
+    Args:
+        method (S3_AUTH_TYPES): The authentication method, either 'profile' or 'keys'.
+        **config: Additional keyword arguments containing the authentication details,
+            the optional "client" settings and an optional "endpoint_url".
+
+    Returns:
+        boto3.client: A boto3 client object authenticated to S3.
+
+    Raises:
+        click.Abort: If no credentials are found or the specified profile is not found.
+    """
+    key = json.dumps(
+        [
+            method,
+            config.get("profile_name"),
+            config.get("aws_access_key_id"),
+            config.get("aws_secret_access_key"),
+            config.get("endpoint_url"),
+            config.get("client", {}),
+        ],
+        sort_keys=True,
+    )
+
+    with _CLIENTS_LOCK:
+        if key not in _CLIENTS:
+            _CLIENTS[key] = _create_s3_client(method, **config)
+        return _CLIENTS[key]
+
+
+def clear_s3_clients() -> None:
+    """
+    Drops every cached S3 client.
+    """
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+
+
+def _create_s3_client(method: S3_AUTH_TYPES, **config) -> boto3.client:
+    """
+    Creates a new S3 client, see `s3_auth`.
+
     Args:
         method (S3_AUTH_TYPES): The authentication method, either 'profile' or 'keys'.
         **config: Additional keyword arguments containing the authentication details.
@@ -48,19 +149,57 @@ def s3_auth(method: S3_AUTH_TYPES, **config) -> boto3.client:
     Raises:
         click.Abort: If no credentials are found or the specified profile is not found.
     """
+    client_kwargs = {
+        "config": make_client_config(config),
+        "endpoint_url": config.get("endpoint_url"),
+    }
     try:
         if method == "profile":
             session = boto3.Session(profile_name=config.get("profile_name"))
-            return session.client("s3")
+            return session.client("s3", **client_kwargs)
 
-        return boto3.client(
-            "s3",
+        session = boto3.Session(
             aws_access_key_id=config.get("aws_access_key_id"),
             aws_secret_access_key=config.get("aws_secret_access_key"),
         )
+        return session.client("s3", **client_kwargs)
     except NoCredentialsError:
         rich.print("[red]No AWS credentials found.[/red]")
         raise click.Abort()
     except ProfileNotFound:
         rich.print(f"[red]Profile {config['profile_name']} not found.[/red]")
         raise click.Abort()
+
+
+def get_transfer_settings(config: dict) -> dict:
+    """
+    Returns the transfer settings of an S3 segment, filled in with the defaults.
+
+    Segments created before transfer settings existed have no "transfer" block and
+    get the defaults.
+
+    Args:
+        config (dict): The configuration of the S3 segment.
+
+    Returns:
+        dict: The transfer settings, see `DEFAULT_TRANSFER_CONFIG`.
+    """
+    return {**DEFAULT_TRANSFER_CONFIG, **config.get("transfer", {})}
+
+
+def make_transfer_config(config: dict) -> TransferConfig:
+    """
+    Builds the boto3 transfer configuration of an S3 segment.
+
+    Args:
+        config (dict): The configuration of the S3 segment.
+
+    Returns:
+        TransferConfig: The multipart threshold, chunk size and per-object concurrency to use.
+    """
+    settings = get_transfer_settings(config)
+    return TransferConfig(
+        multipart_threshold=settings["multipart_threshold"],
+        multipart_chunksize=settings["multipart_chunksize"],
+        max_concurrency=settings["max_concurrency"],
+    )
@@ -0,0 +1,5 @@
+"""
+Benchmarks of the document generation pipeline.
+
+Run them with `python -m benchmarks`, see `benchmarks.__main__` for the options.
+"""
@@ -0,0 +1,118 @@
+import tempfile
+from pathlib import Path
+
+import rich
+import click
+from rich.table import Table
+
+from benchmarks.packages import CASES
+from benchmarks.runner import (
+    STAGES,
+    find_regressions,
+    prepare_workspace,
+    read_baselines,
+    run_benchmarks,
+    write_baselines,
+)
+
+
+@click.command()
+@click.option(
+    "-c",
+    "--case",
+    "case_names",
+    multiple=True,
+    type=click.Choice(list(CASES)),
+    help="Case to run. Repeat to run several. Defaults to all cases",
+)
+@click.option(
+    "-s",
+    "--stage",
+    "stages",
+    multiple=True,
+    type=click.Choice(STAGES),
+    help="Stage to run. Repeat to run several. Defaults to all stages",
+)
+@click.option(
+    "-n",
+    "--iterations",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Timed iterations per stage",
+)
+@click.option(
+    "--save-baseline",
+    is_flag=True,
+    default=False,
+    help="Store the results as the new baselines",
+)
+@click.option(
+    "--compare/--no-compare",
+    default=True,
+    show_default=True,
+    help="Compare the results with the stored baselines and fail on regressions",
+)
+@click.option(
+    "-t",
+    "--tolerance",
+    type=click.FloatRange(min=0),
+    default=0.25,
+    show_default=True,
+    help="Allowed relative drop in docs/sec or growth in p95 latency",
+)
+def command(case_names, stages, iterations, save_baseline, compare, tolerance):
+    """
+    Benchmarks the generation pipeline on synthetic document packages.
+
+    Each stage (script, validation, rendering, local and S3 export, and the whole pipeline)
+    is measured in a fresh process against a throwaway workspace, and reported as documents
+    per second, p50/p95 latency and peak RSS. S3 exports go to a local stand-in.
+    """
+    case_names = list(case_names or CASES)
+    stages = list(stages or STAGES)
+
+    with tempfile.TemporaryDirectory(prefix="docscribe-benchmarks-") as workspace:
+        workspace = Path(workspace)
+        prepare_workspace(workspace, case_names)
+        results = run_benchmarks(workspace, case_names, stages, iterations)
+
+    baselines = read_baselines()
+
+    table = Table(title="Generation benchmarks")
+    table.add_column("Case", no_wrap=True)
+    table.add_column("Stage", no_wrap=True)
+    for column in ("Docs/sec", "p50 ms", "p95 ms", "Peak RSS MiB", "Baseline docs/sec"):
+        table.add_column(column, justify="right")
+
+    for key, metrics in results.items():
+        case_name, stage = key.split("/")
+        baseline = baselines.get(key, {})
+        table.add_row(
+            case_name,
+            stage,
+            str(metrics["docs_per_sec"]),
+            str(metrics["p50_ms"]),
+            str(metrics["p95_ms"]),
+            str(metrics["peak_rss_mb"] if metrics["peak_rss_mb"] is not None else "-"),
+            str(baseline.get("docs_per_sec", "-")),
+        )
+
+    rich.print(table)
+
+    if save_baseline:
+        write_baselines(results)
+        rich.print("[green]Baselines saved[/green]")
+        return
+
+    if compare:
+        regressions = find_regressions(results, baselines, tolerance)
+        if regressions:
+            for regression in regressions:
+                rich.print(f"[red]Regression: {regression}[/red]")
+            raise click.exceptions.Exit(1)
+        rich.print("[green]No regressions[/green]")
+
+
+if __name__ == "__main__":
+    command()
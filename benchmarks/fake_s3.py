@@ -0,0 +1,53 @@
+import shutil
+from pathlib import Path
+from typing import IO
+
+
+class LocalS3Client:
+    """
+    A stand-in for the boto3 S3 client that stores objects in a local directory.
+
+    Only the calls made by the S3 exporter and repository are implemented. Objects are written
+    to `<root>/<bucket>/<key>`, so exports pay for a real copy of their content without any
+    network or credentials.
+
+    Attributes:
+        root (Path): The directory holding one subdirectory per bucket.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _object_path(self, bucket: str, key: str) -> Path:
+        path = self.root / bucket / key
+        path.parent.mkdir(exist_ok=True, parents=True)
+        return path
+
+    def upload_fileobj(
+        self, Fileobj: IO[bytes], Bucket: str, Key: str, Config=None, Callback=None
+    ) -> None:
+        with self._object_path(Bucket, Key).open("wb") as file:
+            shutil.copyfileobj(Fileobj, file)
+
+    def upload_file(
+        self, Filename: str, Bucket: str, Key: str, Config=None, Callback=None
+    ) -> None:
+        shutil.copyfile(Filename, self._object_path(Bucket, Key))
+
+    def download_file(
+        self, bucket: str, key: str, filename: str, Config=None, Callback=None
+    ) -> None:
+        shutil.copyfile(self.root / bucket / key, filename)
+
+    def get_paginator(self, name: str) -> "LocalS3Client":
+        return self
+
+    def paginate(self, Bucket: str, Prefix: str = "", **kwargs) -> list[dict]:
+        bucket_dir = self.root / Bucket
+        contents = [
+            {"Key": key, "Size": path.stat().st_size}
+            for path in sorted(bucket_dir.rglob("*"))
+            if path.is_file()
+            and (key := path.relative_to(bucket_dir).as_posix()).startswith(Prefix)
+        ]
+        return [{"Contents": contents}]
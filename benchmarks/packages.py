@@ -0,0 +1,206 @@
+import json
+import zlib
+import random
+import struct
+from pathlib import Path
+from dataclasses import dataclass, field
+
+TABLE_ROWS = 10_000
+IMAGES = 40
+IMAGE_SIZE = 256
+
+SMALL_SCRIPT = """\
+def run(title="Benchmark", **kwargs):
+    return {"title": title, "description": "A small synthetic document"}
+"""
+
+TABLE_SCRIPT = f"""\
+def run(title="Benchmark", rows={TABLE_ROWS}, **kwargs):
+    return {{
+        "title": title,
+        "rows": [{{"name": f"row {{i}}", "value": i * 1.5}} for i in range(rows)],
+    }}
+"""
+
+SMALL_SCHEMA = {
+    "type": "object",
+    "properties": {"title": {"type": "string"}, "description": {"type": "string"}},
+    "required": ["title"],
+}
+
+TABLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "rows": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"name": {"type": "string"}, "value": {"type": "number"}},
+                "required": ["name", "value"],
+            },
+        },
+    },
+    "required": ["title", "rows"],
+}
+
+TEXT_TEMPLATES = {
+    "small": {
+        "md": "# {{ title }}\n\n{{ description }}\n",
+        "html": "<html><body><h1>{{ title }}</h1><p>{{ description }}</p></body></html>\n",
+        "txt": "{{ title }}\n\n{{ description }}\n",
+    },
+    "table": {
+        "md": (
+            "# {{ title }}\n\n| Name | Value |\n| --- | --- |\n"
+            "{% for row in rows %}| {{ row.name }} | {{ row.value }} |\n{% endfor %}"
+        ),
+        "html": (
+            "<html><body><h1>{{ title }}</h1><table>"
+            "{% for row in rows %}<tr><td>{{ row.name }}</td><td>{{ row.value }}</td></tr>"
+            "{% endfor %}</table></body></html>\n"
+        ),
+    },
+}
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    A synthetic document package to benchmark.
+
+    Attributes:
+        name (str): The name of the case, also used as the document name.
+        template_type (str): The template type of the document.
+        script (str): The source of the document script.
+        schema (dict): The template schema of the document.
+        kwargs (dict): The default kwargs of the document.
+    """
+
+    name: str
+    template_type: str
+    script: str
+    schema: dict
+    kwargs: dict = field(default_factory=dict)
+
+
+CASES = {
+    case.name: case
+    for case in (
+        BenchmarkCase("small-md", "md", SMALL_SCRIPT, SMALL_SCHEMA),
+        BenchmarkCase("small-html", "html", SMALL_SCRIPT, SMALL_SCHEMA),
+        BenchmarkCase("small-txt", "txt", SMALL_SCRIPT, SMALL_SCHEMA),
+        BenchmarkCase("small-docx", "docx", SMALL_SCRIPT, SMALL_SCHEMA),
+        BenchmarkCase("table-10k-md", "md", TABLE_SCRIPT, TABLE_SCHEMA),
+        BenchmarkCase("table-10k-html", "html", TABLE_SCRIPT, TABLE_SCHEMA),
+        BenchmarkCase("table-10k-docx", "docx", TABLE_SCRIPT, TABLE_SCHEMA),
+        BenchmarkCase("images-docx", "docx", SMALL_SCRIPT, SMALL_SCHEMA),
+    )
+}
+
+
+def make_png(width: int, height: int, seed: int) -> bytes:
+    """
+    Builds an RGB PNG of random noise, which does not compress, so it keeps its full size
+    inside the DOCX package.
+
+    Args:
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+        seed (int): The seed of the noise, so packages are reproducible.
+
+    Returns:
+        bytes: The content of the PNG file.
+    """
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def write_docx_template(case: BenchmarkCase, path: Path) -> None:
+    """
+    Writes the DOCX template of a case with python-docx.
+
+    Args:
+        case (BenchmarkCase): The case to write the template of.
+        path (Path): The path of the template file.
+    """
+    from docx import Document
+    from docx.shared import Inches
+
+    document = Document()
+    document.add_heading("{{ title }}", level=1)
+
+    if case.name.startswith("table"):
+        table = document.add_table(rows=3, cols=2)
+        table.cell(0, 0).text = "{%tr for row in rows %}"
+        table.cell(1, 0).text = "{{ row.name }}"
+        table.cell(1, 1).text = "{{ row.value }}"
+        table.cell(2, 0).text = "{%tr endfor %}"
+    else:
+        document.add_paragraph("{{ description }}")
+
+    if case.name.startswith("images"):
+        images_dir = path.parent / "images"
+        images_dir.mkdir(exist_ok=True)
+        for index in range(IMAGES):
+            image = images_dir / f"{index}.png"
+            image.write_bytes(make_png(IMAGE_SIZE, IMAGE_SIZE, index))
+            document.add_picture(str(image), width=Inches(2))
+
+    document.save(path)
+
+
+def write_package(case: BenchmarkCase, repositories_dir: Path) -> Path:
+    """
+    Writes the document package of a case into the local repository.
+
+    Args:
+        case (BenchmarkCase): The case to write.
+        repositories_dir (Path): The repositories directory of the benchmark workspace.
+
+    Returns:
+        Path: The directory of the document package.
+    """
+    path = repositories_dir / "local" / case.name
+    path.mkdir(exist_ok=True, parents=True)
+
+    (path / "script.py").write_text(case.script)
+
+    template_file = path / f"template.{case.template_type}"
+    if case.template_type == "docx":
+        write_docx_template(case, template_file)
+    else:
+        size = "table" if case.name.startswith("table") else "small"
+        template_file.write_text(TEXT_TEMPLATES[size][case.template_type])
+
+    with open(path / "config.json", "w") as file:
+        json.dump(
+            {
+                "default_export_name": case.name,
+                "kwargs": case.kwargs,
+                "template_schema": case.schema,
+                "required_modules": [],
+                "isolated_environment": False,
+                "output_cache": False,
+                "template_type": case.template_type,
+            },
+            file,
+            indent=4,
+        )
+
+    return path
@@ -0,0 +1,279 @@
+import io
+import os
+import sys
+import json
+import time
+import contextlib
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.packages import CASES, write_package
+
+STAGES = ("script", "validate", "render", "export-local", "export-s3", "pipeline")
+
+BASELINES_FILE = Path(__file__).parent / "baselines.json"
+
+
+def prepare_workspace(workspace: Path, case_names: list[str]) -> None:
+    """
+    Creates a DocScribe workspace with the packages of the given cases.
+
+    The workspace has a local repository, a local exporter and an "s3" exporter served by
+    `LocalS3Client`, so the benchmarks never touch the current project or the network.
+
+    Args:
+        workspace (Path): The directory of the workspace.
+        case_names (list[str]): The cases to write packages for.
+    """
+    repositories_dir = workspace / "docscribe" / "repositories"
+    for case_name in case_names:
+        write_package(CASES[case_name], repositories_dir)
+
+    config = {
+        "repositories_directory": "docscribe/repositories",
+        "package_manager": "pip",
+        "repositories": {"local": {"type": "local", "config": {}}},
+        "exporters": {
+            "local": {"type": "local", "config": {}},
+            "s3": {
+                "type": "s3",
+                "config": {"bucket": "benchmarks", "prefix": "outputs"},
+            },
+        },
+    }
+    with open(workspace / ".docscribe_config.json", "w") as file:
+        json.dump(config, file, indent=4)
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Returns the peak resident set size of the current process, in MiB.
+
+    Returns:
+        float | None: The peak RSS, or None where the `resource` module is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_stage(workspace: Path, case_name: str, stage: str, iterations: int) -> dict:
+    """
+    Measures one stage of one case. Runs in a fresh child process.
+
+    The inputs of the stage (script result, rendered document) are computed first and one
+    warm-up iteration is run, so the timings reflect a process with warm caches. The peak RSS
+    covers the whole child process, including that preparation.
+
+    Args:
+        workspace (Path): The benchmark workspace.
+        case_name (str): The case to measure.
+        stage (str): The stage to measure, one of `STAGES`.
+        iterations (int): Number of timed iterations.
+
+    Returns:
+        dict: The latencies of each iteration, in seconds, and the peak RSS in MiB.
+    """
+    os.chdir(workspace)
+
+    from benchmarks.fake_s3 import LocalS3Client
+    from app.services.exporter.types import s3 as s3_exporter
+    from app.services.exporter.main import export_stream
+    from app.services.generator.main import (
+        generate_document,
+        read_document_config,
+        validate_document_result,
+    )
+    from app.services.generator.template_generation import (
+        exec_document_script,
+        render_document_stream,
+    )
+
+    client = LocalS3Client(workspace / "s3")
+    s3_exporter.s3_auth = lambda **config: client
+
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        config = read_document_config(case_name)
+        kwargs = config["kwargs"]
+        document_type = config["template_type"]
+        schema = config["template_schema"]
+        file_name = f"{case_name}.{document_type}"
+
+        result = exec_document_script(case_name, "local", kwargs)
+        with render_document_stream(case_name, "local", result, document_type) as file:
+            rendered = file.read()
+
+        operations = {
+            "script": lambda: exec_document_script(case_name, "local", kwargs),
+            "validate": lambda: validate_document_result(result, schema),
+            "render": lambda: render_document_stream(
+                case_name, "local", result, document_type
+            ).close(),
+            "export-local": lambda: export_stream(
+                "local", io.BytesIO(rendered), file_name
+            ),
+            "export-s3": lambda: export_stream("s3", io.BytesIO(rendered), file_name),
+            "pipeline": lambda: generate_document(
+                case_name, "local", kwargs, "local", document_config=config
+            ),
+        }
+        operation = operations[stage]
+
+        operation()
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - start)
+            # Keep the captured output from growing with the iterations
+            output.seek(0)
+            output.truncate()
+
+    return {"latencies": latencies, "peak_rss_mb": peak_rss_mb()}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Returns a percentile of a list of values, by the nearest-rank method.
+
+    Args:
+        values (list[float]): The values.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The value at that percentile.
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(measurement: dict) -> dict:
+    """
+    Reduces the measurement of a stage to its reported metrics.
+
+    Args:
+        measurement (dict): The result of `run_stage`.
+
+    Returns:
+        dict: Documents per second, p50 and p95 latencies in milliseconds and peak RSS in MiB.
+    """
+    latencies = measurement["latencies"]
+    return {
+        "docs_per_sec": round(len(latencies) / sum(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "peak_rss_mb": (
+            None
+            if measurement["peak_rss_mb"] is None
+            else round(measurement["peak_rss_mb"], 1)
+        ),
+    }
+
+
+def run_benchmarks(
+    workspace: Path, case_names: list[str], stages: list[str], iterations: int
+) -> dict[str, dict]:
+    """
+    Measures every stage of every case, one fresh child process at a time.
+
+    Stages run sequentially so they never compete for the CPU, and each in its own process so
+    the peak RSS of one stage does not leak into the next.
+
+    Args:
+        workspace (Path): The benchmark workspace, see `prepare_workspace`.
+        case_names (list[str]): The cases to measure.
+        stages (list[str]): The stages to measure.
+        iterations (int): Number of timed iterations per stage.
+
+    Returns:
+        dict[str, dict]: The metrics of each measurement, keyed by "<case>/<stage>".
+    """
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for case_name in case_names:
+        for stage in stages:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                measurement = executor.submit(
+                    run_stage, workspace, case_name, stage, iterations
+                ).result()
+            results[f"{case_name}/{stage}"] = summarize(measurement)
+
+    return results
+
+
+def read_baselines() -> dict[str, dict]:
+    """
+    Reads the stored baselines.
+
+    Returns:
+        dict[str, dict]: The baseline metrics, keyed by "<case>/<stage>".
+    """
+    if not BASELINES_FILE.exists():
+        return {}
+
+    with BASELINES_FILE.open("r") as file:
+        return json.load(file)["results"]
+
+
+def write_baselines(results: dict[str, dict]) -> None:
+    """
+    Stores measured metrics as the new baselines, keeping the baselines of measurements
+    that were not run.
+
+    Args:
+        results (dict[str, dict]): The metrics, keyed by "<case>/<stage>".
+    """
+    baselines = {**read_baselines(), **results}
+    with BASELINES_FILE.open("w") as file:
+        json.dump(
+            {
+                "python": sys.version.split()[0],
+                "platform": sys.platform,
+                "results": dict(sorted(baselines.items())),
+            },
+            file,
+            indent=4,
+        )
+        file.write("\n")
+
+
+def find_regressions(
+    results: dict[str, dict], baselines: dict[str, dict], tolerance: float
+) -> list[str]:
+    """
+    Compares measured metrics with their baselines.
+
+    A measurement regresses when its throughput drops, or its p95 latency grows, by more than
+    `tolerance` relative to its baseline.
+
+    Args:
+        results (dict[str, dict]): The measured metrics.
+        baselines (dict[str, dict]): The baseline metrics.
+        tolerance (float): The allowed relative change, e.g. 0.25 for 25%.
+
+    Returns:
+        list[str]: A description of each regression.
+    """
+    regressions = []
+    for key, metrics in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+
+        if metrics["docs_per_sec"] < baseline["docs_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {metrics['docs_per_sec']} docs/sec, baseline {baseline['docs_per_sec']}"
+            )
+        if metrics["p95_ms"] > baseline["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: p95 {metrics['p95_ms']} ms, baseline {baseline['p95_ms']} ms"
+            )
+
+    return regressions
@@ -27,10 +27,11 @@ setup(
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.11",
     ],
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_dirs=".",
     include_package_data=True,
     install_requires=read_requirements(),
+    extras_require={"fast": ["fastjsonschema"]},
     url="https://github.com/sgg10/docscribe/",
     license="MIT",
     author="sgg10",
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import subprocess
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from app.cli import cli
+
+# Extra seconds `docscribe --help` may take over a bare interpreter start. Wall-clock timings
+# depend on the machine, so the check only runs when a budget is set
+STARTUP_BUDGET = os.environ.get("DOCSCRIBE_STARTUP_BUDGET")
+
+HEAVY_MODULES = ("boto3", "docxtpl", "jsonschema")
+
+LOADED_MODULES_SCRIPT = """
+import sys
+from app.main import cli
+try:
+    cli(sys.argv[1:])
+except SystemExit:
+    pass
+print("loaded:" + ",".join(m for m in {modules!r} if m in sys.modules), file=sys.stderr)
+"""
+
+
+class TestCLI:
+    def setup_method(self):
+        self.runner = CliRunner()
+        self.ROOT_PATH = Path(__file__).parent.parent.resolve()
+
+    def run_python(self, *args):
+        return subprocess.run(
+            [sys.executable, *args],
+            cwd=self.ROOT_PATH,
+            capture_output=True,
+            text=True,
+        )
+
+    def loaded_heavy_modules(self, *args):
+        result = self.run_python(
+            "-c", LOADED_MODULES_SCRIPT.format(modules=HEAVY_MODULES), *args
+        )
+        return [
+            line[len("loaded:") :]
+            for line in result.stderr.splitlines()
+            if line.startswith("loaded:")
+        ]
+
+    def test_list_commands(self):
+        result = self.runner.invoke(cli, args=["--help"])
+        for name in ("generate", "init", "serve", "doc", "exporter", "repository"):
+            assert name in result.output
+        assert result.exit_code == 0
+
+    def test_unknown_command(self):
+        result = self.runner.invoke(cli, args=["unknown"])
+        assert result.exit_code != 0
+
+    def test_help_does_not_import_heavy_modules(self):
+        for args in (
+            ["--help"],
+            ["doc", "create", "--help"],
+            ["repository", "--help"],
+            ["exporter", "--help"],
+            ["generate", "--help"],
+        ):
+            assert self.loaded_heavy_modules(*args) == [""], args
+
+    @pytest.mark.skipif(
+        STARTUP_BUDGET is None, reason="set DOCSCRIBE_STARTUP_BUDGET to check the start-up time"
+    )
+    def test_startup_time(self):
+        def best_of(*args, runs=3):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                self.run_python(*args)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        baseline = best_of("-c", "pass")
+        startup = best_of("-m", "app.main", "--help")
+
+        assert startup - baseline < float(STARTUP_BUDGET)
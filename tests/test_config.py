@@ -0,0 +1,54 @@
+import os
+import json
+import time
+from multiprocessing import Pool
+
+from app.utils.config_store import ConfigStore
+
+
+def increment(path, times=20):
+    store = ConfigStore(path)
+    for _ in range(times):
+        with store.update() as config:
+            config["counter"] = config.get("counter", 0) + 1
+
+
+class TestConfigStore:
+    def test_read_reloads_on_change(self, tmp_path):
+        path = tmp_path / "config.json"
+        store = ConfigStore(path)
+        assert dict(store) == {}
+
+        path.write_text(json.dumps({"package_manager": "pip"}))
+        assert store.get("package_manager") == "pip"
+
+        time.sleep(0.01)
+        path.write_text(json.dumps({"package_manager": "pipenv", "exporters": {}}))
+        assert store.get("package_manager") == "pipenv"
+
+        # Values read from the store are copies
+        store["exporters"]["local"] = {}
+        assert store["exporters"] == {}
+
+    def test_update_is_atomic(self, tmp_path):
+        path = tmp_path / "config.json"
+        store = ConfigStore(path)
+        store.replace({"repositories": {}})
+
+        try:
+            with store.update() as config:
+                config["repositories"]["broken"] = {}
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        assert store["repositories"] == {}
+        assert sorted(os.listdir(tmp_path)) == ["config.json", "config.json.lock"]
+
+    def test_concurrent_updates_are_not_lost(self, tmp_path):
+        path = tmp_path / "config.json"
+
+        with Pool(4) as pool:
+            pool.map(increment, [path] * 4)
+
+        assert ConfigStore(path)["counter"] == 80
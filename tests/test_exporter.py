@@ -1,3 +1,4 @@
+import io
 import json
 from pathlib import Path
 
@@ -7,6 +8,9 @@ from app.cli import cli
 from app.commands import cmd_init
 from app.commands.exporter import cmd_add, cmd_delete
 
+from app.services.exporter.types import s3 as s3_exporter
+from app.services.exporter.types.local import Local
+
 from tests.common import read_config
 
 
@@ -49,3 +53,26 @@ class TestExporter:
         config = read_config(self.ROOT_PATH)
         assert "sample" not in config["exporters"]
         assert result.exit_code == 0
+
+    def test_local_export_stream(self):
+        Local("test-local", {}).export_stream(io.BytesIO(b"# Report"), "report.md")
+
+        output = self.ROOT_PATH / "docscribe" / "outputs" / "test-local" / "report.md"
+        assert output.read_text() == "# Report"
+        assert list(output.parent.iterdir()) == [output]
+        output.unlink()
+        output.parent.rmdir()
+
+    def test_s3_export_stream(self, monkeypatch):
+        uploads = {}
+
+        class FakeS3Client:
+            def upload_fileobj(self, Fileobj, Bucket, Key, Config=None):
+                uploads[(Bucket, Key)] = Fileobj.read()
+
+        monkeypatch.setattr(s3_exporter, "s3_auth", lambda **config: FakeS3Client())
+
+        exporter = s3_exporter.S3("fake-s3", {"bucket": "bucket", "prefix": "reports/"})
+        exporter.export_stream(io.BytesIO(b"content"), "report.md")
+
+        assert uploads == {("bucket", "reports/report.md"): b"content"}
@@ -1,12 +1,75 @@
+import sys
 import json
+import time
+import threading
 from pathlib import Path
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 
+import click
+import pytest
+from botocore.exceptions import ClientError
 from click.testing import CliRunner
+from docx import Document
+from docxtpl import DocxTemplate
 
 from app.cli import cli
+from app.constants import CONFIG
+from app.services.exporter.types import s3 as s3_exporter
+from app.services.generator.batch import run_batch
 from app.commands import cmd_init
 from app.commands import cmd_generate
 from app.commands.doc import cmd_create, cmd_delete
+from app.services.server import handle_generate_request
+from app.services.generator.main import (
+    get_document_result,
+    read_document_config,
+    validate_document_result,
+)
+from app.services.generator.schema_validators import (
+    VALIDATOR_CACHE_STATS,
+    clear_validator_cache,
+    get_schema_validator,
+)
+from app.services.generator.result_cache import (
+    RESULT_CACHE_STATS,
+    clear_result_cache,
+)
+from app.services.generator.docx_cache import (
+    DOCX_CACHE_STATS,
+    LARGE_TABLE_CHUNK_SIZE,
+    clear_docx_cache,
+    render_docx_template,
+)
+from app.services.generator import main as generator_main, template_requirements
+from app.services.generator.template_requirements import (
+    REQUIREMENTS_CACHE_FILE,
+    REQUIREMENTS_CACHE_STATS,
+    check_module,
+    install_requirements,
+)
+from app.services.generator.environments import (
+    ensure_environment,
+    environment_key,
+    get_document_requirements,
+)
+from app.services.generator.template_generation import exec_document_script
+from app.services.generator.output_cache import (
+    OUTPUT_CACHE_DIR,
+    OUTPUT_CACHE_STATS,
+    clear_output_cache,
+    evict_outputs,
+)
+from app.services.generator.script_loader import (
+    SCRIPT_CACHE_STATS,
+    clear_script_cache,
+    load_document_script,
+)
+from app.services.generator.template_cache import (
+    ENVIRONMENT_CACHE_STATS,
+    clear_template_cache,
+    get_document_template,
+)
 
 from tests.common import common_create_doc, common_delete_doc
 
@@ -62,6 +125,539 @@ class TestGenerate:
         assert output.exists()
         assert output.read_text() == "#Hello, World!\n\nThis is a test"
 
+    def test_generate_saves_kwargs(self):
+        path = self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg"
+        config = json.loads((path / "config.json").read_text())
+        (path / "config.json").write_text(json.dumps({**config, "kwargs": {"title": "a"}}))
+
+        result = self.runner.invoke(
+            cmd_generate.command, args=["-n", "test-doc-pkg", "-e", "local"], input="b\ny\n"
+        )
+        assert result.exit_code == 0
+        assert json.loads((path / "config.json").read_text())["kwargs"] == {"title": "b"}
+        assert (path / "config.json.lock").exists()
+
+    def test_generate_profile(self):
+        profile_file = self.DOCSCRIBE_PATH / "profile.json"
+        result = self.runner.invoke(
+            cmd_generate.command,
+            args=[
+                "-n",
+                "test-doc-pkg",
+                "-e",
+                "local",
+                "--use-default-kwargs",
+                "--profile=cprofile",
+                "--profile-output",
+                str(profile_file),
+            ],
+        )
+        assert result.exit_code == 0
+        assert "Generation profile" in result.output
+
+        profile = json.loads(profile_file.read_text())
+        profile_file.unlink()
+        assert [stage["stage"] for stage in profile["stages"]] == [
+            "read_document_config",
+            "install_requirements",
+            "script",
+            "validate",
+            "render",
+            "export",
+        ]
+        assert profile["total"]["wall_time"] >= sum(
+            stage["wall_time"] for stage in profile["stages"]
+        )
+
+        stats_file = self.DOCSCRIBE_PATH / ".tmp" / "profiles" / "test-doc-pkg-script.pstats"
+        assert stats_file.exists()
+        stats_file.unlink()
+
+        result = self.runner.invoke(
+            cmd_generate.command,
+            args=["--profile", "-n", "test-doc-pkg", "-e", "local", "--use-default-kwargs"],
+        )
+        assert result.exit_code == 0
+        assert "Generation profile" in result.output
+
+    def test_generate_batch(self):
+        batch_file = self.DOCSCRIBE_PATH / "batch.jsonl"
+        batch_file.write_text('{"title": "a"}\n\n{"title": "b"}\n')
+
+        result = self.runner.invoke(
+            cmd_generate.command,
+            args=["-n", "test-doc-pkg", "-e", "local", "-b", str(batch_file), "-w", "2"],
+        )
+        batch_file.unlink()
+
+        assert result.exit_code == 0
+        assert "2 succeeded, 0 failed, 2 total" in result.output
+        for row_number in (1, 2):
+            output = (
+                self.DOCSCRIBE_PATH / "outputs" / "local" / f"test-doc-pkg-{row_number}.md"
+            )
+            assert output.exists()
+            output.unlink()
+
+    def test_generate_batch_failed_upload(self, monkeypatch):
+        class FailingS3Client:
+            def upload_fileobj(self, Fileobj, Bucket, Key, Config=None):
+                raise ClientError({"Error": {"Code": "500", "Message": "boom"}}, "PutObject")
+
+        monkeypatch.setattr(s3_exporter, "s3_auth", lambda **config: FailingS3Client())
+        with CONFIG.update() as config:
+            config["exporters"]["failing-s3"] = {
+                "type": "s3",
+                "config": {"bucket": "bucket", "prefix": "reports"},
+            }
+
+        batch_file = self.DOCSCRIBE_PATH / "batch.jsonl"
+        batch_file.write_text('{"title": "a"}\n')
+        try:
+            results = run_batch(
+                "test-doc-pkg", batch_file, exporter_name="failing-s3", workers=1
+            )
+        finally:
+            batch_file.unlink()
+            with CONFIG.update() as config:
+                del config["exporters"]["failing-s3"]
+
+        assert [(row_number, succeeded) for row_number, succeeded, _ in results] == [(1, False)]
+
+    def test_generate_batch_async(self):
+        path = self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg"
+        (path / "script.py").write_text(
+            "import asyncio\n\n"
+            "async def run(title='x', **kwargs):\n"
+            "    await asyncio.sleep(0)\n"
+            "    return {'title': title, 'description': 'async'}\n"
+        )
+        assert exec_document_script("test-doc-pkg", document_kwargs={"title": "a"}) == {
+            "title": "a",
+            "description": "async",
+        }
+
+        batch_file = self.DOCSCRIBE_PATH / "batch.jsonl"
+        batch_file.write_text('{"title": "a"}\n{"title": "b"}\n{"title": "c"}\n')
+        result = self.runner.invoke(
+            cmd_generate.command,
+            args=["-n", "test-doc-pkg", "-e", "local", "-b", str(batch_file), "-w", "2", "--async"],
+        )
+        batch_file.unlink()
+
+        assert result.exit_code == 0
+        assert "3 succeeded, 0 failed, 3 total" in result.output
+        for row_number, title in enumerate("abc", start=1):
+            output = (
+                self.DOCSCRIBE_PATH / "outputs" / "local" / f"test-doc-pkg-{row_number}.md"
+            )
+            assert output.read_text() == f"#{title}\n\nasync"
+            output.unlink()
+
+        output = self.DOCSCRIBE_PATH / "outputs" / "local" / "test-doc-pkg.md"
+        output.unlink(missing_ok=True)
+        result = self.runner.invoke(
+            cmd_generate.command,
+            args=["-n", "test-doc-pkg", "-e", "local", "--use-default-kwargs", "--async"],
+        )
+        assert result.exit_code == 1
+        assert not output.exists()
+
+    def test_lazy_result(self):
+        path = self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg"
+        (path / "template.md").write_text("{% for row in rows %}{{ row }},{% endfor %}")
+        (path / "script.py").write_text(
+            "def run(**kwargs):\n"
+            "    return {'title': 't', 'rows': (i * 2 for i in range(5))}\n"
+        )
+        config = json.loads((path / "config.json").read_text())
+        config["template_schema"]["properties"]["rows"] = {"type": "array"}
+        config["cache"] = {"ttl": 3600}
+        (path / "config.json").write_text(json.dumps(config))
+        clear_result_cache()
+        RESULT_CACHE_STATS.reset()
+
+        output = self.DOCSCRIBE_PATH / "outputs" / "local" / "test-doc-pkg.md"
+        try:
+            for _ in range(2):
+                result = self.runner.invoke(
+                    cmd_generate.command,
+                    args=["-n", "test-doc-pkg", "-e", "local", "--use-default-kwargs"],
+                )
+                assert result.exit_code == 0
+            assert RESULT_CACHE_STATS.as_dict() == {"hits": 0, "misses": 2}
+            assert output.read_text() == "0,2,4,6,8,"
+        finally:
+            output.unlink(missing_ok=True)
+            clear_result_cache()
+
+    def test_variants(self, tmp_path):
+        runs_file = tmp_path / "runs.txt"
+        path = self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg"
+        (path / "template.md").write_text("{% for row in rows %}{{ row }},{% endfor %}")
+        (path / "template.txt").write_text("{{ locale }}: {{ rows | sum }}")
+        (path / "script.py").write_text(
+            "def run(**kwargs):\n"
+            "    with open(kwargs['runs_file'], 'a') as f:\n"
+            "        f.write('run\\n')\n"
+            "    return {'title': 't', 'rows': (i * 2 for i in range(5))}\n"
+        )
+        config = json.loads((path / "config.json").read_text())
+        config["kwargs"] = {**config.get("kwargs", {}), "runs_file": str(runs_file)}
+        config["variants"] = [
+            {"name": "table"},
+            {"name": "en", "template_type": "txt", "context": {"locale": "en"}},
+            {"name": "fr", "template_type": "txt", "context": {"locale": "fr"}},
+        ]
+        (path / "config.json").write_text(json.dumps(config))
+
+        outputs = self.DOCSCRIBE_PATH / "outputs" / "local"
+        files = ("test-doc-pkg-table.md", "test-doc-pkg-en.txt", "test-doc-pkg-fr.txt")
+        try:
+            result = self.runner.invoke(
+                cmd_generate.command,
+                args=["-n", "test-doc-pkg", "-e", "local", "--use-default-kwargs"],
+            )
+            assert result.exit_code == 0
+
+            assert (outputs / "test-doc-pkg-table.md").read_text() == "0,2,4,6,8,"
+            assert (outputs / "test-doc-pkg-en.txt").read_text() == "en: 20"
+            assert (outputs / "test-doc-pkg-fr.txt").read_text() == "fr: 20"
+            assert runs_file.read_text() == "run\n"
+        finally:
+            for file in files:
+                (outputs / file).unlink(missing_ok=True)
+
+    def test_output_cache(self):
+        path = self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg"
+        config = json.loads((path / "config.json").read_text())
+        (path / "config.json").write_text(json.dumps({**config, "output_cache": True}))
+        clear_output_cache()
+        OUTPUT_CACHE_STATS.reset()
+
+        args = ["-n", "test-doc-pkg", "-e", "local", "--use-default-kwargs"]
+        output = self.DOCSCRIBE_PATH / "outputs" / "local" / "test-doc-pkg.md"
+        try:
+            for _ in range(2):
+                result = self.runner.invoke(cmd_generate.command, args=args)
+                assert result.exit_code == 0
+            assert OUTPUT_CACHE_STATS.as_dict() == {"hits": 1, "misses": 1}
+            assert output.read_text() == "#Hello, World!\n\nThis is a test"
+
+            # A new data version or --no-cache regenerates the document
+            with open(path / "script.py", "a") as f:
+                f.write("\nDATA_VERSION = 2\n")
+            self.runner.invoke(cmd_generate.command, args=args)
+            self.runner.invoke(cmd_generate.command, args=[*args, "--no-cache"])
+            assert OUTPUT_CACHE_STATS.as_dict() == {"hits": 1, "misses": 2}
+
+            assert len(list(OUTPUT_CACHE_DIR.iterdir())) == 2
+            evict_outputs(0)
+            assert not list(OUTPUT_CACHE_DIR.iterdir())
+        finally:
+            output.unlink(missing_ok=True)
+            clear_output_cache()
+
+    def test_result_cache(self):
+        config = {
+            "template_type": "md",
+            "template_schema": {"type": "object"},
+            "cache": {"ttl": 3600, "key": ["title"]},
+        }
+        clear_result_cache()
+        RESULT_CACHE_STATS.reset()
+
+        expected = {"title": "Hello, World!", "description": "This is a test"}
+        for extra in (1, 2):
+            result = get_document_result(
+                "test-doc-pkg", "local", {"title": "a", "extra": extra}, config
+            )
+            assert result == expected
+        assert RESULT_CACHE_STATS.as_dict() == {"hits": 1, "misses": 1}
+
+        # A changed schema revalidates the memoized result
+        config["template_schema"] = {"type": "array"}
+        with pytest.raises(click.Abort):
+            get_document_result("test-doc-pkg", "local", {"title": "a"}, config)
+
+        config["cache"]["ttl"] = 0
+        config["template_schema"] = {"type": "object"}
+        get_document_result("test-doc-pkg", "local", {"title": "a"}, config)
+        assert RESULT_CACHE_STATS.as_dict() == {"hits": 2, "misses": 2}
+
+    def test_result_cache_revalidation(self, monkeypatch):
+        config = {
+            "template_type": "md",
+            "template_schema": {"type": "object"},
+            "cache": {"ttl": 3600},
+        }
+        clear_result_cache()
+        get_document_result("test-doc-pkg", "local", {"title": "a"}, config)
+
+        validations = []
+        monkeypatch.setattr(
+            generator_main,
+            "validate_document_result",
+            lambda *args: validations.append(args),
+        )
+        config["template_schema"] = {"type": "object", "required": ["title"]}
+        for _ in range(2):
+            get_document_result("test-doc-pkg", "local", {"title": "a"}, config)
+        assert len(validations) == 1
+
+    def test_schema_validator_cache(self):
+        schema = {"type": "object", "properties": {"rows": {"type": "array"}}}
+        clear_validator_cache()
+        VALIDATOR_CACHE_STATS.reset()
+
+        for _ in range(3):
+            validate_document_result({"rows": [1, 2]}, schema)
+        assert VALIDATOR_CACHE_STATS.as_dict() == {"hits": 2, "misses": 1}
+        assert get_schema_validator(dict(reversed(schema.items()))) is get_schema_validator(
+            schema
+        )
+
+        with pytest.raises(click.Abort):
+            validate_document_result({"rows": "x"}, schema)
+        with pytest.raises(click.Abort):
+            validate_document_result({}, {"type": "not-a-type"})
+
+    def test_fastjsonschema_validator(self):
+        pytest.importorskip("fastjsonschema")
+        schema = {"type": "object", "required": ["title"]}
+
+        validate_document_result({"title": "a"}, schema, "fastjsonschema")
+        with pytest.raises(click.Abort):
+            validate_document_result({}, schema, "fastjsonschema")
+
+    def test_template_cache(self):
+        template_file = (
+            self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg" / "template.md"
+        )
+        clear_template_cache()
+        ENVIRONMENT_CACHE_STATS.reset()
+
+        first = get_document_template(template_file)
+        second = get_document_template(template_file)
+
+        assert first is second
+        assert ENVIRONMENT_CACHE_STATS.as_dict() == {"hits": 1, "misses": 1}
+
+        template_file.write_text("{{title}}")
+        assert get_document_template(template_file).render(title="x") == "x"
+
+    def test_docx_template_cache(self, tmp_path):
+        template = Document()
+        template.sections[0].header.paragraphs[0].text = "Header {{ title }}"
+        template.add_paragraph("Hello {{ title }}")
+        table = template.add_table(rows=3, cols=2)
+        table.cell(0, 0).text = "{%tr for row in rows %}"
+        table.cell(1, 0).text = "{{ row.a }}"
+        table.cell(1, 1).text = "{{ row.b }}"
+        table.cell(2, 0).text = "{%tr endfor %}"
+        template_file = tmp_path / "template.docx"
+        template.save(template_file)
+
+        context = {"title": "World", "rows": [{"a": 1, "b": 2}, {"a": 3, "b": 4}]}
+        clear_docx_cache()
+        DOCX_CACHE_STATS.reset()
+        for _ in range(2):
+            render_docx_template(template_file, context, tmp_path / "cached.docx")
+        assert DOCX_CACHE_STATS.as_dict() == {"hits": 1, "misses": 1}
+
+        expected = DocxTemplate(template_file)
+        expected.render(context)
+        expected.save(tmp_path / "expected.docx")
+
+        def read(path):
+            doc = Document(path)
+            return (
+                [paragraph.text for paragraph in doc.paragraphs],
+                [[cell.text for cell in row.cells] for row in doc.tables[0].rows],
+                doc.sections[0].header.paragraphs[0].text,
+            )
+
+        assert read(tmp_path / "cached.docx") == read(tmp_path / "expected.docx")
+
+    def test_docx_large_table(self, tmp_path):
+        template = Document()
+        template.add_paragraph("Ledger {{ title }}")
+        table = template.add_table(rows=4, cols=2)
+        table.cell(0, 0).text = "Name"
+        table.cell(0, 1).text = "Value"
+        table.cell(1, 0).text = "{%tr for row in rows %}"
+        table.cell(2, 0).text = "{{ row.a }}"
+        table.cell(2, 1).text = "{{ row.b }}"
+        table.cell(3, 0).text = "{%tr endfor %}"
+        template.add_paragraph("End")
+        template_file = tmp_path / "template.docx"
+        template.save(template_file)
+
+        count = LARGE_TABLE_CHUNK_SIZE * 2 + 5
+        rows = [{"a": i, "b": i * 2} for i in range(count)]
+
+        render_docx_template(
+            template_file,
+            {"title": "x", "rows": (row for row in rows)},
+            tmp_path / "chunked.docx",
+            large_tables=["rows"],
+        )
+        expected = DocxTemplate(template_file)
+        expected.render({"title": "x", "rows": rows})
+        expected.save(tmp_path / "expected.docx")
+
+        def read(path):
+            doc = Document(path)
+            return (
+                [paragraph.text for paragraph in doc.paragraphs],
+                [[cell.text for cell in row.cells] for row in doc.tables[0].rows],
+            )
+
+        chunked = read(tmp_path / "chunked.docx")
+        assert len(chunked[1]) == count + 1
+        assert chunked == read(tmp_path / "expected.docx")
+
+    def test_docx_large_table_rendered_twice(self, tmp_path):
+        template = Document()
+        template.add_paragraph("{%p for copy in copies %}")
+        table = template.add_table(rows=3, cols=1)
+        table.cell(0, 0).text = "{%tr for row in rows %}"
+        table.cell(1, 0).text = "{{ row }}"
+        table.cell(2, 0).text = "{%tr endfor %}"
+        template.add_paragraph("{%p endfor %}")
+        template_file = tmp_path / "template.docx"
+        template.save(template_file)
+
+        with pytest.raises(click.exceptions.Abort):
+            render_docx_template(
+                template_file,
+                {"copies": [1, 2], "rows": [1, 2, 3]},
+                tmp_path / "output.docx",
+                large_tables=["rows"],
+            )
+
+    def test_large_tables_must_be_top_level(self):
+        path = self.DOCSCRIBE_PATH / "repositories" / "local" / "test-doc-pkg"
+        config = json.loads((path / "config.json").read_text())
+        (path / "config.json").write_text(
+            json.dumps({**config, "large_tables": ["data.rows"]})
+        )
+
+        with pytest.raises(click.exceptions.Abort):
+            read_document_config("test-doc-pkg")
+
+    def test_script_cache(self, tmp_path):
+        first_script = tmp_path / "first" / "script.py"
+        second_script = tmp_path / "second" / "script.py"
+        for script, value in ((first_script, 1), (second_script, 2)):
+            script.parent.mkdir()
+            script.write_text(f"def run():\n    return {value}\n")
+
+        clear_script_cache()
+        SCRIPT_CACHE_STATS.reset()
+
+        first = load_document_script(first_script)
+        assert load_document_script(first_script) is first
+        second = load_document_script(second_script)
+        assert first.__name__ != second.__name__
+        assert (first.run(), second.run()) == (1, 2)
+        assert SCRIPT_CACHE_STATS.as_dict() == {"hits": 1, "misses": 2}
+
+        first_script.write_text("def run():\n    return 'changed'\n")
+        assert load_document_script(first_script).run() == "changed"
+
+    def test_script_imports_run_in_parallel(self, tmp_path, monkeypatch):
+        gate = SimpleNamespace(started=threading.Event(), release=threading.Event())
+        monkeypatch.setitem(sys.modules, "docscribe_test_gate", gate)
+        slow_script = tmp_path / "slow" / "script.py"
+        fast_script = tmp_path / "fast" / "script.py"
+        slow_script.parent.mkdir()
+        fast_script.parent.mkdir()
+        slow_script.write_text(
+            "import docscribe_test_gate as gate\n"
+            "gate.started.set()\n"
+            "gate.release.wait(5)\n"
+            "def run():\n    return 'slow'\n"
+        )
+        fast_script.write_text("def run():\n    return 'fast'\n")
+        clear_script_cache()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            slow = executor.submit(load_document_script, slow_script)
+            assert gate.started.wait(5)
+            # The slow import is still running and must not hold up other scripts
+            start = time.perf_counter()
+            assert load_document_script(fast_script).run() == "fast"
+            assert time.perf_counter() - start < 2
+            gate.release.set()
+            assert slow.result().run() == "slow"
+
+    def test_serve_generate_request(self):
+        status, body = handle_generate_request({"repository": "local"})
+        assert status == 400
+
+        for payload in (
+            {"document": "../../../../tmp/x"},
+            {"document": ".."},
+            {"document": "test-doc-pkg", "output_name": "../../../escaped"},
+            {"document": "test-doc-pkg", "output_name": ["served"]},
+            {"document": "test-doc-pkg", "use_cache": "false"},
+        ):
+            status, body = handle_generate_request({**payload, "exporter": "local"})
+            assert status == 400
+
+        status, body = handle_generate_request(
+            {"document": "test-doc-pkg", "exporter": "local", "output_name": "served"}
+        )
+        assert status == 200
+        assert body["status"] == "ok"
+        output = self.DOCSCRIBE_PATH / "outputs" / "local" / "served.md"
+        assert output.read_text() == "#Hello, World!\n\nThis is a test"
+        output.unlink()
+
+    def test_check_requirements(self):
+        assert check_module("click")
+        assert check_module("PyYAML>=6")
+        assert not check_module("click<1")
+        assert not check_module("not-an-installed-distribution")
+
+        REQUIREMENTS_CACHE_FILE.unlink(missing_ok=True)
+        REQUIREMENTS_CACHE_STATS.reset()
+        for _ in range(2):
+            install_requirements({"require_modules": ["click>=8", "jinja2"]})
+        assert REQUIREMENTS_CACHE_STATS.as_dict() == {"hits": 1, "misses": 1}
+
+    def test_requirements_missing_after_install(self, monkeypatch):
+        # The package manager succeeds but installs into another environment
+        monkeypatch.setattr(template_requirements.os, "system", lambda command: 0)
+        monkeypatch.setattr(template_requirements.click, "confirm", lambda *a, **k: True)
+        REQUIREMENTS_CACHE_FILE.unlink(missing_ok=True)
+
+        with pytest.raises(click.exceptions.Abort):
+            install_requirements({"required_modules": ["docscribe-missing-package"]})
+        assert not REQUIREMENTS_CACHE_FILE.exists()
+
+    def test_document_requirements_keys(self):
+        assert get_document_requirements({"required_modules": ["a"]}) == ["a"]
+        assert get_document_requirements({"require_modules": ["b"]}) == ["b"]
+        assert get_document_requirements({}) == []
+
+    def test_isolated_environment(self):
+        python = ensure_environment([])
+        assert ensure_environment([]) == python
+
+        # The environment is built at its final path, which its scripts refer to
+        environment_dir = python.parent.parent
+        assert environment_dir.name == environment_key([])
+        if sys.platform != "win32":
+            activate = (environment_dir / "bin" / "activate").read_text()
+            assert str(environment_dir.resolve()) in activate
+
+        result = exec_document_script(
+            "test-doc-pkg", document_kwargs={"unused": 1}, python_executable=python
+        )
+        assert result == {"title": "Hello, World!", "description": "This is a test"}
+
     def test_base_generate(self):
         result = self.runner.invoke(cli, args=["generate", "--help"])
         assert result.exit_code == 0
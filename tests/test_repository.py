@@ -1,15 +1,66 @@
 import json
+import shutil
+import hashlib
+from datetime import datetime, timezone
 from pathlib import Path
 
+import click
+import pytest
+from botocore.exceptions import ClientError
 from click.testing import CliRunner
 
 from app.cli import cli
 from app.commands import cmd_init
 from app.commands.repository import cmd_add, cmd_delete, cmd_list
 
+from app.services.repository.index import delete_report_index
+from app.services.repository.types import s3 as s3_repository
+from app.services.repository.types.local import Local
+from app.utils.s3 import clear_s3_clients, s3_auth
+
 from tests.common import read_config
 
 
+class FakeS3Client:
+    def __init__(self, objects):
+        self.objects = objects
+        self.downloaded = []
+        self.listings = 0
+        self.failing = set()
+        self.unreachable = False
+
+    def get_paginator(self, name):
+        return self
+
+    def paginate(self, Bucket, Prefix, **kwargs):
+        if self.unreachable:
+            raise ClientError({"Error": {"Code": "403", "Message": "denied"}}, "ListObjectsV2")
+        self.listings += 1
+        return [
+            {
+                "Contents": [
+                    {
+                        "Key": key,
+                        "Size": len(body),
+                        "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+                        "LastModified": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    }
+                    for key, body in self.objects.items()
+                    if key.startswith(Prefix)
+                ]
+            }
+        ]
+
+    def download_file(self, bucket, key, filename, Config=None, Callback=None):
+        if key in self.failing:
+            raise ClientError({"Error": {"Code": "500", "Message": "boom"}}, "GetObject")
+        with open(filename, "wb") as f:
+            f.write(self.objects[key])
+        if Callback:
+            Callback(len(self.objects[key]))
+        self.downloaded.append(key)
+
+
 class TestRepository:
     def setup_method(self):
         self.runner = CliRunner()
@@ -39,6 +90,181 @@ class TestRepository:
         assert "local" in result.output
         assert result.exit_code == 0
 
+    def test_download_s3_repository(self, monkeypatch):
+        client = FakeS3Client(
+            {
+                "prefix/report/config.json": b"{}",
+                "prefix/report/script.py": b"def run(): pass",
+                "prefix/report/template.md": b"# {{title}}",
+            }
+        )
+        monkeypatch.setattr(s3_repository, "s3_auth", lambda **config: client)
+
+        repository = s3_repository.S3(
+            "fake-s3",
+            {"bucket": "bucket", "prefix": "prefix", "transfer": {"max_workers": 2}},
+        )
+        repository.download("report")
+
+        path = self.ROOT_PATH / "docscribe" / "repositories" / "fake-s3" / "report"
+        assert sorted(client.downloaded) == sorted(client.objects)
+        assert (path / "template.md").read_bytes() == b"# {{title}}"
+        for file in path.iterdir():
+            file.unlink()
+        path.rmdir()
+        path.parent.rmdir()
+
+    def test_s3_client_cache(self):
+        clear_s3_clients()
+        config = {
+            "method": "keys",
+            "aws_access_key_id": "key",
+            "aws_secret_access_key": "secret",
+            "client": {"max_pool_connections": 4},
+        }
+
+        client = s3_auth(**config, bucket="first")
+        assert s3_auth(**config, bucket="second") is client
+        assert client.meta.config.max_pool_connections == 4
+        assert s3_auth(**{**config, "aws_access_key_id": "other"}) is not client
+
+    def test_s3_report_index(self, monkeypatch):
+        client = FakeS3Client(
+            {
+                "prefix/report/config.json": b"{}",
+                "prefix/report/template.md": b"# {{title}}",
+                "prefix/other/config.json": b"{}",
+            }
+        )
+        monkeypatch.setattr(s3_repository, "s3_auth", lambda **config: client)
+
+        repository = s3_repository.S3("indexed-s3", {"bucket": "bucket", "prefix": "prefix"})
+        try:
+            assert repository.list_reports() == ["other", "report"]
+            assert repository.list_reports() == ["other", "report"]
+            assert client.listings == 1
+
+            report = repository.get_report_index()["reports"][1]
+            assert report["objects"] == 2
+            assert report["size"] == len(b"{}") + len(b"# {{title}}")
+
+            client.objects["prefix/new/config.json"] = b"{}"
+            assert repository.has_report("new")
+            assert client.listings == 2
+            assert repository.list_reports(refresh=True) == ["new", "other", "report"]
+            assert client.listings == 3
+
+            # A failed refresh is not mistaken for a missing report
+            assert repository.has_report("missing") is False
+            client.unreachable = True
+            assert repository.has_report("missing") is None
+            assert repository.list_reports() == ["new", "other", "report"]
+        finally:
+            repository.delete()
+
+    def test_s3_sync(self, monkeypatch):
+        client = FakeS3Client(
+            {
+                "prefix/report/config.json": b"{}",
+                "prefix/report/assets/logo.txt": b"logo",
+                "prefix/other/config.json": b"{}",
+                "prefix/report/../../../../escaped.txt": b"x",
+                "prefix/report//empty.txt": b"x",
+            }
+        )
+        monkeypatch.setattr(s3_repository, "s3_auth", lambda **config: client)
+
+        repository = s3_repository.S3("synced-s3", {"bucket": "bucket", "prefix": "prefix"})
+        path = self.ROOT_PATH / "docscribe" / "repositories" / "synced-s3"
+        try:
+            assert repository.sync() == {"downloaded": 3, "deleted": 0, "unchanged": 0}
+            assert (path / "report" / "assets" / "logo.txt").read_bytes() == b"logo"
+            assert not (path.parent.parent / "escaped.txt").exists()
+            assert repository.list_reports() == ["other", "report"]
+            assert client.listings == 1
+
+            client.downloaded.clear()
+            assert repository.sync() == {"downloaded": 0, "deleted": 0, "unchanged": 3}
+            assert not client.downloaded
+
+            # Changed objects are downloaded again and removed ones deleted locally
+            client.objects["prefix/other/config.json"] = b'{"a": 1}'
+            del client.objects["prefix/report/assets/logo.txt"]
+            assert repository.sync() == {"downloaded": 1, "deleted": 1, "unchanged": 1}
+            assert (path / "other" / "config.json").read_bytes() == b'{"a": 1}'
+            assert not (path / "report" / "assets").exists()
+
+            # An interrupted sync resumes with the objects that were not downloaded
+            client.objects["prefix/new/a.txt"] = b"a"
+            client.objects["prefix/new/b.txt"] = b"b"
+            client.failing.add("prefix/new/b.txt")
+            with pytest.raises(click.exceptions.Abort):
+                repository.sync(max_workers=1)
+
+            client.failing.clear()
+            client.downloaded.clear()
+            assert repository.sync() == {"downloaded": 1, "deleted": 0, "unchanged": 3}
+            assert client.downloaded == ["prefix/new/b.txt"]
+        finally:
+            repository.delete()
+            shutil.rmtree(path, ignore_errors=True)
+
+    def test_local_repository(self, monkeypatch):
+        path = self.ROOT_PATH / "docscribe" / "repositories" / "local"
+        for name in ("pkg-a", "pkg-b", "not-a-pkg"):
+            (path / name).mkdir(parents=True)
+        (path / "pkg-a" / "config.json").write_text("{}")
+        (path / "pkg-b" / "config.json").write_text("{}")
+        (path / "pkg-b" / "script.py").write_text("def run(): pass")
+        delete_report_index("local")
+
+        scans = []
+        scan_reports = Local._scan_reports
+        monkeypatch.setattr(
+            Local, "_scan_reports", lambda self: scans.append(1) or scan_reports(self)
+        )
+        try:
+            result = self.runner.invoke(cmd_list.command, args=["local"])
+            assert result.exit_code == 0
+            assert "pkg-a" in result.output and "pkg-b" in result.output
+            assert "not-a-pkg" not in result.output
+
+            repository = Local("local", {})
+            assert repository.list_reports() == ["pkg-a", "pkg-b"]
+            assert len(scans) == 1
+            assert repository.get_report_index()["reports"][1]["objects"] == 2
+
+            # New packages and files of a package invalidate the index
+            (path / "pkg-c").mkdir()
+            (path / "pkg-c" / "config.json").write_text("{}")
+            assert repository.list_reports() == ["pkg-a", "pkg-b", "pkg-c"]
+            (path / "pkg-a" / "template.md").write_text("# {{title}}")
+            assert repository.get_report_index()["reports"][0]["objects"] == 2
+            assert len(scans) == 3
+
+            # A directory that becomes a package is listed once it has a config
+            (path / "not-a-pkg" / "config.json").write_text("{}")
+            assert "not-a-pkg" in repository.list_reports()
+            assert len(scans) == 4
+        finally:
+            delete_report_index("local")
+            for name in ("pkg-a", "pkg-b", "pkg-c", "not-a-pkg"):
+                shutil.rmtree(path / name, ignore_errors=True)
+
+    def test_local_repository_path(self, tmp_path):
+        (tmp_path / "shared-pkg").mkdir()
+        (tmp_path / "shared-pkg" / "config.json").write_text("{}")
+
+        repository = Local("shared", {"path": str(tmp_path)})
+        path = self.ROOT_PATH / "docscribe" / "repositories" / "shared"
+        try:
+            assert repository.list_reports() == ["shared-pkg"]
+            repository.download("shared-pkg")
+            assert (path / "shared-pkg" / "config.json").read_text() == "{}"
+        finally:
+            delete_report_index("shared")
+            shutil.rmtree(path, ignore_errors=True)
+
     def test_delete_repository(self):
         result = self.runner.invoke(cmd_delete.command, args="sample")
         config = read_config(self.ROOT_PATH)